@@ -4,10 +4,12 @@
 
 import argparse
 from pathlib import Path
-from typing import Union
+from typing import Iterable, List, Optional, Union, get_args
 
-from assembler.code import Code
-from assembler.parser import Parser
+from assembler.build_cache import BuildCache, source_version
+from assembler.code import C_INSTRUCTION_TABLE
+from assembler.parser import Instruction, Parser, parse_instructions
+from assembler.rom import ByteOrder, OutputFormat, write_hack, write_rom
 from assembler.symbol_table import SymbolTable
 
 MAX_INT = (2**15) - 1
@@ -27,24 +29,130 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         help="Symbolic Hack program to translate into Hack instructions",
     )
+    parser.add_argument(
+        "--skip-no-symbol",
+        action="store_true",
+        help="Do not write the xxxNoSymbol.asm file",
+    )
+    parser.add_argument(
+        "--format",
+        choices=get_args(OutputFormat),
+        default="hack",
+        help="Write the instructions as .hack text or as a packed binary .bin ROM image",
+    )
+    parser.add_argument(
+        "--byteorder",
+        choices=get_args(ByteOrder),
+        default="little",
+        help="Byte order of the words in the binary ROM image",
+    )
+    parser.add_argument(
+        "--pad",
+        action="store_true",
+        help="Pad the binary ROM image with zeros to the full ROM size",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            "Reuse the outputs of unchanged files from the build cache "
+            "($NAND2TETRIS_CACHE, defaults to ~/.cache/nand2tetris)"
+        ),
+    )
     return parser.parse_args()
 
 
-def main(in_path: Path) -> None:
+def main(
+    in_path: Path,
+    output_format: OutputFormat = "hack",
+    byteorder: ByteOrder = "little",
+    pad: bool = False,
+    no_symbol: bool = True,
+    cache: Optional[BuildCache] = None,
+) -> None:
     """Translate symbolic Hack machine language into binary hack instructions.
 
-    The input xxx.asm will be translated to xxxNoSymbol.asm and xxx.hack where
+    The input xxx.asm will be translated to xxxNoSymbol.asm (optional) and xxx.hack where
     - xxxL.asm is the stripped symbolic instruction where:
         - Comments and whitespace has been stripped
         - Symbols have been translated to decimals
         - Labels have been removed
     - xxx.hack is the binary instructions for the Hack program
+      (xxx.bin if the packed binary output format is selected)
+
+    The input file is only read once, both passes operate on the in-memory instructions.
 
     Args:
         in_path (Path): File to translate
+        output_format (OutputFormat, optional): Format of the instructions. Defaults to "hack".
+        byteorder (ByteOrder, optional): Byte order of the words in the binary ROM image.
+            Defaults to "little".
+        pad (bool, optional): Whether to pad the binary ROM image to the full ROM size.
+            Defaults to False.
+        no_symbol (bool, optional): Whether to write xxxNoSymbol.asm. Defaults to True.
+        cache (Optional[BuildCache], optional): If given, the outputs are restored from the
+            cache when the file and the options are unchanged. Defaults to None.
     """
-    symbol_table = first_pass(in_path)
-    second_pass(in_path=in_path, symbol_table=symbol_table)
+    # pylint: disable=too-many-arguments
+
+    def build() -> None:
+        """Assemble the file."""
+        instructions = read_instructions(in_path)
+        symbol_table = resolve_symbols(instructions)
+        write_output(
+            in_path=in_path,
+            instructions=instructions,
+            symbol_table=symbol_table,
+            output_format=output_format,
+            byteorder=byteorder,
+            pad=pad,
+            no_symbol=no_symbol,
+        )
+
+    if cache is None:
+        build()
+        return
+
+    out_paths = [in_path.with_suffix(".bin" if output_format == "bin" else ".hack")]
+    if no_symbol:
+        out_paths.append(
+            in_path.parent.joinpath(f"{in_path.stem}NoSymbol{in_path.suffix}")
+        )
+    key = cache.key(
+        "assembler",
+        source_version(),
+        f"{output_format} {byteorder} {pad} {no_symbol}",
+        in_path.read_bytes(),
+    )
+    cache.restore_or_build(key, out_paths, build)
+
+
+def assemble(source: Union[str, Iterable[str]]) -> List[int]:
+    """Assemble symbolic Hack code into Hack machine words without touching the filesystem.
+
+    Args:
+        source (Union[str, Iterable[str]]): The .asm program as a string or as lines
+
+    Returns:
+        List[int]: The 16 bit machine words of the program
+    """
+    if isinstance(source, str):
+        source = source.splitlines()
+    instructions = parse_instructions(source)
+    symbol_table = resolve_symbols(instructions)
+    return translate(instructions=instructions, symbol_table=symbol_table)
+
+
+def read_instructions(in_path: Path) -> List[Instruction]:
+    """Read and classify all instructions of a file in one go.
+
+    Args:
+        in_path (Path): The .asm file to read
+
+    Returns:
+        List[Instruction]: The classified instructions
+    """
+    return list(Parser(str(in_path)))
 
 
 def first_pass(in_path: Path) -> SymbolTable:
@@ -56,44 +164,72 @@ def first_pass(in_path: Path) -> SymbolTable:
     Returns:
         SymbolTable: The filled symbol table
     """
-    parser = Parser(str(in_path))
+    return resolve_symbols(read_instructions(in_path))
+
+
+def resolve_symbols(instructions: List[Instruction]) -> SymbolTable:
+    """Fill the symbol table from the in-memory instructions.
+
+    Args:
+        instructions (List[Instruction]): The instructions to generate the symbol table from
+
+    Returns:
+        SymbolTable: The filled symbol table
+    """
     symbol_table = SymbolTable()
     instruction_line = 0
 
-    a_instruction_symbols = list()
-    while parser.has_more_lines():
-        parser.advance()
-        if parser.instruction_type() == "L_INSTRUCTION":
+    for instruction_type, symbol, *_ in instructions:
+        if instruction_type == "L_INSTRUCTION":
             # NOTE: An L_INSTRUCTION does not count as an instruction,
             #        but is referring to the next instruction line
             # In an error-free code there will only be one definition of an L-instruction
-            symbol_table.add_entry(symbol=parser.symbol(), address=instruction_line)
+            symbol_table.add_entry(symbol=symbol, address=instruction_line)
         else:
-            if parser.instruction_type() == "A_INSTRUCTION":
-                cur_symbol = parser.symbol()
-                if (
-                    not cur_symbol.isdigit()
-                    and not symbol_table.contains(cur_symbol)
-                    and cur_symbol not in a_instruction_symbols
-                ):
-                    a_instruction_symbols.append(cur_symbol)
+            if instruction_type == "A_INSTRUCTION" and not symbol.isdigit():
+                # The symbol is either a variable, or a label which may be defined later
+                symbol_table.reserve_variable(symbol)
 
             # Update the instruction line for A and C instructions
             instruction_line += 1
 
-    # pylint: disable=consider-iterating-dictionary
-    for cur_symbol in symbol_table.symbol_table.keys():
-        if cur_symbol in a_instruction_symbols:
-            a_instruction_symbols.remove(cur_symbol)
-
-    for cur_symbol in a_instruction_symbols:
-        symbol_table.add_entry(
-            symbol=cur_symbol, address=symbol_table.get_available_slot()
-        )
+    symbol_table.resolve()
 
     return symbol_table
 
 
+def translate(instructions: List[Instruction], symbol_table: SymbolTable) -> List[int]:
+    """Translate the in-memory instructions to machine words.
+
+    Args:
+        instructions (List[Instruction]): The instructions to translate
+        symbol_table (SymbolTable): Symbol table to use
+
+    Raises:
+        RuntimeError: If an address is too large
+
+    Returns:
+        List[int]: The 16 bit machine words
+    """
+    # Local lookups as this is the hottest loop of the assembler
+    c_instruction_table = C_INSTRUCTION_TABLE
+    addresses = symbol_table.symbol_table
+    words: List[int] = []
+    append = words.append
+    for instruction_type, symbol, dest, comp, jump in instructions:
+        # NOTE: L-instructions are not translated
+        if instruction_type == "C_INSTRUCTION":
+            append(c_instruction_table[(dest, comp, jump)])
+        elif instruction_type == "A_INSTRUCTION":
+            address = int(symbol) if symbol.isdigit() else addresses[symbol]
+            if address > MAX_INT:
+                raise RuntimeError(
+                    f"{address} > {MAX_INT}. Cannot make 15 bit binary representation."
+                )
+            append(address)
+    return words
+
+
 def second_pass(in_path: Path, symbol_table: SymbolTable) -> None:
     """Write the xxxNoSymbol.asm and xxx.hack file.
 
@@ -101,47 +237,96 @@ def second_pass(in_path: Path, symbol_table: SymbolTable) -> None:
         in_path (Path): File to translate from
         symbol_table (SymbolTable): Symbol table to use
     """
-    # The l-path will contain the stripped file without symbols
-    no_symbol_path = in_path.parent.joinpath(f"{in_path.stem}NoSymbol{in_path.suffix}")
-    hack_path = in_path.with_suffix(".hack")
-
-    parser = Parser(str(in_path))
-    code = Code()
-
-    with no_symbol_path.open("w") as l_file, hack_path.open(
-        "w", encoding="ASCII"
-    ) as hack_file:
-        while parser.has_more_lines():
-            parser.advance()
-            # NOTE: L-instructions are not translated
-            if parser.instruction_type() == "L_INSTRUCTION":
-                continue
-            if parser.instruction_type() == "A_INSTRUCTION":
-                cur_symbol = parser.symbol()
-                if not cur_symbol.isdigit():
-                    symbol_instruction = f"@{symbol_table.get_address(cur_symbol)}"
-                else:
-                    symbol_instruction = f"@{cur_symbol}"
-                binary_instruction = convert_to_15_bit_binary(
-                    symbol_instruction.strip("@")
-                )
-                # Add the leading 0 which marks that this is an A-instruction
-                binary_instruction = f"0{binary_instruction}"
-            if parser.instruction_type() == "C_INSTRUCTION":
-                if isinstance(parser.current_instruction, str):
-                    symbol_instruction = parser.current_instruction
-                    comp = code.comp(parser.comp())
-                    dest = code.dest(parser.dest())
-                    jump = code.jump(parser.jump())
-                    # Add the three leading 1 which marks that this is a C-instruction
-                    binary_instruction = f"111{comp}{dest}{jump}"
-                else:
-                    binary_instruction = (
-                        "Error: parser.current_instruction was not string"
-                    )
-
-            l_file.write(f"{symbol_instruction.replace(' ', '')}\n")
-            hack_file.write(f"{binary_instruction}\n")
+    write_output(
+        in_path=in_path,
+        instructions=read_instructions(in_path),
+        symbol_table=symbol_table,
+    )
+
+
+def write_output(
+    in_path: Path,
+    instructions: List[Instruction],
+    symbol_table: SymbolTable,
+    output_format: OutputFormat = "hack",
+    byteorder: ByteOrder = "little",
+    pad: bool = False,
+    no_symbol: bool = True,
+) -> None:
+    """Write the xxxNoSymbol.asm and xxx.hack file from the in-memory instructions.
+
+    Args:
+        in_path (Path): File which was translated
+        instructions (List[Instruction]): The instructions of the file
+        symbol_table (SymbolTable): Symbol table to use
+        output_format (OutputFormat, optional): Format of the instructions. Defaults to "hack".
+        byteorder (ByteOrder, optional): Byte order of the words in the binary ROM image.
+            Defaults to "little".
+        pad (bool, optional): Whether to pad the binary ROM image to the full ROM size.
+            Defaults to False.
+        no_symbol (bool, optional): Whether to write xxxNoSymbol.asm. Defaults to True.
+    """
+    # pylint: disable=too-many-arguments
+    words = translate(instructions=instructions, symbol_table=symbol_table)
+    if output_format == "bin":
+        write_rom(in_path.with_suffix(".bin"), words, byteorder=byteorder, pad=pad)
+    else:
+        write_hack(in_path.with_suffix(".hack"), words)
+
+    if no_symbol:
+        # The l-path will contain the stripped file without symbols
+        no_symbol_path = in_path.parent.joinpath(
+            f"{in_path.stem}NoSymbol{in_path.suffix}"
+        )
+        write_no_symbol(no_symbol_path, instructions=instructions, words=words)
+
+
+def write_no_symbol(
+    path: Path, instructions: List[Instruction], words: List[int]
+) -> None:
+    """Write the symbolic instructions with the symbols resolved.
+
+    Comments, whitespace and labels are removed, and the symbols of A-instructions are replaced
+    by their addresses.
+
+    Args:
+        path (Path): Path to write to
+        instructions (List[Instruction]): The instructions of the program
+        words (List[int]): The machine words of the program as returned by translate
+    """
+    executable = (
+        instruction
+        for instruction in instructions
+        if instruction.instruction_type != "L_INSTRUCTION"
+    )
+    with path.open("w") as l_file:
+        l_file.write(
+            "".join(
+                [
+                    f"@{word}\n"
+                    if instruction.instruction_type == "A_INSTRUCTION"
+                    else f"{_c_instruction_text(instruction)}\n"
+                    for instruction, word in zip(executable, words)
+                ]
+            )
+        )
+
+
+def _c_instruction_text(instruction: Instruction) -> str:
+    """Return the whitespace stripped text of a C-instruction.
+
+    Args:
+        instruction (Instruction): The C-instruction
+
+    Returns:
+        str: The instruction on the form dest=comp;jump where dest and jump are optional
+    """
+    text = instruction.comp
+    if instruction.dest:
+        text = f"{instruction.dest}={text}"
+    if instruction.jump:
+        text = f"{text};{instruction.jump}"
+    return text
 
 
 def convert_to_15_bit_binary(decimal: Union[str, int]) -> str:
@@ -161,16 +346,16 @@ def convert_to_15_bit_binary(decimal: Union[str, int]) -> str:
         raise RuntimeError(
             f"{decimal} > {MAX_INT}. Cannot make 15 bit binary representation."
         )
-    binary_string = ""
-    # NOTE: range(i) represents the numbers [0, 15)
-    for exponent in range(15)[::-1]:
-        divisor = 2**exponent
-        binary_string += str(decimal // divisor)
-        decimal = decimal % divisor
-
-    return binary_string
+    return f"{decimal:015b}"
 
 
 if __name__ == "__main__":
     args = parse_args()
-    main(args.file.resolve())
+    main(
+        args.file.resolve(),
+        output_format=args.format,
+        byteorder=args.byteorder,
+        pad=args.pad,
+        no_symbol=not args.skip_no_symbol,
+        cache=BuildCache() if args.cache else None,
+    )
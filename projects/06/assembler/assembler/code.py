@@ -1,8 +1,18 @@
 """Module containing the Code class."""
 
+from typing import Dict, Tuple
+
+# The three leading 1 which marks that this is a C-instruction
+C_INSTRUCTION_PREFIX = 0b111 << 13
+
 
 class Code:
-    """Class mapping predefined symbols to binary strings."""
+    """Class mapping predefined symbols to binary strings and integers.
+
+    The string methods (dest, comp, jump) are kept for readability, whereas the machine words of
+    the C-instructions are looked up in the precomputed C_INSTRUCTION_TABLE (keyed by the parsed
+    fields) and C_INSTRUCTION_TEXT_TABLE (keyed by the raw text dest=comp;jump).
+    """
 
     dest_dict = {
         "": "000",
@@ -103,3 +113,41 @@ class Code:
             str: The corresponding binary code, 3 bits
         """
         return self.jump_dict[string]
+
+    # The integer tables are already shifted into their positions of the 16 bit word
+    # | 1 1 1 | a c1 c2 c3 c4 c5 c6 | d1 d2 d3 | j1 j2 j3 |
+    dest_bits = {dest: int(bits, 2) << 3 for dest, bits in dest_dict.items()}
+    comp_bits = {
+        comp: (int(bits, 2) << 6) | ((1 << 12) if "M" in comp else 0)
+        for comp, bits in comp_dict.items()
+    }
+    jump_bits = {jump: int(bits, 2) for jump, bits in jump_dict.items()}
+
+
+def _build_c_instruction_tables() -> (
+    Tuple[Dict[Tuple[str, str, str], int], Dict[str, int]]
+):
+    """Precompute the machine words of all C-instructions.
+
+    Returns:
+        Tuple[Dict[Tuple[str, str, str], int], Dict[str, int]]:
+            The map from (dest, comp, jump) to the machine word, and the map from the text
+            representation dest=comp;jump to the machine word
+    """
+    triple_table: Dict[Tuple[str, str, str], int] = {}
+    text_table: Dict[str, int] = {}
+    for dest, dest_bits in Code.dest_bits.items():
+        for comp, comp_bits in Code.comp_bits.items():
+            for jump, jump_bits in Code.jump_bits.items():
+                word = C_INSTRUCTION_PREFIX | comp_bits | dest_bits | jump_bits
+                triple_table[(dest, comp, jump)] = word
+                text = comp
+                if dest:
+                    text = f"{dest}={text}"
+                if jump:
+                    text = f"{text};{jump}"
+                text_table[text] = word
+    return triple_table, text_table
+
+
+C_INSTRUCTION_TABLE, C_INSTRUCTION_TEXT_TABLE = _build_c_instruction_tables()
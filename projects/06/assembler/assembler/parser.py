@@ -1,12 +1,91 @@
 """Module containing Parser class."""
 
-import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+# Size of the chunks read from the input file
+BUFFER_SIZE = 2**20
+
+
+class Instruction(NamedTuple):
+    """A pre-classified instruction.
+
+    Only the fields relevant for the instruction type are populated, the rest are empty strings.
+    """
+
+    instruction_type: str
+    symbol: str = ""
+    dest: str = ""
+    comp: str = ""
+    jump: str = ""
+
+
+def strip_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the instructions of the lines stripped of comments and whitespace.
+
+    Blank lines and lines only containing comments are skipped.
+
+    Args:
+        lines (Iterable[str]): The lines of the .asm program
+
+    Yields:
+        str: The stripped instruction
+    """
+    for line in lines:
+        line = line.split("//", 1)[0].strip()
+        if line:
+            yield line
+
+
+def classify(instruction: str) -> Instruction:
+    """Classify a stripped instruction.
+
+    Args:
+        instruction (str): Instruction stripped of comments and surrounding whitespace
+
+    Returns:
+        Instruction: The classified instruction
+    """
+    first_char = instruction[0]
+    if first_char == "@":
+        # NOTE: The stripping mirrors Parser.symbol
+        symbol = instruction.lstrip("@").rstrip(")").lstrip("(")
+        return Instruction("A_INSTRUCTION", symbol)
+    if first_char == "(":
+        return Instruction("L_INSTRUCTION", instruction.rstrip(")").lstrip("("))
+    instruction = instruction.replace(" ", "")
+    dest = ""
+    jump = ""
+    if "=" in instruction:
+        dest, instruction = instruction.split("=", 1)
+    if ";" in instruction:
+        instruction, jump = instruction.split(";", 1)
+    return Instruction("C_INSTRUCTION", "", dest, instruction, jump)
+
+
+def parse_instructions(lines: Iterable[str]) -> List[Instruction]:
+    """Parse lines of symbolic Hack code into a list of pre-classified instructions.
+
+    Args:
+        lines (Iterable[str]): The lines of the .asm program
+
+    Returns:
+        List[Instruction]: The classified instructions (including L_INSTRUCTIONs)
+    """
+    return [classify(instruction) for instruction in strip_lines(lines)]
 
 
 class Parser:
-    """Class parsing .asm files."""
+    """Class parsing .asm files.
+
+    The preferred way of using the parser is to iterate over it
+
+    >>> for instruction in Parser("Prog.asm"):
+    ...     print(instruction.instruction_type)
+
+    has_more_lines and advance are kept for compatibility, and are served by the same
+    buffered line iterator.
+    """
 
     def __init__(self, path: str) -> None:
         """Open input file to parse.
@@ -14,29 +93,40 @@ class Parser:
         Args:
             path (str): Path to file to parse
         """
-        self.file = Path(path).resolve().open("r")
+        self.file = Path(path).resolve().open("r", buffering=BUFFER_SIZE)
         self.current_instruction: Optional[str] = None
-        # Regexes
-        starting_with_comment = r"^\s*(\/{2,}|\n)"
-        self.ignore_re = re.compile(starting_with_comment)
+        self._instructions = strip_lines(self.file)
+        # Instruction read by has_more_lines, but not yet made current by advance
+        self._next_instruction: Optional[str] = None
 
     def __del__(self):
         """Close the file."""
         self.file.close()
 
+    def __iter__(self) -> Iterator[Instruction]:
+        """Iterate over the remaining instructions.
+
+        Yields:
+            Instruction: The next classified instruction
+        """
+        if self._next_instruction is not None:
+            # The instruction has already been read by has_more_lines
+            self.advance()
+            # Type ignore as mypy doesn't detect that advance sets the instruction
+            yield classify(self.current_instruction)  # type: ignore
+        for instruction in self._instructions:
+            self.current_instruction = instruction
+            yield classify(instruction)
+
     def has_more_lines(self) -> bool:
-        """Return if the file has more lines.
+        """Return if the file has more instructions.
 
         Returns:
-            bool: True if the file has more lines
+            bool: True if the file has more instructions
         """
-        cur_pos = self.file.tell()
-        # The return value of .readline() is unambiguous
-        # It will return "" only on the last line
-        # A blank line will be returned as "\n"
-        next_line_not_empty = bool(self.file.readline())
-        self.file.seek(cur_pos)
-        return next_line_not_empty
+        if self._next_instruction is None:
+            self._next_instruction = next(self._instructions, None)
+        return self._next_instruction is not None
 
     def advance(self) -> None:
         """Read the next instruction and make it the current instruction.
@@ -46,28 +136,9 @@ class Parser:
 
         This method should be called only if has_more_lines is true.
         """
-        found_line = False
-
-        while not found_line:
-            line = self.file.readline()
-            # Check if we are at the end of the file
-            if line == "":
-                self.current_instruction = None
-                return
-
-            # Check if this line can be skipped
-            if self.ignore_re.match(line) is not None:
-                continue
-
-            # We've found an instruction
-            found_line = True
-            self.current_instruction = line
-
-        if isinstance(self.current_instruction, str):
-            # Remove any comments
-            self.current_instruction = self.current_instruction.split("//")[0]
-            # Remove trailing whitespaces
-            self.current_instruction = self.current_instruction.rstrip().lstrip()
+        self.has_more_lines()
+        self.current_instruction = self._next_instruction
+        self._next_instruction = None
 
     def instruction_type(self) -> str:
         """Return the current instruction type.
@@ -0,0 +1,122 @@
+"""Module containing functions for reading and writing Hack ROM images.
+
+Two formats are supported
+- The text format (.hack) with one 16 character binary string per instruction
+- The packed binary format (.bin) with one 16 bit word per instruction
+"""
+
+import mmap
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Literal, Sequence
+
+ByteOrder = Literal["little", "big"]
+OutputFormat = Literal["hack", "bin"]
+
+# Number of words in the instruction memory of the Hack computer
+ROM_SIZE = 2**15
+
+
+def write_hack(path: Path, words: Iterable[int]) -> None:
+    """Write machine words as a .hack text file.
+
+    Args:
+        path (Path): Path to write to
+        words (Iterable[int]): The 16 bit machine words
+    """
+    with path.open("w", encoding="ASCII") as hack_file:
+        hack_file.write("".join([f"{word:016b}\n" for word in words]))
+
+
+def read_hack(path: Path) -> array:
+    """Read a .hack text file.
+
+    Args:
+        path (Path): Path to the .hack file
+
+    Returns:
+        array: The 16 bit machine words
+    """
+    with path.open("r", encoding="ASCII") as hack_file:
+        return array("H", [int(line, 2) for line in hack_file if line.strip()])
+
+
+def write_rom(
+    path: Path,
+    words: Iterable[int],
+    byteorder: ByteOrder = "little",
+    pad: bool = False,
+) -> None:
+    """Write machine words as a packed binary ROM image.
+
+    Args:
+        path (Path): Path to write to
+        words (Iterable[int]): The 16 bit machine words
+        byteorder (ByteOrder, optional): The byte order of the words. Defaults to "little".
+        pad (bool, optional): Whether to pad the image with zeros to ROM_SIZE words.
+            Defaults to False.
+
+    Raises:
+        ValueError: If the program does not fit in the ROM
+    """
+    rom = array("H", words)
+    if len(rom) > ROM_SIZE:
+        raise ValueError(f"The program has {len(rom)} > {ROM_SIZE} instructions")
+    if pad:
+        rom.frombytes(bytes(2 * (ROM_SIZE - len(rom))))
+    if byteorder != sys.byteorder:
+        rom.byteswap()
+    with path.open("wb") as rom_file:
+        rom.tofile(rom_file)
+
+
+def load_rom(path: Path, byteorder: ByteOrder = "little") -> Sequence[int]:
+    """Memory map a packed binary ROM image.
+
+    If the byte order of the image is the native byte order, the words are served directly from
+    the memory map without copying.
+    Otherwise the image is copied into an array and byte swapped.
+
+    Args:
+        path (Path): Path to the ROM image
+        byteorder (ByteOrder, optional): The byte order of the words. Defaults to "little".
+
+    Raises:
+        ValueError: If the file does not consist of whole 16 bit words
+
+    Returns:
+        Sequence[int]: The 16 bit machine words
+    """
+    with path.open("rb") as rom_file:
+        size = path.stat().st_size
+        if size % 2 != 0:
+            raise ValueError(f"{path} has an odd number of bytes ({size})")
+        if size == 0:
+            # NOTE: Empty files cannot be memory mapped
+            return array("H")
+        rom_map = mmap.mmap(rom_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if byteorder == sys.byteorder:
+        return memoryview(rom_map).cast("H")
+
+    rom = array("H")
+    rom.frombytes(rom_map)
+    rom_map.close()
+    rom.byteswap()
+    return rom
+
+
+def load_program(path: Path, byteorder: ByteOrder = "little") -> Sequence[int]:
+    """Load the machine words of either a .hack file or a binary ROM image.
+
+    Args:
+        path (Path): Path to the .hack file or the ROM image
+        byteorder (ByteOrder, optional): The byte order of ROM images. Defaults to "little".
+
+    Returns:
+        Sequence[int]: The 16 bit machine words
+    """
+    if path.suffix == ".hack":
+        return read_hack(path)
+    return load_rom(path, byteorder=byteorder)
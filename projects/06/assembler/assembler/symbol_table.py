@@ -1,5 +1,7 @@
 """Module containing SymbolTable class."""
 
+from typing import Dict
+
 
 class SymbolTable:
     """Class for manipulating the symbol table."""
@@ -32,6 +34,10 @@ class SymbolTable:
             "THIS": 3,
             "THAT": 4,
         }
+        # Symbols used by A-instructions which may turn out to be variables
+        # NOTE: A dict is used as an insertion ordered set, so that the variables are
+        #       allocated in order of appearance
+        self._reserved_variables: Dict[str, None] = {}
 
     def add_entry(self, symbol: str, address: int) -> None:
         """Add <symbol, address> to the table.
@@ -73,3 +79,25 @@ class SymbolTable:
         slot = self._next_available_entry
         self._next_available_entry += 1
         return slot
+
+    def reserve_variable(self, symbol: str) -> None:
+        """Reserve a symbol used by an A-instruction as a potential variable.
+
+        The symbol will be allocated an address by resolve, unless it has been added to the table
+        (for example as a label) by then.
+
+        Args:
+            symbol (str): The symbol to reserve.
+        """
+        if symbol not in self.symbol_table:
+            self._reserved_variables[symbol] = None
+
+    def resolve(self) -> None:
+        """Allocate addresses to the reserved symbols which are still unknown.
+
+        The addresses are allocated in the order the symbols were first reserved.
+        """
+        for symbol in self._reserved_variables:
+            if symbol not in self.symbol_table:
+                self.symbol_table[symbol] = self.get_available_slot()
+        self._reserved_variables.clear()
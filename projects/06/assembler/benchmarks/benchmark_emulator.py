@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+"""Benchmark of the instructions per second the Hack emulator is able to execute."""
+
+import argparse
+import time
+from pathlib import Path
+
+from hack_emulator.cpu import CPU, KBD
+
+FILL_PATH = Path(__file__).parents[1].joinpath("tests", "data", "Fill.asm")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse input arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Hack emulator")
+    parser.add_argument(
+        "-n",
+        "--cycles",
+        type=int,
+        default=5_000_000,
+        help="Number of instructions to execute",
+    )
+    return parser.parse_args()
+
+
+def main(cycles: int) -> None:
+    """Benchmark the emulator by running Fill.asm with and without a key pressed.
+
+    Args:
+        cycles (int): Number of instructions to execute per run
+    """
+    start = time.perf_counter()
+    cpu = CPU.from_file(FILL_PATH)
+    print(f"{'load and decode':>16}{time.perf_counter() - start:>10.3f} s")
+    for key in (0, 1):
+        cpu.ram[KBD] = key
+        start = time.perf_counter()
+        cpu.run(cycles)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{f'KBD={key}':>16}{elapsed:>10.3f} s{cycles / elapsed / 1e6:>8.2f} MIPS"
+        )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(cycles=args.cycles)
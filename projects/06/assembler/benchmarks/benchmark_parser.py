@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""Benchmark of the lines per second the Parser is able to process."""
+
+from pathlib import Path
+
+from assembler.parser import Parser
+from benchmarks.parser_benchmark import parse_args, run
+
+SYNTHETIC_LINES = (
+    "// A comment line\n",
+    "(LOOP)\n",
+    "    @i  // Select i\n",
+    "    D=M\n",
+    "\n",
+    "    @100\n",
+    "    D=D-A;JGT\n",
+    "    AM=M-1  // Decrement\n",
+)
+
+
+def compatibility_loop(path: Path) -> int:
+    """Read the file with the has_more_lines/advance API.
+
+    Args:
+        path (Path): The file to read
+
+    Returns:
+        int: Number of instructions found
+    """
+    parser = Parser(str(path))
+    count = 0
+    while parser.has_more_lines():
+        parser.advance()
+        count += 1
+    return count
+
+
+def iterator_loop(path: Path) -> int:
+    """Read the file by iterating over the parser.
+
+    Args:
+        path (Path): The file to read
+
+    Returns:
+        int: Number of instructions found
+    """
+    return sum(1 for _ in Parser(str(path)))
+
+
+def main(lines: int) -> None:
+    """Benchmark the parser.
+
+    Args:
+        lines (int): Number of lines in the synthetic input
+    """
+    run(
+        "Synthetic.asm",
+        SYNTHETIC_LINES,
+        (
+            ("has_more_lines/advance", compatibility_loop),
+            ("iterator (incl. classify)", iterator_loop),
+        ),
+        lines,
+        "instructions",
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args("Benchmark the .asm parser")
+    main(args.lines)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+"""Benchmark of the symbol resolution for programs with many variables."""
+
+import argparse
+import time
+from typing import List
+
+from assembler.assembler import resolve_symbols
+from assembler.parser import Instruction
+from assembler.symbol_table import SymbolTable
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse input arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark symbol resolution with many unique variables"
+    )
+    parser.add_argument(
+        "-n",
+        "--variables",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Number of unique variables in the synthetic programs",
+    )
+    parser.add_argument(
+        "--max-list-variables",
+        type=int,
+        default=10_000,
+        help="Largest program to run the (quadratic) list based resolution on",
+    )
+    return parser.parse_args()
+
+
+def synthetic_program(variables: int) -> List[Instruction]:
+    """Return a program which uses each variable twice and has a label per 100 variables.
+
+    Args:
+        variables (int): Number of unique variables
+
+    Returns:
+        List[Instruction]: The instructions of the program
+    """
+    instructions: List[Instruction] = []
+    for index in range(variables):
+        if index % 100 == 0:
+            instructions.append(Instruction("A_INSTRUCTION", f"LABEL_{index}"))
+            instructions.append(Instruction("L_INSTRUCTION", f"LABEL_{index}"))
+        instructions.append(Instruction("A_INSTRUCTION", f"var_{index}"))
+        instructions.append(Instruction("C_INSTRUCTION", "", "M", "D", ""))
+        instructions.append(Instruction("A_INSTRUCTION", f"var_{index}"))
+        instructions.append(Instruction("C_INSTRUCTION", "", "D", "M", ""))
+    return instructions
+
+
+def resolve_symbols_list(instructions: List[Instruction]) -> SymbolTable:
+    """Resolve the symbols the way first_pass did before using SymbolTable.reserve_variable.
+
+    Args:
+        instructions (List[Instruction]): The instructions of the program
+
+    Returns:
+        SymbolTable: The filled symbol table
+    """
+    symbol_table = SymbolTable()
+    instruction_line = 0
+    a_instruction_symbols = []
+    for instruction_type, symbol, *_ in instructions:
+        if instruction_type == "L_INSTRUCTION":
+            symbol_table.add_entry(symbol=symbol, address=instruction_line)
+        else:
+            if instruction_type == "A_INSTRUCTION":
+                if (
+                    not symbol.isdigit()
+                    and not symbol_table.contains(symbol)
+                    and symbol not in a_instruction_symbols
+                ):
+                    a_instruction_symbols.append(symbol)
+            instruction_line += 1
+    for symbol in list(symbol_table.symbol_table):
+        if symbol in a_instruction_symbols:
+            a_instruction_symbols.remove(symbol)
+    for symbol in a_instruction_symbols:
+        symbol_table.add_entry(symbol=symbol, address=symbol_table.get_available_slot())
+    return symbol_table
+
+
+def main(variables: List[int], max_list_variables: int) -> None:
+    """Benchmark the symbol resolution.
+
+    Args:
+        variables (List[int]): Number of unique variables of the synthetic programs
+        max_list_variables (int): Largest program to run the list based resolution on
+    """
+    print(f"{'variables':>10}{'list (before)':>16}{'reserve_variable':>20}")
+    for cur_variables in variables:
+        instructions = synthetic_program(cur_variables)
+
+        start = time.perf_counter()
+        symbol_table = resolve_symbols(instructions)
+        elapsed = time.perf_counter() - start
+
+        list_elapsed = "skipped"
+        if cur_variables <= max_list_variables:
+            start = time.perf_counter()
+            list_symbol_table = resolve_symbols_list(instructions)
+            list_elapsed = f"{time.perf_counter() - start:.3f} s"
+            assert list_symbol_table.symbol_table == symbol_table.symbol_table
+
+        print(f"{cur_variables:>10}{list_elapsed:>16}{elapsed:>18.3f} s")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(variables=args.variables, max_list_variables=args.max_list_variables)
@@ -0,0 +1,129 @@
+"""Module containing the helpers of the benchmarks of the lines per second a parser processes.
+
+The parser benchmarks of the assembler and of the VM translator only differ by their synthetic
+input and their parser API.
+
+NOTE: This module is duplicated in the benchmarks of the assembler and the VM translator, as the
+      projects are independent of each other
+"""
+
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Sequence, Tuple
+
+Loop = Callable[[Path], int]
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    """Parse input arguments.
+
+    Args:
+        description (str): The description of the benchmark
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "-n",
+        "--lines",
+        type=int,
+        default=1_000_000,
+        help="Number of lines in the synthetic input",
+    )
+    return parser.parse_args()
+
+
+def write_synthetic_file(
+    path: Path, synthetic_lines: Sequence[str], lines: int
+) -> None:
+    """Write a synthetic file repeating the synthetic lines.
+
+    Args:
+        path (Path): Path to write to
+        synthetic_lines (Sequence[str]): The lines to repeat
+        lines (int): Number of lines to write
+    """
+    repeats, remainder = divmod(lines, len(synthetic_lines))
+    with path.open("w") as file:
+        file.writelines(list(synthetic_lines) * repeats)
+        file.writelines(synthetic_lines[:remainder])
+
+
+def probing_loop(path: Path) -> int:
+    """Read the file the way the parsers did before using the buffered line iterator.
+
+    Every call to has_more_lines (has_more_commands in the VM translator) did tell(),
+    readline() and seek(), so every line was read twice.
+
+    Args:
+        path (Path): The file to read
+
+    Returns:
+        int: Number of instructions found
+    """
+    ignore_re = re.compile(r"^\s*(\/{2,}|\n)")
+    count = 0
+    with path.open("r") as file:
+        while True:
+            cur_pos = file.tell()
+            next_line_not_empty = bool(file.readline())
+            file.seek(cur_pos)
+            if not next_line_not_empty:
+                break
+            while True:
+                line = file.readline()
+                if line == "":
+                    break
+                if ignore_re.match(line) is not None:
+                    continue
+                line.split("//")[0].rstrip().lstrip()
+                count += 1
+                break
+    return count
+
+
+def report(name: str, loop: Loop, path: Path, lines: int, unit: str) -> None:
+    """Time a loop and print the number of lines per second.
+
+    Args:
+        name (str): Name of the loop
+        loop (Loop): The loop to time
+        path (Path): The file to read
+        lines (int): Number of lines in the file
+        unit (str): What the loop counts, for example instructions
+    """
+    start = time.perf_counter()
+    found = loop(path)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<30}{lines/elapsed:>15,.0f} lines/s "
+        f"({found} {unit} in {elapsed:.2f} s)"
+    )
+
+
+def run(
+    file_name: str,
+    synthetic_lines: Sequence[str],
+    loops: Sequence[Tuple[str, Loop]],
+    lines: int,
+    unit: str,
+) -> None:
+    """Benchmark the loops of a parser against the probing loop.
+
+    Args:
+        file_name (str): The name of the synthetic file, for example Synthetic.asm
+        synthetic_lines (Sequence[str]): The lines repeated in the synthetic file
+        loops (Sequence[Tuple[str, Loop]]): The names of the loops of the parser, and the loops
+        lines (int): Number of lines in the synthetic input
+        unit (str): What the loops count, for example instructions
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir).joinpath(file_name)
+        write_synthetic_file(path, synthetic_lines, lines)
+        report("tell/readline/seek (before)", probing_loop, path, lines, unit)
+        for name, loop in loops:
+            report(name, loop, path, lines, unit)
@@ -0,0 +1 @@
+"""Package containing the Hack emulator package."""
@@ -0,0 +1,216 @@
+"""Module containing the BatchCPU class.
+
+The batch emulator runs N Hack computers in lockstep, where the state of the machines are held in
+NumPy arrays and every step is evaluated vectorized over all the machines which have not halted.
+
+NOTE: NumPy is an optional dependency which is only needed for the batch emulator
+"""
+
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from assembler.rom import ROM_SIZE
+from hack_emulator.cpu import (
+    A_BIT,
+    C_INSTRUCTION_BIT,
+    COMP_EXPRESSIONS,
+    COMP_MASK,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    RAM_SIZE,
+)
+
+IntArray = npt.NDArray[np.int32]
+Kernel = Callable[[IntArray, IntArray], IntArray]
+
+# Map from the comp bits to the vectorized ALU kernel, where x is the D register and y is either
+# the A register or M
+# NOTE: The kernels are compiled from the same expression templates as the closures of the CPU,
+#       which are built from the encoding tables of the assembler
+KERNELS: Dict[int, Kernel] = {
+    # Eval is used as the templates are python expressions which also work on arrays
+    comp_bits: eval(  # pylint: disable=eval-used
+        f"lambda x, y: {expression.format(x='x', y='y')}"
+    )
+    for comp_bits, expression in COMP_EXPRESSIONS.items()
+}
+
+
+class BatchCPU:  # pylint: disable=too-many-instance-attributes
+    """Class emulating a batch of Hack computers in lockstep.
+
+    The machines may either run different programs, or the same program with different initial
+    RAM.
+    A machine halts when it enters the terminating infinite loop of its program, after which it is
+    masked out of the execution.
+    """
+
+    def __init__(
+        self,
+        programs: Sequence[Sequence[int]],
+        program_index: Optional[Sequence[int]] = None,
+    ) -> None:
+        """Load the programs and reset the machines.
+
+        Args:
+            programs (Sequence[Sequence[int]]): The machine words of the programs
+            program_index (Optional[Sequence[int]], optional): The index of the program each
+                machine runs. If None, machine i runs program i. Defaults to None.
+
+        Raises:
+            ValueError: If a program does not fit in the ROM
+        """
+        if program_index is None:
+            program_index = range(len(programs))
+        self.program_index = np.asarray(program_index, dtype=np.intp)
+        machines = len(self.program_index)
+
+        # The ROM has a trailing column of @0 instructions which addresses beyond the end of the
+        # programs are clipped to
+        self._rom_end = max((len(program) for program in programs), default=0)
+        if self._rom_end > ROM_SIZE:
+            raise ValueError(f"A program has {self._rom_end} > {ROM_SIZE} instructions")
+        self.rom = np.zeros((len(programs), self._rom_end + 1), dtype=np.int32)
+        for index, program in enumerate(programs):
+            self.rom[index, : len(program)] = program
+        self._halt_rom = self._find_halts(self.rom)
+
+        self.ram = np.zeros((machines, RAM_SIZE), dtype=np.int16)
+        self.a = np.zeros(machines, dtype=np.int32)
+        self.d = np.zeros(machines, dtype=np.int32)
+        self.pc = np.zeros(machines, dtype=np.int32)
+        self.cycles = np.zeros(machines, dtype=np.int64)
+        self.halted = np.zeros(machines, dtype=bool)
+
+    @classmethod
+    def from_program(cls, program: Sequence[int], machines: int) -> "BatchCPU":
+        """Create a batch of machines all running the same program.
+
+        Args:
+            program (Sequence[int]): The machine words of the program
+            machines (int): The number of machines
+
+        Returns:
+            BatchCPU: The batch
+        """
+        return cls([program], program_index=[0] * machines)
+
+    @staticmethod
+    def _find_halts(rom: IntArray) -> npt.NDArray[np.bool_]:
+        """Find the jumps of the terminating infinite loops of the programs.
+
+        That is 0;JMP instructions without dest which are preceded by an A-instruction loading
+        their own address (@END where END is the label of the A-instruction).
+
+        Args:
+            rom (IntArray): The ROM of the programs
+
+        Returns:
+            npt.NDArray[np.bool_]: True for the addresses of the jumps
+        """
+        halts = np.zeros(rom.shape, dtype=bool)
+        addresses = np.arange(1, rom.shape[1])
+        halts[:, 1:] = (
+            ((rom[:, 1:] & C_INSTRUCTION_BIT) != 0)
+            & ((rom[:, 1:] & 0b111111) == 0b000111)
+            & (rom[:, :-1] == addresses - 1)
+        )
+        return halts
+
+    def step(self) -> int:
+        """Execute one instruction on all the machines which have not halted.
+
+        Raises:
+            ValueError: If the comp bits of an instruction does not correspond to a Hack ALU
+                operation
+
+        Returns:
+            int: The number of machines which executed an instruction
+        """
+        rows = np.flatnonzero(~self.halted)
+        if rows.size == 0:
+            return 0
+        pc = self.pc[rows]
+        programs = self.program_index[rows]
+        rom_pc = np.minimum(pc, self._rom_end)
+        words = self.rom[programs, rom_pc]
+        next_pc = (pc + 1) & (ROM_SIZE - 1)
+
+        is_c = (words & C_INSTRUCTION_BIT) != 0
+        # A-instructions
+        self.a[rows[~is_c]] = words[~is_c]
+
+        # C-instructions
+        c_index = np.flatnonzero(is_c)
+        if c_index.size:
+            c_rows = rows[c_index]
+            next_pc[c_index] = self._execute_c_instructions(
+                c_rows, words[c_index], next_pc[c_index]
+            )
+            halts = self._halt_rom[programs[c_index], rom_pc[c_index]]
+            self.halted[c_rows[halts]] = True
+
+        self.pc[rows] = next_pc
+        self.cycles[rows] += 1
+        return rows.size
+
+    def _execute_c_instructions(
+        self, rows: npt.NDArray[np.intp], words: IntArray, next_pc: IntArray
+    ) -> IntArray:
+        """Execute C-instructions.
+
+        Args:
+            rows (npt.NDArray[np.intp]): The machines executing a C-instruction
+            words (IntArray): The C-instructions
+            next_pc (IntArray): The address of the next instruction if no jump is taken
+
+        Raises:
+            ValueError: If the comp bits of an instruction does not correspond to a Hack ALU
+                operation
+
+        Returns:
+            IntArray: The address of the next instruction
+        """
+        # The old value of the A register is the address of M and the jump target
+        address = self.a[rows] & (RAM_SIZE - 1)
+        x = self.d[rows]
+        y = np.where((words & A_BIT) != 0, self.ram[rows, address], self.a[rows])
+
+        # Group the machines by their ALU operation
+        out = np.empty(rows.size, dtype=np.int32)
+        comp = words & COMP_MASK
+        for comp_bits in np.unique(comp):
+            if comp_bits not in KERNELS:
+                raise ValueError(f"Illegal comp bits {int(comp_bits) >> 6:06b}")
+            selected = comp == comp_bits
+            out[selected] = KERNELS[comp_bits](x[selected], y[selected])
+
+        dest_m = (words & DEST_M) != 0
+        self.ram[rows[dest_m], address[dest_m]] = out[dest_m]
+        dest_a = (words & DEST_A) != 0
+        self.a[rows[dest_a]] = out[dest_a]
+        dest_d = (words & DEST_D) != 0
+        self.d[rows[dest_d]] = out[dest_d]
+
+        jump = (
+            (((words & 0b100) != 0) & (out < 0))
+            | (((words & 0b010) != 0) & (out == 0))
+            | (((words & 0b001) != 0) & (out > 0))
+        )
+        return np.where(jump, address, next_pc)
+
+    def run(self, cycles: int) -> int:
+        """Execute instructions until all machines have halted.
+
+        Args:
+            cycles (int): The maximum number of steps to execute
+
+        Returns:
+            int: The number of executed steps
+        """
+        for executed in range(cycles):
+            if self.step() == 0:
+                return executed
+        return cycles
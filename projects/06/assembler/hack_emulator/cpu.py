@@ -0,0 +1,358 @@
+"""Module containing the CPU class.
+
+Every word of the ROM is decoded once into a specialized closure, so that executing an
+instruction is a single call through the dispatch table
+
+>>> pc = dispatch_table[pc]()
+
+The closures of the C-instructions are generated from source templates, one factory per distinct
+combination of comp, dest and jump bits.
+"""
+
+from array import array
+from itertools import count
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from assembler.assembler import assemble
+from assembler.code import Code
+from assembler.rom import ROM_SIZE, ByteOrder, load_program
+
+# Number of words in the data memory of the Hack computer
+RAM_SIZE = 2**15
+SCREEN = 16384
+KBD = 24576
+
+# Indices of the registers in the register list shared by the closures
+A_REGISTER = 0
+D_REGISTER = 1
+
+# Masks of the fields of a C-instruction
+# | 1 1 1 | a c1 c2 c3 c4 c5 c6 | d1 d2 d3 | j1 j2 j3 |
+C_INSTRUCTION_BIT = 1 << 15
+A_BIT = 1 << 12
+COMP_MASK = 0b111111 << 6
+DEST_A = 0b100 << 3
+DEST_D = 0b010 << 3
+DEST_M = 0b001 << 3
+JUMP_MASK = 0b111
+# The bits which determines the behaviour of a C-instruction
+C_INSTRUCTION_MASK = A_BIT | COMP_MASK | (0b111 << 3) | JUMP_MASK
+
+# Map from the comp bits to the python expression template of the ALU output, where x is the D
+# register and y is either the A register or M
+# NOTE: Only the sums and differences can overflow, ~ and the bitwise operators of 16 bit signed
+#       integers are 16 bit signed integers
+COMP_EXPRESSIONS: Dict[int, str] = {}
+for _comp, _bits in Code.comp_bits.items():
+    if "M" in _comp:
+        continue
+    _expression = _comp.replace("D", "{x}").replace("A", "{y}").replace("!", "~")
+    if _comp not in ("-1", "1", "0") and ("+" in _comp or "-" in _comp):
+        _expression = f"((({_expression}) + 0x8000) & 0xFFFF) - 0x8000"
+    COMP_EXPRESSIONS[_bits] = _expression
+
+# Map from the jump bits to the condition on the ALU output
+JUMP_CONDITIONS = {
+    0b001: "out > 0",
+    0b010: "out == 0",
+    0b011: "out >= 0",
+    0b100: "out < 0",
+    0b101: "out != 0",
+    0b110: "out <= 0",
+    0b111: "True",
+}
+
+Operation = Callable[[], int]
+OperationFactory = Callable[[List[int], array, int], Operation]
+
+
+class Halt(Exception):
+    """Exception raised when the CPU enters the terminating infinite loop of a program."""
+
+
+def render_c_operation(word: int) -> str:
+    """Render the source code of the factory of a C-instruction.
+
+    The generated factory takes the register list, the RAM and the address of the next
+    instruction, and returns the closure executing the instruction.
+    The closure returns the address of the next instruction to execute.
+
+    NOTE: The RAM has exactly 2**15 words, so indexing it with a negative A register is the same
+          as indexing it with the 15 least significant bits.
+          The jump targets are masked explicitly, as the dispatch table is only padded to the
+          full ROM size on demand
+
+    Args:
+        word (int): The machine word of the C-instruction
+
+    Raises:
+        ValueError: If the comp bits does not correspond to a Hack ALU operation
+
+    Returns:
+        str: The source code of the factory named factory
+    """
+    comp_bits = word & COMP_MASK
+    if comp_bits not in COMP_EXPRESSIONS:
+        raise ValueError(f"Illegal comp bits in the instruction {word:016b}")
+    expression = COMP_EXPRESSIONS[comp_bits]
+    jump_bits = word & JUMP_MASK
+    # The old value of the A register is the address of M and the jump target
+    uses_a = "{y}" in expression or bool(word & DEST_M) or jump_bits != 0
+
+    # NOTE: x and y occur at most once in the expressions, so they are substituted in place
+    expression = expression.format(x="reg[1]", y="ram[a]" if word & A_BIT else "a")
+
+    body: List[str] = []
+    if uses_a:
+        body.append("a = reg[0]")
+    body.append(f"out = {expression}")
+    if word & DEST_M:
+        body.append("ram[a] = out")
+    if word & DEST_A:
+        body.append("reg[0] = out")
+    if word & DEST_D:
+        body.append("reg[1] = out")
+    if jump_bits == 0b111:
+        body.append("return a & 32767")
+    else:
+        if jump_bits:
+            body.append(f"if {JUMP_CONDITIONS[jump_bits]}:")
+            body.append("    return a & 32767")
+        body.append("return nxt")
+
+    lines = ["def factory(reg, ram, nxt):", "    def operation():"]
+    lines.extend(f"        {line}" for line in body)
+    lines.append("    return operation")
+    return "\n".join(lines)
+
+
+def make_a_operation(reg: List[int], value: int, nxt: int) -> Operation:
+    """Make the closure executing an A-instruction.
+
+    Args:
+        reg (List[int]): The register list shared by the closures
+        value (int): The value to load into the A register
+        nxt (int): The address of the next instruction
+
+    Returns:
+        Operation: The closure
+    """
+
+    def operation() -> int:
+        reg[0] = value
+        return nxt
+
+    return operation
+
+
+def make_halt_operation(address: int) -> Operation:
+    """Make the closure of the jump back to the @address instruction ending a program.
+
+    Args:
+        address (int): The address of the A-instruction of the terminating loop
+
+    Returns:
+        Operation: The closure
+    """
+
+    def operation() -> int:
+        raise Halt(address)
+
+    return operation
+
+
+class CPU:
+    """Class emulating the Hack computer.
+
+    The RAM is an array of signed 16 bit integers, where the screen and the keyboard are memory
+    mapped to SCREEN and KBD.
+    """
+
+    # Factories of the C-instructions shared by all instances
+    _factories: Dict[int, OperationFactory] = {}
+
+    def __init__(self, program: Sequence[int] = ()) -> None:
+        """Load a program into the ROM and reset the computer.
+
+        Args:
+            program (Sequence[int], optional): The machine words of the program. Defaults to ().
+        """
+        self.ram = array("h", bytes(2 * RAM_SIZE))
+        self.reg = [0, 0]
+        self.pc = 0
+        self.cycles = 0
+        self.halted = False
+        self.rom: array = array("H")
+        self._dispatch_table: List[Operation] = []
+        self.load(program)
+
+    @classmethod
+    def from_file(
+        cls, path: Union[str, Path], byteorder: ByteOrder = "little"
+    ) -> "CPU":
+        """Create a CPU running a .asm, .hack or binary ROM file.
+
+        Args:
+            path (Union[str, Path]): Path to the program
+            byteorder (ByteOrder, optional): The byte order of ROM images. Defaults to "little".
+
+        Returns:
+            CPU: The CPU with the program loaded
+        """
+        path = Path(path)
+        if path.suffix == ".asm":
+            return cls(assemble(path.read_text()))
+        return cls(load_program(path, byteorder=byteorder))
+
+    @property
+    def a(self) -> int:  # pylint: disable=invalid-name
+        """Return the A register.
+
+        Returns:
+            int: The value of the A register
+        """
+        return self.reg[A_REGISTER]
+
+    @a.setter
+    def a(self, value: int) -> None:  # pylint: disable=invalid-name
+        """Set the A register.
+
+        Args:
+            value (int): The new value
+        """
+        self.reg[A_REGISTER] = value
+
+    @property
+    def d(self) -> int:  # pylint: disable=invalid-name
+        """Return the D register.
+
+        Returns:
+            int: The value of the D register
+        """
+        return self.reg[D_REGISTER]
+
+    @d.setter
+    def d(self, value: int) -> None:  # pylint: disable=invalid-name
+        """Set the D register.
+
+        Args:
+            value (int): The new value
+        """
+        self.reg[D_REGISTER] = value
+
+    def load(self, program: Sequence[int]) -> None:
+        """Load a program into the ROM, pre-decode it and reset the computer.
+
+        Args:
+            program (Sequence[int]): The machine words of the program
+
+        Raises:
+            ValueError: If the program does not fit in the ROM
+        """
+        if len(program) > ROM_SIZE:
+            raise ValueError(
+                f"The program has {len(program)} > {ROM_SIZE} instructions"
+            )
+        self.rom = array("H", program)
+        self._dispatch_table = [
+            self._decode(address) for address in range(len(self.rom))
+        ]
+        self.reset()
+
+    def _pad_dispatch_table(self) -> None:
+        """Pad the dispatch table with the empty ROM words, which are @0 instructions.
+
+        This is only done when the execution leaves the program, as it is expensive compared to
+        decoding a typical program.
+        """
+        self._dispatch_table.extend(
+            make_a_operation(self.reg, 0, (address + 1) % ROM_SIZE)
+            for address in range(len(self._dispatch_table), ROM_SIZE)
+        )
+
+    def reset(self) -> None:
+        """Reset the program counter."""
+        self.pc = 0
+        self.cycles = 0
+        self.halted = False
+
+    def _decode(self, address: int) -> Operation:
+        """Decode the word at the address into a closure.
+
+        Args:
+            address (int): The address of the word in the ROM
+
+        Returns:
+            Operation: The closure executing the instruction
+        """
+        word = self.rom[address]
+        nxt = (address + 1) % ROM_SIZE
+        if not word & C_INSTRUCTION_BIT:
+            return make_a_operation(self.reg, word, nxt)
+        if (
+            word & C_INSTRUCTION_MASK & ~COMP_MASK & ~A_BIT == 0b111
+            and address > 0
+            and self.rom[address - 1] == address - 1
+        ):
+            # The program ends with the infinite loop
+            # (END)
+            # @END
+            # 0;JMP
+            return make_halt_operation(address - 1)
+        return self.factory(word)(self.reg, self.ram, nxt)
+
+    @classmethod
+    def factory(cls, word: int) -> OperationFactory:
+        """Return the factory of the closures of a C-instruction.
+
+        The factories are generated the first time the bits are encountered.
+
+        Args:
+            word (int): The machine word of the C-instruction
+
+        Returns:
+            OperationFactory: The factory
+        """
+        key = word & C_INSTRUCTION_MASK
+        if key not in cls._factories:
+            namespace: Dict[str, OperationFactory] = {}
+            # Exec is used to generate one specialized closure per instruction type
+            exec(render_c_operation(key), namespace)  # pylint: disable=exec-used
+            cls._factories[key] = namespace["factory"]
+        return cls._factories[key]
+
+    def run(self, cycles: Optional[int] = None) -> int:
+        """Execute instructions.
+
+        The execution stops early if the program halts.
+
+        Args:
+            cycles (Optional[int], optional): The number of instructions to execute.
+                If None, the program is executed until it halts. Defaults to None.
+
+        Returns:
+            int: The number of executed instructions
+        """
+        dispatch_table = self._dispatch_table
+        pc = self.pc
+        executed = 0
+        # NOTE: The loop variable counts the instruction being executed
+        loop = iter(count(1) if cycles is None else range(1, cycles + 1))
+        while True:
+            try:
+                for executed in loop:
+                    pc = dispatch_table[pc]()
+            except IndexError:
+                # The execution left the program, pad the table and execute the instruction
+                # which was counted by the loop
+                self._pad_dispatch_table()
+                pc = dispatch_table[pc]()
+                continue
+            except Halt as halt:
+                pc = halt.args[0]
+                self.halted = True
+            break
+        self.pc = pc & (ROM_SIZE - 1)
+        self.cycles += executed
+        return executed
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""File containing functions for running Hack programs and .tst test scripts."""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional, get_args
+
+from assembler.rom import ByteOrder
+from hack_emulator.cpu import CPU
+from hack_emulator.script import Script
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse input arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Run a Hack program (.asm, .hack or .bin) or a .tst test script"
+    )
+    parser.add_argument(
+        "file",
+        type=Path,
+        help="The Hack program or test script to run",
+    )
+    parser.add_argument(
+        "-n",
+        "--cycles",
+        type=int,
+        default=None,
+        help="Number of instructions to execute (programs run until they halt by default)",
+    )
+    parser.add_argument(
+        "--byteorder",
+        choices=get_args(ByteOrder),
+        default="little",
+        help="Byte order of the words in binary ROM images",
+    )
+    return parser.parse_args()
+
+
+def main(
+    in_path: Path, cycles: Optional[int] = None, byteorder: ByteOrder = "little"
+) -> int:
+    """Run a Hack program or a test script.
+
+    Args:
+        in_path (Path): The .asm, .hack or .bin program, or the .tst test script
+        cycles (Optional[int], optional): Number of instructions to execute.
+            If None, the program runs until it halts. Defaults to None.
+        byteorder (ByteOrder, optional): Byte order of the words in binary ROM images.
+            Defaults to "little".
+
+    Returns:
+        int: The exit code, 1 if the test script output differs from the compare-to file
+    """
+    if in_path.suffix == ".tst":
+        script = Script(in_path)
+        script.run()
+        line_number = script.compare()
+        if line_number is not None:
+            print(f"Comparison failure at line {line_number}")
+            return 1
+        print("End of script - Comparison ended successfully")
+        return 0
+
+    cpu = CPU.from_file(in_path, byteorder=byteorder)
+    start = time.perf_counter()
+    executed = cpu.run(cycles)
+    elapsed = time.perf_counter() - start
+    state = "Halted" if cpu.halted else "Stopped"
+    print(
+        f"{state} at PC={cpu.pc} after {executed} instructions in {elapsed:.3f} s "
+        f"({executed / max(elapsed, 1e-9) / 1e6:.2f} million instructions per second)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    raise SystemExit(
+        main(args.file.resolve(), cycles=args.cycles, byteorder=args.byteorder)
+    )
@@ -0,0 +1,321 @@
+"""Module containing the Script class for running .tst test scripts on the CPU.
+
+The subset of the test script language used by the CPU emulator tests is supported, that is
+- load, output-file, compare-to and output-list
+- set RAM[n], set PC, set A and set D
+- ticktock, output and echo
+- repeat n { ... }
+"""
+
+import re
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from hack_emulator.cpu import CPU
+
+# Tokens of the script language: strings, block delimiters, command separators and words
+TOKEN_REGEX = re.compile(r'"[^"]*"|[{}]|[,;]|[^\s,;{}"]+')
+COMMENT_REGEX = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+# The output-list entries, for example RAM[0]%D1.6.1
+OUTPUT_REGEX = re.compile(
+    r"(?P<name>[^%]+)(%(?P<format>[BDSX])(?P<pad>\d+\.\d+\.\d+))?"
+)
+TARGET_REGEX = re.compile(r"RAM\[(?P<address>\d+)\]|PC|A|D")
+
+
+class Command(NamedTuple):
+    """A parsed script command."""
+
+    words: List[str]
+    body: Sequence["Command"] = ()
+
+
+class OutputColumn(NamedTuple):
+    """A column of the output-list."""
+
+    name: str
+    output_format: str = "B"
+    left: int = 1
+    width: int = 16
+    right: int = 1
+
+    def header(self) -> str:
+        """Return the header of the column.
+
+        Returns:
+            str: The name centered in the column
+        """
+        total = self.left + self.width + self.right
+        return self.name[:total].center(total)
+
+    def format(self, value: int) -> str:
+        """Format a value of the column.
+
+        Args:
+            value (int): The 16 bit signed value
+
+        Returns:
+            str: The value right aligned in the column
+        """
+        if self.output_format == "B":
+            text = f"{value & 0xFFFF:016b}"
+        elif self.output_format == "X":
+            text = f"{value & 0xFFFF:04X}"
+        else:
+            text = str(value)
+        return f"{' ' * self.left}{text[-self.width:]:>{self.width}}{' ' * self.right}"
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """Yield the tokens of a test script.
+
+    Args:
+        text (str): The test script
+
+    Yields:
+        str: The next token
+    """
+    yield from TOKEN_REGEX.findall(COMMENT_REGEX.sub(" ", text))
+
+
+def parse_commands(tokens: Iterator[str], in_block: bool = False) -> List[Command]:
+    """Parse the tokens into commands.
+
+    Args:
+        tokens (Iterator[str]): The tokens of the script
+        in_block (bool, optional): Whether the tokens are inside of a repeat block.
+            Defaults to False.
+
+    Raises:
+        ValueError: If the blocks are unbalanced
+
+    Returns:
+        List[Command]: The parsed commands
+    """
+    commands: List[Command] = []
+    words: List[str] = []
+    for token in tokens:
+        if token in (",", ";"):
+            if words:
+                commands.append(Command(words))
+            words = []
+        elif token == "{":
+            commands.append(Command(words, parse_commands(tokens, in_block=True)))
+            words = []
+        elif token == "}":
+            if not in_block:
+                raise ValueError("Unexpected }")
+            if words:
+                commands.append(Command(words))
+            return commands
+        else:
+            words.append(token)
+    if in_block:
+        raise ValueError("Missing }")
+    if words:
+        commands.append(Command(words))
+    return commands
+
+
+def parse_value(text: str) -> int:
+    """Parse a value of a set command.
+
+    Args:
+        text (str): The value, either decimal or prefixed by %D, %B or %X
+
+    Returns:
+        int: The value
+    """
+    base = {"%B": 2, "%X": 16, "%D": 10}.get(text[:2].upper())
+    if base is None:
+        return int(text)
+    value = int(text[2:], base)
+    # Convert binary and hexadecimal values to 16 bit signed integers
+    return value - 2**16 if value >= 2**15 else value
+
+
+class Script:
+    """Class running .tst test scripts."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Parse the test script.
+
+        Args:
+            path (Union[str, Path]): Path to the .tst file
+        """
+        self.path = Path(path).resolve()
+        self.commands = parse_commands(tokenize(self.path.read_text()))
+        self.cpu = CPU()
+        self.output_path: Optional[Path] = None
+        self.compare_path: Optional[Path] = None
+        self.columns: List[OutputColumn] = []
+        self.output_lines: List[str] = []
+
+    def run(self) -> List[str]:
+        """Run the test script.
+
+        The output is written to the output-file (if any).
+
+        Returns:
+            List[str]: The output lines
+        """
+        self.output_lines = []
+        self._execute(self.commands)
+        if self.output_path is not None:
+            self.output_path.write_text(
+                "".join(f"{line}\n" for line in self.output_lines)
+            )
+        return self.output_lines
+
+    def compare(self) -> Optional[int]:
+        """Compare the output with the compare-to file.
+
+        Returns:
+            Optional[int]: The first line number (starting at 1) which differs, or None if the
+                output matches
+        """
+        if self.compare_path is None:
+            return None
+        expected = self.compare_path.read_text().splitlines()
+        for line_number, (line, expected_line) in enumerate(
+            zip(self.output_lines, expected), start=1
+        ):
+            if line.rstrip() != expected_line.rstrip():
+                return line_number
+        if len(self.output_lines) != len(expected):
+            return min(len(self.output_lines), len(expected)) + 1
+        return None
+
+    def _execute(self, commands: Sequence[Command]) -> None:
+        """Execute commands.
+
+        Args:
+            commands (Sequence[Command]): The commands to execute
+
+        Raises:
+            ValueError: If a command is not supported
+        """
+        for words, body in commands:
+            name = words[0]
+            if name == "repeat":
+                self._repeat(words, body)
+            elif name == "ticktock":
+                self.cpu.run(1)
+            elif name == "set":
+                self._set(target=words[1], value=parse_value(words[2]))
+            elif name == "output":
+                self._output()
+            elif name == "output-list":
+                self._output_list(words[1:])
+            elif name == "load":
+                self.cpu = CPU.from_file(self.path.parent.joinpath(words[1]))
+            elif name == "output-file":
+                self.output_path = self.path.parent.joinpath(words[1])
+            elif name == "compare-to":
+                self.compare_path = self.path.parent.joinpath(words[1])
+            elif name == "echo":
+                print(" ".join(words[1:]).strip('"'))
+            else:
+                raise ValueError(f"Unsupported command {' '.join(words)}")
+
+    def _repeat(self, words: List[str], body: Sequence[Command]) -> None:
+        """Execute a repeat block.
+
+        Args:
+            words (List[str]): The words of the repeat command
+            body (Sequence[Command]): The body of the block
+
+        Raises:
+            ValueError: If the number of repetitions is missing
+        """
+        if len(words) != 2:
+            raise ValueError(
+                "Only repeat blocks with a number of repetitions are supported"
+            )
+        repetitions = int(words[1])
+        if [command.words for command in body] == [["ticktock"]]:
+            # Let the CPU run the cycles in one go
+            self.cpu.run(repetitions)
+            return
+        for _ in range(repetitions):
+            self._execute(body)
+
+    def _set(self, target: str, value: int) -> None:
+        """Set a register or a RAM address.
+
+        Args:
+            target (str): The target, for example RAM[0] or PC
+            value (int): The value to set
+
+        Raises:
+            ValueError: If the target is not supported
+        """
+        match = TARGET_REGEX.fullmatch(target)
+        if match is None:
+            raise ValueError(f"Unsupported target {target}")
+        if match["address"] is not None:
+            self.cpu.ram[int(match["address"])] = value
+        elif target == "PC":
+            self.cpu.pc = value
+            # The program may start over after halting
+            self.cpu.halted = False
+        elif target == "A":
+            self.cpu.a = value
+        else:
+            self.cpu.d = value
+
+    def _get(self, target: str) -> int:
+        """Get a register or a RAM address.
+
+        Args:
+            target (str): The target, for example RAM[0] or PC
+
+        Raises:
+            ValueError: If the target is not supported
+
+        Returns:
+            int: The value
+        """
+        match = TARGET_REGEX.fullmatch(target)
+        if match is None:
+            raise ValueError(f"Unsupported target {target}")
+        if match["address"] is not None:
+            return self.cpu.ram[int(match["address"])]
+        if target == "PC":
+            return self.cpu.pc
+        if target == "A":
+            return self.cpu.a
+        return self.cpu.d
+
+    def _output_list(self, entries: List[str]) -> None:
+        """Set the output columns and output the header.
+
+        Args:
+            entries (List[str]): The output-list entries, for example RAM[0]%D1.6.1
+
+        Raises:
+            ValueError: If an entry is malformed
+        """
+        self.columns = []
+        for entry in entries:
+            match = OUTPUT_REGEX.fullmatch(entry)
+            if match is None:
+                raise ValueError(f"Malformed output-list entry {entry}")
+            if match["format"] is None:
+                self.columns.append(OutputColumn(match["name"]))
+            else:
+                left, width, right = (int(pad) for pad in match["pad"].split("."))
+                self.columns.append(
+                    OutputColumn(match["name"], match["format"], left, width, right)
+                )
+        self.output_lines.append(
+            "|" + "|".join(column.header() for column in self.columns) + "|"
+        )
+
+    def _output(self) -> None:
+        """Output the values of the output columns."""
+        self.output_lines.append(
+            "|"
+            + "|".join(column.format(self._get(column.name)) for column in self.columns)
+            + "|"
+        )
@@ -1,9 +1,13 @@
 """Module integration testing the assembler."""
 
+import runpy
+import sys
 from pathlib import Path
 
 import pytest
-from assembler.assemble import first_pass, main
+from assembler.assembler import assemble, first_pass, main
+from assembler.build_cache import BuildCache
+from assembler.rom import load_rom
 
 
 @pytest.fixture(scope="function", name="data_tmp_dir")
@@ -101,3 +105,103 @@ def test_main(data_tmp_dir: Path, data_path: Path, file_name: str) -> None:
             expected_file.readlines(), result_file.readlines()
         ):
             assert result_line == expected_line
+
+
+@pytest.mark.parametrize("file_name", ("Mult", "Fill"))
+def test_assemble(data_path: Path, file_name: str) -> None:
+    """Test that assemble returns the words of the expected .hack file.
+
+    Args:
+        data_path(Path): Path to the data directory
+        file_name (str): Name of file to use for the tests
+    """
+    source = data_path.joinpath(f"{file_name}.asm").read_text()
+    expected = [
+        int(line, 2)
+        for line in data_path.joinpath(f"{file_name}.hack").read_text().splitlines()
+    ]
+    assert assemble(source) == expected
+
+
+@pytest.mark.parametrize("file_name", ("Mult", "Fill"))
+def test_main_bin(data_tmp_dir: Path, data_path: Path, file_name: str) -> None:
+    """Test that main creates the expected binary ROM image.
+
+    Args:
+        data_tmp_dir (Path): Path to temporary directory containing Mult.asm
+        data_path(Path): Path to the data directory
+        file_name (str): Name of file to use for the tests
+    """
+    file_path = data_tmp_dir.joinpath(f"{file_name}.asm")
+    main(file_path, output_format="bin", byteorder="big")
+    assert not file_path.with_suffix(".hack").exists()
+
+    expected = [
+        int(line, 2)
+        for line in data_path.joinpath(f"{file_name}.hack").read_text().splitlines()
+    ]
+    assert list(load_rom(file_path.with_suffix(".bin"), byteorder="big")) == expected
+
+
+def test_main_skip_no_symbol(data_tmp_dir: Path) -> None:
+    """Test that main can skip writing the NoSymbol.asm file.
+
+    Args:
+        data_tmp_dir (Path): Path to temporary directory containing Mult.asm
+    """
+    file_path = data_tmp_dir.joinpath("Mult.asm")
+    main(file_path, no_symbol=False)
+    assert file_path.with_suffix(".hack").is_file()
+    assert not data_tmp_dir.joinpath("MultNoSymbol.asm").exists()
+
+
+@pytest.mark.parametrize("file_name", ("Mult", "Fill"))
+def test_main_cache(data_tmp_dir: Path, data_path: Path, file_name: str) -> None:
+    """Test that main restores the outputs from the cache, and rebuilds changed files.
+
+    Args:
+        data_tmp_dir (Path): Path to temporary directory containing Mult.asm
+        data_path(Path): Path to the data directory
+        file_name (str): Name of file to use for the tests
+    """
+    cache = BuildCache(data_tmp_dir.joinpath("cache"))
+    file_path = data_tmp_dir.joinpath(f"{file_name}.asm")
+    hack_path = file_path.with_suffix(".hack")
+    no_symbol_path = data_tmp_dir.joinpath(f"{file_name}NoSymbol.asm")
+    main(file_path, cache=cache)
+    hack_path.unlink()
+    no_symbol_path.unlink()
+
+    main(file_path, cache=cache)
+    assert hack_path.read_text() == data_path.joinpath(f"{file_name}.hack").read_text()
+    assert no_symbol_path.is_file()
+
+    # A changed file is not restored from the cache
+    file_path.write_text(f"{file_path.read_text()}\n@0\n")
+    main(file_path, cache=cache)
+    assert hack_path.read_text().splitlines()[-1] == "0" * 16
+
+
+# The module is already imported by the tests, which runpy warns about
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_command_line(data_tmp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that running the module as a script writes the output selected by the options.
+
+    Args:
+        data_tmp_dir (Path): Path to temporary directory containing Mult.asm
+        monkeypatch (pytest.MonkeyPatch): Fixture setting the command line arguments
+    """
+    mult_path = data_tmp_dir.joinpath("Mult.asm")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["assembler.py", "--format", "bin", "--skip-no-symbol", str(mult_path)],
+    )
+    runpy.run_module("assembler.assembler", run_name="__main__")
+    assert sorted(path.name for path in data_tmp_dir.glob("Mult*")) == [
+        "Mult.asm",
+        "Mult.bin",
+    ]
+    assert list(load_rom(mult_path.with_suffix(".bin"))) == assemble(
+        mult_path.read_text()
+    )
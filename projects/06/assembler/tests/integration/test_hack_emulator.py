@@ -0,0 +1,44 @@
+"""Module integration testing the Hack emulator."""
+
+from pathlib import Path
+
+from assembler.assembler import main as assembler_main
+from hack_emulator.cpu import CPU
+from hack_emulator.hack_emulator import main
+from hack_emulator.script import Script
+
+
+def test_script_mult(tmp_path: Path, data_path: Path) -> None:
+    """Test that Mult.tst passes with the output of Mult.cmp.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        data_path (Path): Path to the data directory
+    """
+    for name in ("Mult.asm", "Mult.tst", "Mult.cmp"):
+        tmp_path.joinpath(name).write_text(data_path.joinpath(name).read_text())
+    script = Script(tmp_path.joinpath("Mult.tst"))
+    output_lines = script.run()
+    assert output_lines[0] == "|  RAM[0]  |  RAM[1]  |  RAM[2]  |"
+    assert output_lines[-1] == "|       6  |       7  |      42  |"
+    assert script.compare() is None
+    assert tmp_path.joinpath("Mult.out").read_text().splitlines() == output_lines
+    assert main(tmp_path.joinpath("Mult.tst")) == 0
+
+
+def test_run_binary_rom(tmp_path: Path, mult_path: Path) -> None:
+    """Test that the packed binary output of the assembler can be run.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        mult_path (Path): Path to Mult.asm
+    """
+    tmp_mult = tmp_path.joinpath(mult_path.name)
+    tmp_mult.write_text(mult_path.read_text())
+    assembler_main(tmp_mult, output_format="bin", no_symbol=False)
+    cpu = CPU.from_file(tmp_path.joinpath("Mult.bin"))
+    cpu.ram[0] = 6
+    cpu.ram[1] = 7
+    cpu.run(10_000)
+    assert cpu.halted
+    assert cpu.ram[2] == 42
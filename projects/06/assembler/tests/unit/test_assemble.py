@@ -1,7 +1,7 @@
 """Module unit testing the assembler."""
 
 
-from assembler.assemble import convert_to_15_bit_binary
+from assembler.assembler import convert_to_15_bit_binary
 
 
 def test_convert_to_15_bit_binary() -> None:
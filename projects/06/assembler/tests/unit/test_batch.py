@@ -0,0 +1,72 @@
+"""Module testing the BatchCPU class."""
+
+import random
+from array import array
+from pathlib import Path
+
+import pytest
+from assembler.assembler import assemble
+from hack_emulator.cpu import COMP_EXPRESSIONS, CPU
+
+np = pytest.importorskip("numpy")
+
+# NOTE: The import is placed after importorskip as the module requires numpy
+# pylint: disable-next=wrong-import-position,wrong-import-order
+from hack_emulator.batch import BatchCPU  # noqa: E402
+
+
+def test_from_program_mult(mult_path: Path) -> None:
+    """Test that Mult.asm halts with the correct product for different initial RAM.
+
+    Args:
+        mult_path (Path): Path to Mult.asm
+    """
+    cpu = BatchCPU.from_program(assemble(mult_path.read_text()), machines=100)
+    cpu.ram[:, 0] = np.arange(100) % 10
+    cpu.ram[:, 1] = np.arange(100) // 10
+    executed = cpu.run(10_000)
+    assert executed < 10_000
+    assert cpu.halted.all()
+    np.testing.assert_array_equal(cpu.ram[:, 2], cpu.ram[:, 0] * cpu.ram[:, 1])
+    # The machines with fewer iterations halt earlier
+    assert cpu.cycles[0] < cpu.cycles[-1]
+
+
+def test_random_programs() -> None:
+    """Test that the batch emulator agrees with the CPU on random programs."""
+    rng = random.Random(0)
+    comp_bits = sorted(COMP_EXPRESSIONS)
+    programs = []
+    for _ in range(20):
+        program = []
+        for _ in range(30):
+            if rng.random() < 0.4:
+                program.append(rng.randrange(30))
+            else:
+                program.append(
+                    (0b111 << 13)
+                    | (rng.randrange(2) << 12)
+                    | rng.choice(comp_bits)
+                    | rng.randrange(64)
+                )
+        programs.append(program)
+    initial_ram = [rng.randrange(-(2**15), 2**15) for _ in range(64)]
+
+    batch_cpu = BatchCPU(programs)
+    batch_cpu.ram[:, :64] = initial_ram
+    batch_cpu.run(200)
+
+    for index, program in enumerate(programs):
+        cpu = CPU(program)
+        cpu.ram[:64] = array("h", initial_ram)
+        cpu.run(200)
+        assert batch_cpu.ram[index].tolist() == cpu.ram.tolist()
+        assert (batch_cpu.a[index], batch_cpu.d[index]) == (cpu.a, cpu.d)
+        assert batch_cpu.pc[index] == cpu.pc
+
+
+def test_illegal_comp() -> None:
+    """Test that illegal comp bits raises an error."""
+    cpu = BatchCPU([[0b1110111110000000]])
+    with pytest.raises(ValueError):
+        cpu.step()
@@ -0,0 +1,104 @@
+"""Module unit testing the build cache."""
+
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+from assembler.build_cache import BuildCache, source_version
+
+
+def test_get_put(tmp_path: Path) -> None:
+    """Test that the outputs which are put are returned by get.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    cache = BuildCache(tmp_path)
+    key = cache.key("tool", b"source")
+    assert cache.get(key) is None
+    cache.put(key, {"a.out": b"a", "b.out": b""})
+    assert cache.get(key) == {"a.out": b"a", "b.out": b""}
+
+
+def test_key() -> None:
+    """Test that the key depends on every part and on how the parts are split."""
+    key = BuildCache.key("tool", source_version(), b"source")
+    assert key == BuildCache.key("tool", source_version(), b"source")
+    assert key != BuildCache.key("tool", source_version(), b"source2")
+    assert key != BuildCache.key("tool2", source_version(), b"source")
+    assert BuildCache.key("ab", "c") != BuildCache.key("a", "bc")
+
+
+def test_evict(tmp_path: Path) -> None:
+    """Test that the least recently used entries are evicted above the size cap.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    cache = BuildCache(tmp_path, max_size=30)
+    for index, key in enumerate("abc"):
+        cache.put(key, {"out": b"0123456789"})
+        # Make the order of the modification times deterministic
+        os.utime(tmp_path.joinpath(key), (index, index))
+    assert cache.size() == 30
+    # Using a marks it as recently used, so b is evicted instead
+    assert cache.get("a") is not None
+    cache.max_size = 20
+    cache.evict()
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size() == 20
+
+
+def test_put_running_size(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that put only scans the entries when the running total exceeds the size cap.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        monkeypatch (pytest.MonkeyPatch): Fixture counting the scans of the entries
+    """
+    cache = BuildCache(tmp_path, max_size=25)
+    scans: List[None] = []
+    entries = cache._entries  # pylint: disable=protected-access
+
+    def counting_entries() -> List[Tuple[float, int, Path]]:
+        """Count the scan and return the entries.
+
+        Returns:
+            List[Tuple[float, int, Path]]: The entries of the cache
+        """
+        scans.append(None)
+        return entries()
+
+    monkeypatch.setattr(cache, "_entries", counting_entries)
+    for index, key in enumerate("abc"):
+        cache.put(key, {"out": b"0123456789"})
+        os.utime(tmp_path.joinpath(key), (index, index))
+    # The total is computed by the first put, and the third put exceeds the size cap
+    assert len(scans) == 2
+    assert cache.get("a") is None
+    assert cache.size() == 20
+
+
+@pytest.mark.parametrize("hit", (False, True))
+def test_restore_or_build(tmp_path: Path, hit: bool) -> None:
+    """Test that the output files are either restored or built and stored.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        hit (bool): Whether the build is in the cache
+    """
+    cache = BuildCache(tmp_path.joinpath("cache"))
+    out_path = tmp_path.joinpath("a.out")
+    if hit:
+        cache.put("key", {out_path.name: b"cached"})
+
+    def build() -> None:
+        """Write the output file."""
+        out_path.write_bytes(b"built")
+
+    assert cache.restore_or_build("key", [out_path], build) == hit
+    assert out_path.read_bytes() == (b"cached" if hit else b"built")
+    assert cache.get("key") == {out_path.name: out_path.read_bytes()}
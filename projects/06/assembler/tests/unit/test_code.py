@@ -1,6 +1,6 @@
 """Module testing the Code class."""
 
-from assembler.code import Code
+from assembler.code import C_INSTRUCTION_TABLE, C_INSTRUCTION_TEXT_TABLE, Code
 
 
 def test_dest() -> None:
@@ -33,3 +33,24 @@ def test_jump() -> None:
     assert code.jump("JEQ") == "010"
     assert code.jump("JLT") == "100"
     assert code.jump("JMP") == "111"
+
+
+def test_c_instruction_table() -> None:
+    """Test that the C-instruction table agrees with the string methods."""
+    code = Code()
+    for dest in code.dest_dict:
+        for comp in code.comp_dict:
+            for jump in code.jump_dict:
+                expected = int(
+                    f"111{code.comp(comp)}{code.dest(dest)}{code.jump(jump)}", 2
+                )
+                assert C_INSTRUCTION_TABLE[(dest, comp, jump)] == expected
+
+
+def test_c_instruction_text_table() -> None:
+    """Test that the raw text of the C-instructions maps to the same words as the fields."""
+    assert C_INSTRUCTION_TEXT_TABLE["D=M"] == 0b1111110000010000
+    assert C_INSTRUCTION_TEXT_TABLE["0;JMP"] == 0b1110101010000111
+    assert C_INSTRUCTION_TEXT_TABLE["AM=M-1;JNE"] == 0b1111110010101101
+    assert C_INSTRUCTION_TEXT_TABLE["D"] == C_INSTRUCTION_TABLE[("", "D", "")]
+    assert len(C_INSTRUCTION_TEXT_TABLE) == len(C_INSTRUCTION_TABLE)
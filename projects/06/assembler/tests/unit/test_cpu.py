@@ -0,0 +1,83 @@
+"""Module testing the CPU class."""
+
+import pytest
+from assembler.assembler import assemble
+from hack_emulator.cpu import CPU, render_c_operation
+
+
+def test_a_and_d() -> None:
+    """Test that the A and D registers are loaded."""
+    cpu = CPU(assemble("@21\nD=A\n@7\n"))
+    assert cpu.run(3) == 3
+    assert cpu.a == 7
+    assert cpu.d == 21
+    assert cpu.pc == 3
+
+
+def test_m_uses_old_a() -> None:
+    """Test that M is addressed by the A register before the instruction."""
+    cpu = CPU(assemble("@5\nAM=M+1\n"))
+    cpu.ram[5] = 41
+    cpu.run(2)
+    assert cpu.ram[5] == 42
+    assert cpu.a == 42
+
+
+def test_wrap_around() -> None:
+    """Test that the arithmetic wraps around as 16 bit signed integers."""
+    cpu = CPU(assemble("@32767\nD=A+1\n@0\nM=D-1\nD=-D\n"))
+    cpu.run(5)
+    assert cpu.ram[0] == 32767
+    assert cpu.d == -32768
+
+
+@pytest.mark.parametrize(
+    "value, jump, taken",
+    (
+        (1, "JGT", True),
+        (0, "JGT", False),
+        (0, "JEQ", True),
+        (-1, "JLT", True),
+        (1, "JLE", False),
+    ),
+)
+def test_jump(value: int, jump: str, taken: bool) -> None:
+    """Test the conditional jumps.
+
+    Args:
+        value (int): The value of D
+        jump (str): The jump mnemonic
+        taken (bool): Whether the jump is expected to be taken
+    """
+    cpu = CPU(assemble(f"@10\nD;{jump}\n"))
+    cpu.d = value
+    cpu.run(2)
+    assert cpu.pc == (10 if taken else 2)
+
+
+def test_halt() -> None:
+    """Test that the execution stops at the terminating infinite loop."""
+    cpu = CPU(assemble("@3\nD=A\n(END)\n@END\n0;JMP\n"))
+    assert cpu.run() == 4
+    assert cpu.halted
+    assert cpu.pc == 2
+    assert cpu.d == 3
+
+
+def test_render_c_operation() -> None:
+    """Test that the generated source only touches the used registers."""
+    source = render_c_operation(0b1110110000010000)
+    assert "out = a" in source
+    assert "reg[1] = out" in source
+    assert "ram[" not in source
+    with pytest.raises(ValueError):
+        render_c_operation(0b1110111110000000)
+
+
+def test_run_past_program() -> None:
+    """Test that the empty ROM words after the program are executed as @0."""
+    cpu = CPU(assemble("@5\nD=A\n"))
+    assert cpu.run(4) == 4
+    assert cpu.a == 0
+    assert cpu.d == 5
+    assert cpu.pc == 4
@@ -3,7 +3,7 @@
 from pathlib import Path
 
 import pytest
-from assembler.parser import Parser
+from assembler.parser import Instruction, Parser, parse_instructions
 
 
 @pytest.fixture(scope="function", name="mult_parser")
@@ -132,3 +132,41 @@ def test_jump(mult_parser: Parser) -> None:
     assert mult_parser.jump() == "JEQ"
     mult_parser.current_instruction = "MD=M-1"
     assert mult_parser.jump() == ""
+
+
+def test_parse_instructions() -> None:
+    """Test the functionality of parse_instructions."""
+    lines = (
+        "// A comment\n",
+        "\n",
+        "   @R0  // Trailing comment\n",
+        "(LOOP)\n",
+        "  AM = M - 1 ; JNE\n",
+        "0;JMP",
+    )
+    assert parse_instructions(lines) == [
+        Instruction("A_INSTRUCTION", symbol="R0"),
+        Instruction("L_INSTRUCTION", symbol="LOOP"),
+        Instruction("C_INSTRUCTION", dest="AM", comp="M-1", jump="JNE"),
+        Instruction("C_INSTRUCTION", comp="0", jump="JMP"),
+    ]
+
+
+def test_iter(mult_parser: Parser, mult_path: Path) -> None:
+    """Test that iterating the Parser yields the same as the compatibility API.
+
+    Args:
+        mult_parser (Parser): Parser to Mult.asm
+        mult_path (Path): Path to Mult.asm
+    """
+    instructions = list(mult_parser)
+    assert instructions[0] == Instruction("A_INSTRUCTION", symbol="R0")
+    assert instructions[-1] == Instruction("C_INSTRUCTION", comp="0", jump="JMP")
+    assert mult_parser.current_instruction == "0;JMP"
+    assert not mult_parser.has_more_lines()
+
+    compatibility_parser = Parser(str(mult_path))
+    assert compatibility_parser.has_more_lines()
+    compatibility_parser.advance()
+    # Iteration continues from where the compatibility API left off
+    assert list(compatibility_parser) == instructions[1:]
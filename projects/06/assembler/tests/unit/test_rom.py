@@ -0,0 +1,72 @@
+"""Module unit testing the ROM image functions."""
+
+from pathlib import Path
+
+import pytest
+from assembler.rom import (
+    ROM_SIZE,
+    ByteOrder,
+    load_program,
+    load_rom,
+    read_hack,
+    write_hack,
+    write_rom,
+)
+
+WORDS = (0, 1, 0b1110101010000111, 0xFFFF, 21845)
+
+
+def test_write_read_hack(tmp_path: Path) -> None:
+    """Test that words written with write_hack are read back by read_hack.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    hack_path = tmp_path.joinpath("test.hack")
+    write_hack(hack_path, WORDS)
+    assert hack_path.read_text().splitlines()[2] == "1110101010000111"
+    assert tuple(read_hack(hack_path)) == WORDS
+
+
+@pytest.mark.parametrize("byteorder", ("little", "big"))
+def test_write_load_rom(tmp_path: Path, byteorder: ByteOrder) -> None:
+    """Test that words written with write_rom are loaded back by load_rom.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        byteorder (ByteOrder): The byte order of the image
+    """
+    rom_path = tmp_path.joinpath("test.bin")
+    write_rom(rom_path, WORDS, byteorder=byteorder)
+    assert rom_path.stat().st_size == 2 * len(WORDS)
+    assert rom_path.read_bytes()[4:6] == WORDS[2].to_bytes(2, byteorder)
+    assert tuple(load_rom(rom_path, byteorder=byteorder)) == WORDS
+    assert tuple(load_program(rom_path, byteorder=byteorder)) == WORDS
+
+
+def test_write_rom_pad(tmp_path: Path) -> None:
+    """Test that write_rom pads the image and rejects too large programs.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    rom_path = tmp_path.joinpath("test.bin")
+    write_rom(rom_path, WORDS, pad=True)
+    rom = load_rom(rom_path)
+    assert len(rom) == ROM_SIZE
+    assert tuple(rom[: len(WORDS)]) == WORDS
+    assert not any(rom[len(WORDS) :])
+
+    with pytest.raises(ValueError):
+        write_rom(rom_path, [0] * (ROM_SIZE + 1))
+
+
+def test_load_rom_empty(tmp_path: Path) -> None:
+    """Test that an empty image can be loaded.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    rom_path = tmp_path.joinpath("test.bin")
+    rom_path.write_bytes(b"")
+    assert len(load_rom(rom_path)) == 0
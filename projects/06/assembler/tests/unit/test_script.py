@@ -0,0 +1,31 @@
+"""Module testing the parsing and formatting of test scripts."""
+
+from hack_emulator.script import OutputColumn, parse_commands, parse_value, tokenize
+
+
+def test_parse_commands() -> None:
+    """Test that the commands and repeat blocks are parsed."""
+    text = "load Prog.asm,\n// Comment\nset RAM[0] -1;  // Comment\nrepeat 2 {\n  ticktock;\n}\n"
+    commands = parse_commands(tokenize(text))
+    assert [command.words for command in commands] == [
+        ["load", "Prog.asm"],
+        ["set", "RAM[0]", "-1"],
+        ["repeat", "2"],
+    ]
+    assert commands[2].body[0].words == ["ticktock"]
+
+
+def test_parse_value() -> None:
+    """Test the parsing of set values."""
+    assert parse_value("-7") == -7
+    assert parse_value("%B101") == 5
+    assert parse_value("%XFFFF") == -1
+
+
+def test_output_column() -> None:
+    """Test the header and value formatting of the output columns."""
+    column = OutputColumn("RAM[0]", "D", 1, 6, 1)
+    assert column.header() == " RAM[0] "
+    assert column.format(262) == "    262 "
+    assert OutputColumn("RAM[261]", "D", 2, 6, 2).header() == " RAM[261] "
+    assert OutputColumn("A").format(-1) == " 1111111111111111 "
@@ -36,3 +36,22 @@ def test_get_available_slot() -> None:
     symbol_table = SymbolTable()
     assert symbol_table.get_available_slot() == 16
     assert symbol_table.get_available_slot() == 17
+
+
+def test_reserve_variable_resolve() -> None:
+    """Test the functionality of SymbolTable.reserve_variable and SymbolTable.resolve."""
+    symbol_table = SymbolTable()
+    symbol_table.reserve_variable("foo")
+    symbol_table.reserve_variable("LOOP")
+    symbol_table.reserve_variable("R0")
+    symbol_table.reserve_variable("bar")
+    symbol_table.reserve_variable("foo")
+    # The label is defined after being used
+    symbol_table.add_entry("LOOP", 3)
+    assert not symbol_table.contains("foo")
+    symbol_table.resolve()
+    assert symbol_table.get_address("foo") == 16
+    assert symbol_table.get_address("bar") == 17
+    assert symbol_table.get_address("LOOP") == 3
+    assert symbol_table.get_address("R0") == 0
+    assert symbol_table.get_available_slot() == 18
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""Benchmark of the lines per second the Parser is able to process."""
+
+from pathlib import Path
+
+from benchmarks.parser_benchmark import parse_args, run
+from vm_translator.parser import Parser
+
+SYNTHETIC_LINES = (
+    "// A comment line\n",
+    "function Main.main 2\n",
+    "push constant 7  // Push a constant\n",
+    "pop local 1\n",
+    "\n",
+    "label LOOP\n",
+    "if-goto LOOP\n",
+    "add\n",
+)
+
+
+def compatibility_loop(path: Path) -> int:
+    """Read the file with the has_more_commands/advance API.
+
+    Args:
+        path (Path): The file to read
+
+    Returns:
+        int: Number of commands found
+    """
+    parser = Parser(str(path))
+    count = 0
+    while parser.has_more_commands():
+        parser.advance()
+        count += 1
+    return count
+
+
+def iterator_loop(path: Path) -> int:
+    """Read the file by iterating over the parser.
+
+    Args:
+        path (Path): The file to read
+
+    Returns:
+        int: Number of commands found
+    """
+    return sum(1 for _ in Parser(str(path)))
+
+
+def main(lines: int) -> None:
+    """Benchmark the parser.
+
+    Args:
+        lines (int): Number of lines in the synthetic input
+    """
+    run(
+        "Synthetic.vm",
+        SYNTHETIC_LINES,
+        (
+            ("has_more_commands/advance", compatibility_loop),
+            ("iterator (incl. parse_command)", iterator_loop),
+        ),
+        lines,
+        "commands",
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args("Benchmark the .vm parser")
+    main(args.lines)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""Benchmark of the VM commands per second the VM emulator is able to execute."""
+
+import argparse
+import time
+
+from vm_emulator.bytecode import compile_commands
+from vm_emulator.vm import SP, STACK_BASE, VM
+from vm_translator.parser import parse_command, strip_lines
+
+# The recursive fibonacci of FibonacciElement with a configurable argument
+FIBONACCI = """
+function Sys.init 0
+push constant {n}
+call Main.fibonacci 1
+label WHILE
+goto WHILE
+function Main.fibonacci 0
+push argument 0
+push constant 2
+lt
+if-goto IF_TRUE
+goto IF_FALSE
+label IF_TRUE
+push argument 0
+return
+label IF_FALSE
+push argument 0
+push constant 2
+sub
+call Main.fibonacci 1
+push argument 0
+push constant 1
+sub
+call Main.fibonacci 1
+add
+return
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse input arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the VM emulator")
+    parser.add_argument(
+        "-n",
+        "--fibonacci",
+        type=int,
+        default=20,
+        help="The fibonacci element to compute",
+    )
+    return parser.parse_args()
+
+
+def main(n: int) -> None:
+    """Benchmark the emulator by computing a fibonacci element recursively.
+
+    Args:
+        n (int): The fibonacci element to compute
+    """
+    commands = [
+        ("Main", parse_command(command))
+        for command in strip_lines(FIBONACCI.format(n=n).splitlines())
+    ]
+    vm = VM(compile_commands(commands))
+    vm.ram[SP] = STACK_BASE
+    start = time.perf_counter()
+    executed = vm.run()
+    elapsed = time.perf_counter() - start
+    print(f"fibonacci({n}) = {vm.ram[STACK_BASE]}")
+    print(
+        f"{executed} commands in {elapsed:.3f} s "
+        f"({executed / elapsed / 1e6:.2f} million commands per second)"
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(n=args.fibonacci)
@@ -0,0 +1,84 @@
+"""Module unit testing the compilation of VM commands into bytecode."""
+
+import pytest
+from vm_emulator.bytecode import (
+    CALL,
+    FUNCTION,
+    GOTO,
+    HALT,
+    IF_GOTO,
+    POP_RAM,
+    PUSH_CONSTANT,
+    PUSH_RAM,
+    Bytecode,
+    compile_commands,
+)
+from vm_translator.parser import parse_command
+
+
+def compile_lines(*lines: str, file_name: str = "Main") -> Bytecode:
+    """Compile lines of VM code from a single file.
+
+    Args:
+        *lines (str): The VM commands
+        file_name (str, optional): The file name stem. Defaults to "Main".
+
+    Returns:
+        Bytecode: The compiled program
+    """
+    return compile_commands([(file_name, parse_command(line)) for line in lines])
+
+
+def test_labels_are_resolved() -> None:
+    """Test that the labels are resolved to the next command, and not compiled."""
+    bytecode = compile_lines(
+        "function Main.f 0",
+        "label LOOP",
+        "push constant 1",
+        "if-goto LOOP",
+        "goto END",
+        "label END",
+        "goto END",
+    )
+    assert bytecode.opcodes == [FUNCTION, PUSH_CONSTANT, IF_GOTO, GOTO, HALT, HALT]
+    assert bytecode.arg1s[2] == 1
+    assert bytecode.arg1s[3] == 4
+
+
+def test_fixed_segments() -> None:
+    """Test that pointer, temp and static are compiled into RAM addresses."""
+    bytecode = compile_lines(
+        "push pointer 1", "pop temp 2", "push static 3", "pop static 0", "push static 3"
+    )
+    assert bytecode.opcodes[:5] == [PUSH_RAM, POP_RAM, PUSH_RAM, POP_RAM, PUSH_RAM]
+    assert bytecode.arg1s[:5] == [4, 7, 16, 17, 16]
+
+
+def test_call() -> None:
+    """Test that the calls are resolved to the address of the function."""
+    bytecode = compile_lines(
+        "function Sys.init 0", "call Main.f 2", "call Sys.halt 0", "function Main.f 1"
+    )
+    assert bytecode.functions == {"Sys.init": 0, "Main.f": 3}
+    assert (bytecode.opcodes[1], bytecode.arg1s[1], bytecode.arg2s[1]) == (CALL, 3, 2)
+    assert bytecode.opcodes[2] == HALT
+
+
+def test_unknown_label() -> None:
+    """Test that unknown labels raises an error."""
+    with pytest.raises(ValueError):
+        compile_lines("goto NOWHERE")
+
+
+def test_bootstrap() -> None:
+    """Test that the bootstrap code calls Sys.init and halts, if Sys.init exists."""
+    lines = ("function Main.f 0", "return", "function Sys.init 0", "return")
+    commands = [("Main", parse_command(line)) for line in lines]
+    bytecode = compile_commands(commands, bootstrap=True)
+    assert bytecode.opcodes[:2] == [CALL, HALT]
+    assert (bytecode.arg1s[0], bytecode.arg2s[0]) == (bytecode.functions["Sys.init"], 0)
+    assert bytecode.functions == {"Main.f": 2, "Sys.init": 4}
+    assert bytecode.start == 0
+    assert compile_commands(commands).start == bytecode.functions["Sys.init"] - 2
+    assert compile_commands(commands[:2], bootstrap=True).start == 0
+    assert compile_commands(commands[:2], bootstrap=True).opcodes[0] == FUNCTION
@@ -1,10 +1,11 @@
 """Module unit testing the CodeWriter."""
 
 from pathlib import Path
-from typing import Literal
+from typing import List, Literal, Sequence
 
 import pytest
-from vm_translator.code_writer import CodeWriter
+from vm_translator.code_writer import CodeWriter, strip_comments
+from vm_translator.parser import Command
 
 
 @pytest.fixture(scope="function", name="code_writer")
@@ -75,8 +76,8 @@ def test_write_push_pop(
     Args:
         code_writer (CodeWriter): The code writer object
         command (Literal["C_PUSH", "C_POP"]): The command to translate into assembly
-        segment (Literal["local", "argument", "this", "that", "constant", "static", "pointer", "temp"]):
-            Which virtual memory segment to push from/pop to
+        segment (Literal["local", "argument", "this", "that", "constant", "static",
+            "pointer", "temp"]): Which virtual memory segment to push from/pop to
     """
     index = 1
     code_writer.write_push_pop(command=command, segment=segment, index=index)
@@ -85,3 +86,224 @@ def test_write_push_pop(
     command_map = {"C_PUSH": "push", "C_POP": "pop"}
     with file_path.open("r") as file:
         assert file.readline() == f"// {command_map[command]} {segment} {index}\n"
+
+
+def write_optimized(tmp_path: Path, commands: Sequence[Command]) -> List[str]:
+    """Write commands with the peephole optimizer and return the instructions.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        commands (Sequence[Command]): The commands to write
+
+    Returns:
+        List[str]: The instructions and labels without comments
+    """
+    code_writer = CodeWriter(str(tmp_path.joinpath("test.asm")), optimize=True)
+    for command_type, arg1, arg2 in commands:
+        if command_type == "C_ARITHMETIC":
+            code_writer.write_arithmetic(command=arg1)  # type: ignore
+        elif command_type in ("C_PUSH", "C_POP"):
+            code_writer.write_push_pop(
+                command=command_type, segment=arg1, index=arg2  # type: ignore
+            )
+        elif command_type == "C_IF":
+            code_writer.write_if(label=arg1)
+        elif command_type == "C_LABEL":
+            code_writer.write_label(label=arg1)
+    code_writer.close()
+    lines = code_writer.out_path.read_text().splitlines()
+    return [
+        line.split("//")[0].strip() for line in lines if line.split("//")[0].strip()
+    ]
+
+
+@pytest.mark.parametrize(
+    "commands, expected",
+    (
+        (
+            (Command("C_PUSH", "constant", 7), Command("C_POP", "local", 2)),
+            [
+                "@2",
+                "D=A",
+                "@LCL",
+                "D=D+M",
+                "@13",
+                "M=D",
+                "@7",
+                "D=A",
+                "@13",
+                "A=M",
+                "M=D",
+            ],
+        ),
+        (
+            (Command("C_PUSH", "argument", 1), Command("C_POP", "temp", 3)),
+            ["@ARG", "A=M+1", "D=M", "@8", "M=D"],
+        ),
+        (
+            (Command("C_PUSH", "local", 0), Command("C_ARITHMETIC", "add")),
+            ["@LCL", "A=M", "D=M", "@SP", "A=M-1", "M=M+D"],
+        ),
+        (
+            (Command("C_PUSH", "constant", 1), Command("C_ARITHMETIC", "sub")),
+            ["@SP", "A=M-1", "M=M-1"],
+        ),
+        (
+            (
+                Command("C_ARITHMETIC", "lt"),
+                Command("C_ARITHMETIC", "not"),
+                Command("C_IF", "LOOP"),
+            ),
+            ["@SP", "AM=M-1", "D=M", "@SP", "AM=M-1", "D=M-D", "@LOOP", "D;JGE"],
+        ),
+        (
+            (
+                Command("C_PUSH", "static", 3),
+                Command("C_ARITHMETIC", "eq"),
+                Command("C_IF", "END"),
+            ),
+            ["@test.3", "D=M", "@SP", "AM=M-1", "D=M-D", "@END", "D;JEQ"],
+        ),
+    ),
+)
+def test_optimize(
+    tmp_path: Path, commands: Sequence[Command], expected: List[str]
+) -> None:
+    """Test that the peephole optimizer fuses the patterns.
+
+    Note:
+    The fused code is tested with the test files of the project
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        commands (Sequence[Command]): The commands to write
+        expected (List[str]): The expected instructions
+    """
+    assert write_optimized(tmp_path, commands) == expected
+
+
+def test_optimize_flushes_at_label(tmp_path: Path) -> None:
+    """Test that commands are not fused across labels.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    instructions = write_optimized(
+        tmp_path,
+        (
+            Command("C_PUSH", "constant", 1),
+            Command("C_LABEL", "LOOP"),
+            Command("C_ARITHMETIC", "add"),
+        ),
+    )
+    assert instructions[:8] == [
+        "@1",
+        "D=A",
+        "@SP",
+        "A=M",
+        "M=D",
+        "@SP",
+        "M=M+1",
+        "(LOOP)",
+    ]
+    assert instructions[8:] == ["@SP", "AM=M-1", "D=M", "@SP", "A=M-1", "M=M+D"]
+
+
+@pytest.mark.parametrize("optimize", (False, True))
+def test_labels_are_local(tmp_path: Path, optimize: bool) -> None:
+    """Test that the same label in two functions is written as two different labels.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        optimize (bool): Whether or not to fuse sequences of commands
+    """
+    path = tmp_path.joinpath("test.asm")
+    code_writer = CodeWriter(str(path), optimize=optimize, compact=True)
+    for function_name in ("Main.f", "Main.g"):
+        code_writer.write_command(Command("C_FUNCTION", function_name, 0))
+        code_writer.write_command(Command("C_LABEL", "LOOP"))
+        code_writer.write_command(Command("C_PUSH", "constant", 0))
+        code_writer.write_command(Command("C_IF", "LOOP"))
+        code_writer.write_command(Command("C_GOTO", "LOOP"))
+    code_writer.close()
+    lines = path.read_text().splitlines()
+    for function_name in ("Main.f", "Main.g"):
+        assert lines.count(f"({function_name}$LOOP)") == 1
+        assert lines.count(f"@{function_name}$LOOP") == 2
+    assert "(LOOP)" not in lines
+
+
+def test_trampolines(tmp_path: Path) -> None:
+    """Test that calls and returns jump to the shared routines which are written once.
+
+    Note:
+    The routines are tested with the test files of the project
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    path = tmp_path.joinpath("test.asm")
+    code_writer = CodeWriter(str(path), trampolines=True)
+    code_writer.write_function(function_name="Main.main", num_vars=0)
+    code_writer.write_call(function_name="Main.f", num_args=2)
+    code_writer.write_call(function_name="Main.f", num_args=2)
+    code_writer.write_return()
+    code_writer.close()
+    lines = [line.split("//")[0].strip() for line in path.read_text().splitlines()]
+    assert lines.count("@$CALL") == 2
+    assert lines.count("@$RETURN") == 1
+    assert lines.count("($CALL)") == 1
+    assert lines.count("($RETURN)") == 1
+    assert lines.index("(Main.main$return.2)") < lines.index("($CALL)")
+
+
+def test_trampolines_unused(code_writer: CodeWriter) -> None:
+    """Test that the shared routines are only written when enabled.
+
+    Args:
+        code_writer (CodeWriter): The code writer object
+    """
+    code_writer.write_call(function_name="Main.f", num_args=0)
+    code_writer.close()
+    assert "($CALL)" not in code_writer.out_path.read_text()
+
+
+def test_strip_comments() -> None:
+    """Test that the comments, the indentation and the blank lines are stripped."""
+    code = (
+        "// push constant 7\n   @7  // Set A to 7\n   D=A\n\n(LOOP)\n     // comment\n"
+    )
+    assert strip_comments(code) == "@7\nD=A\n(LOOP)\n"
+
+
+@pytest.mark.parametrize("optimize", (False, True))
+def test_compact(tmp_path: Path, optimize: bool) -> None:
+    """Test that the compact code equals the commented code without comments.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        optimize (bool): Whether or not to fuse sequences of commands
+    """
+    code = []
+    for compact in (False, True):
+        path = tmp_path.joinpath(str(compact), "test.asm")
+        path.parent.mkdir()
+        code_writer = CodeWriter(
+            str(path), bootstrap=True, optimize=optimize, compact=compact
+        )
+        code_writer.set_file_name("Main.vm")
+        code_writer.write_function(function_name="Main.main", num_vars=2)
+        for _ in range(2):
+            # The repeated commands are written from the cache
+            code_writer.write_push_pop(command="C_PUSH", segment="static", index=1)
+            code_writer.write_push_pop(command="C_PUSH", segment="local", index=1)
+            code_writer.write_arithmetic(command="add")
+            code_writer.write_arithmetic(command="eq")
+            code_writer.write_if(label="END")
+            code_writer.write_push_pop(command="C_POP", segment="that", index=3)
+        code_writer.write_call(function_name="Main.f", num_args=1)
+        code_writer.write_return()
+        code_writer.close()
+        code.append(path.read_text())
+    assert "//" not in code[1]
+    assert code[1] == strip_comments(code[0])
@@ -3,7 +3,7 @@
 from pathlib import Path
 
 import pytest
-from vm_translator.parser import Parser
+from vm_translator.parser import Command, Parser, parse_command
 
 
 @pytest.fixture(scope="function", name="full_test_parser")
@@ -92,3 +92,34 @@ def test_arg2(full_test_parser: Parser) -> None:
     for _ in range(9):
         full_test_parser.advance()
     assert full_test_parser.arg2() == 2
+
+
+def test_iter(full_test_parser: Parser, full_test_path: Path) -> None:
+    """Test that iterating the Parser yields the same as the compatibility API.
+
+    Args:
+        full_test_parser (Parser): Parser to FullTest.vm
+        full_test_path (Path): Path to FullTest.vm
+    """
+    commands = list(full_test_parser)
+    assert commands[0] == Command("C_PUSH", "constant", 0)
+    assert commands[9] == Command("C_POP", "local", 2)
+    assert commands[11] == Command("C_ARITHMETIC", "add")
+    assert commands[-1] == Command("C_ARITHMETIC", "not")
+    assert full_test_parser.current_instruction == "not"
+    assert not full_test_parser.has_more_commands()
+
+    compatibility_parser = Parser(str(full_test_path))
+    assert compatibility_parser.has_more_commands()
+    compatibility_parser.advance()
+    # Iteration continues from where the compatibility API left off
+    assert list(compatibility_parser) == commands[1:]
+
+
+def test_parse_command() -> None:
+    """Test the functionality of parse_command."""
+    assert parse_command("return") == Command("C_RETURN")
+    assert parse_command("if-goto LOOP") == Command("C_IF", "LOOP")
+    assert parse_command("call Main.fibonacci 1") == Command(
+        "C_CALL", "Main.fibonacci", 1
+    )
@@ -0,0 +1,105 @@
+"""Module unit testing the VM and the VME test scripts."""
+
+from pathlib import Path
+
+import pytest
+from vm_emulator.bytecode import compile_commands
+from vm_emulator.script import Script
+from vm_emulator.vm import SP, STACK_BASE, VM
+from vm_translator.parser import parse_command
+
+
+def run_lines(*lines: str) -> VM:
+    """Run lines of VM code until they halt.
+
+    Args:
+        *lines (str): The VM commands
+
+    Returns:
+        VM: The halted VM
+    """
+    vm = VM(compile_commands([("Main", parse_command(line)) for line in lines]))
+    vm.ram[SP] = STACK_BASE
+    vm.run()
+    return vm
+
+
+def test_arithmetic() -> None:
+    """Test the arithmetic commands, including the 16 bit wrap around."""
+    vm = run_lines(
+        "push constant 32767",
+        "push constant 1",
+        "add",
+        "push constant 7",
+        "push constant 8",
+        "lt",
+        "push constant 0",
+        "not",
+        "neg",
+    )
+    assert vm.halted
+    assert vm.ram[SP] == STACK_BASE + 3
+    assert vm.ram[STACK_BASE : STACK_BASE + 3] == [-32768, -1, 1]
+
+
+def test_call_and_return() -> None:
+    """Test that call and return restores the frame and leaves the return value."""
+    vm = run_lines(
+        "function Sys.init 0",
+        "push constant 5",
+        "push constant 6",
+        "call Main.add 2",
+        "label END",
+        "goto END",
+        "function Main.add 1",
+        "push argument 0",
+        "push argument 1",
+        "add",
+        "pop local 0",
+        "push local 0",
+        "return",
+    )
+    assert vm.halted
+    assert vm.ram[SP] == STACK_BASE + 1
+    assert vm.ram[STACK_BASE] == 11
+
+
+def test_bootstrap() -> None:
+    """Test that Sys.init returns to the bootstrap code, which halts."""
+    lines = ("function Sys.init 0", "push constant 7", "return")
+    vm = VM(
+        compile_commands(
+            [("Sys", parse_command(line)) for line in lines], bootstrap=True
+        )
+    )
+    vm.ram[SP] = STACK_BASE
+    vm.run()
+    assert vm.halted
+    # The return value replaces the (zero) arguments of Sys.init
+    assert vm.ram[SP] == STACK_BASE + 1
+    assert vm.ram[STACK_BASE] == 7
+
+
+@pytest.mark.parametrize(
+    "test_name, script_name",
+    (
+        ("FibonacciElement", "FibonacciElementVME.tst"),
+        ("BasicLoop", "BasicLoopVME.tst"),
+    ),
+)
+def test_script(
+    tmp_path: Path, data_path: Path, test_name: str, script_name: str
+) -> None:
+    """Test that the VME test scripts pass.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        data_path (Path): Path to the data directory
+        test_name (str): Name of the test directory
+        script_name (str): Name of the test script
+    """
+    for path in data_path.joinpath(test_name).iterdir():
+        tmp_path.joinpath(path.name).write_text(path.read_text())
+    script = Script(tmp_path.joinpath(script_name))
+    script.run()
+    assert script.compare() is None
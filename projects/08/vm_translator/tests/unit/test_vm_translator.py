@@ -0,0 +1,62 @@
+"""Module unit testing the vm_translator functions."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from vm_translator.build_cache import BuildCache
+from vm_translator.vm_translator import main
+
+
+@pytest.mark.parametrize("optimize", (False, True))
+@pytest.mark.parametrize("debug", (False, True))
+def test_main_jobs(
+    data_path: Path, tmp_path: Path, optimize: bool, debug: bool
+) -> None:
+    """Test that the parallel translation is identical to the serial translation.
+
+    Args:
+        data_path (Path): Path to the data directory
+        tmp_path (Path): Path to temporary directory
+        optimize (bool): Whether or not to fuse common sequences of VM commands
+        debug (bool): Whether or not to write the comments
+    """
+    in_path = tmp_path.joinpath("FibonacciElement")
+    shutil.copytree(data_path.joinpath("FibonacciElement"), in_path)
+    out_path = in_path.joinpath("FibonacciElement.asm")
+    code = []
+    for jobs in (1, 2):
+        main(in_path, optimize=optimize, trampolines=True, debug=debug, jobs=jobs)
+        code.append(out_path.read_bytes())
+    assert code[0] == code[1]
+    assert b"($CALL)" in code[0]
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_main_cache(data_path: Path, tmp_path: Path, jobs: int) -> None:
+    """Test that the translation with the build cache is identical to the translation without.
+
+    Args:
+        data_path (Path): Path to the data directory
+        tmp_path (Path): Path to temporary directory
+        jobs (int): Number of processes translating the files in parallel
+    """
+    in_path = tmp_path.joinpath("FibonacciElement")
+    shutil.copytree(data_path.joinpath("FibonacciElement"), in_path)
+    out_path = in_path.joinpath("FibonacciElement.asm")
+    main(in_path, optimize=True, trampolines=True)
+    expected = out_path.read_bytes()
+
+    cache = BuildCache(tmp_path.joinpath("cache"))
+    for _ in range(2):
+        main(in_path, optimize=True, trampolines=True, jobs=jobs, cache=cache)
+        assert out_path.read_bytes() == expected
+        # One entry per translated file
+        assert len(list(cache.directory.iterdir())) == 2
+
+    # Only the changed file is translated again
+    main_path = in_path.joinpath("Main.vm")
+    main_path.write_text(f"{main_path.read_text()}// Changed\n")
+    main(in_path, optimize=True, trampolines=True, jobs=jobs, cache=cache)
+    assert out_path.read_bytes() == expected
+    assert len(list(cache.directory.iterdir())) == 3
@@ -0,0 +1 @@
+"""Package containing the VM emulator package."""
@@ -0,0 +1,306 @@
+"""Module containing the compilation of .vm files into bytecode.
+
+Every VM command is compiled into one opcode with up to two integer arguments, which are stored
+in three parallel lists.
+The labels, the function calls and the static variables are resolved at compile time, and the
+segments with fixed addresses (pointer, temp and static) are compiled into direct RAM accesses.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from vm_translator.parser import Command, Parser
+
+# The opcodes
+# NOTE: The numbering is used by the interpreter to order the checks by frequency
+PUSH_CONSTANT = 0
+PUSH_LOCAL = 1
+PUSH_ARGUMENT = 2
+PUSH_THIS = 3
+PUSH_THAT = 4
+PUSH_RAM = 5
+POP_LOCAL = 6
+POP_ARGUMENT = 7
+POP_THIS = 8
+POP_THAT = 9
+POP_RAM = 10
+ADD = 11
+SUB = 12
+NEG = 13
+EQ = 14
+GT = 15
+LT = 16
+AND = 17
+OR = 18
+NOT = 19
+GOTO = 20
+IF_GOTO = 21
+CALL = 22
+FUNCTION = 23
+RETURN = 24
+HALT = 25
+
+ARITHMETIC_OPCODES = {
+    "add": ADD,
+    "sub": SUB,
+    "neg": NEG,
+    "eq": EQ,
+    "gt": GT,
+    "lt": LT,
+    "and": AND,
+    "or": OR,
+    "not": NOT,
+}
+# The segments whose base address is stored in a register
+PUSH_OPCODES = {
+    "local": PUSH_LOCAL,
+    "argument": PUSH_ARGUMENT,
+    "this": PUSH_THIS,
+    "that": PUSH_THAT,
+}
+POP_OPCODES = {
+    "local": POP_LOCAL,
+    "argument": POP_ARGUMENT,
+    "this": POP_THIS,
+    "that": POP_THAT,
+}
+# The base addresses of the segments with fixed addresses
+FIXED_SEGMENTS = {"pointer": 3, "temp": 5}
+STATIC_BASE = 16
+
+# Functions which halt the execution when called
+HALT_FUNCTIONS = ("Sys.halt",)
+# The bootstrap code calls Sys.init with a call frame, and halts if Sys.init returns
+BOOTSTRAP_COMMANDS = (
+    Command("C_CALL", "Sys.init", 0),
+    Command("C_LABEL", "BOOTSTRAP_END"),
+    Command("C_GOTO", "BOOTSTRAP_END"),
+)
+
+
+class Bytecode(NamedTuple):
+    """A compiled VM program."""
+
+    opcodes: List[int]
+    arg1s: List[int]
+    arg2s: List[int]
+    # Map from the function names to their address in the bytecode
+    functions: Dict[str, int]
+    # The file name and the command each address was compiled from
+    sources: List[Tuple[str, Command]]
+    # The address where the execution starts
+    start: int = 0
+
+
+def read_commands(paths: Iterable[Path]) -> List[Tuple[str, Command]]:
+    """Read the commands of .vm files.
+
+    Args:
+        paths (Iterable[Path]): The .vm files
+
+    Returns:
+        List[Tuple[str, Command]]: The file name stem and the command
+    """
+    commands: List[Tuple[str, Command]] = []
+    for path in paths:
+        commands.extend((path.stem, command) for command in Parser(str(path)))
+    return commands
+
+
+def vm_files(path: Path) -> List[Path]:
+    """Return the .vm files of a file or a directory.
+
+    Args:
+        path (Path): The .vm file or the directory containing .vm files
+
+    Returns:
+        List[Path]: The sorted .vm files
+    """
+    if path.is_dir():
+        return sorted(path.glob("*.vm"))
+    return [path]
+
+
+def compile_commands(  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    commands: Sequence[Tuple[str, Command]], bootstrap: bool = False
+) -> Bytecode:
+    """Compile VM commands into bytecode.
+
+    The execution starts in Sys.init if it exists, otherwise at the first command.
+    Like the bootstrap code of the VM translator, the bootstrap code calls Sys.init with a call
+    frame, so that Sys.init can return.
+    Without the bootstrap code the execution jumps straight into Sys.init, like the VM emulator
+    of the course does for the VME test scripts.
+
+    Args:
+        commands (Sequence[Tuple[str, Command]]): The file name stem and the command
+        bootstrap (bool, optional): Whether to write the bootstrap code if Sys.init exists.
+            Defaults to False.
+
+    Raises:
+        ValueError: If a label, a function or a segment is unknown
+
+    Returns:
+        Bytecode: The compiled program
+    """
+    functions: Dict[str, int] = {}
+    labels: Dict[str, int] = {}
+    statics: Dict[Tuple[str, int], int] = {}
+
+    bootstrap = bootstrap and ("C_FUNCTION", "Sys.init") in (
+        command[:2] for _, command in commands
+    )
+    if bootstrap:
+        commands = [("", command) for command in BOOTSTRAP_COMMANDS] + list(commands)
+
+    # First pass: Resolve the addresses of the functions and labels
+    # NOTE: Like in the VM emulator of the course, labels are not commands of their own, so they
+    #       are resolved to the address of the next command
+    function_name = ""
+    address = 0
+    for _, (command_type, arg1, _) in commands:
+        if command_type == "C_LABEL":
+            labels[f"{function_name}${arg1}"] = address
+            continue
+        if command_type == "C_FUNCTION":
+            function_name = arg1
+            functions[arg1] = address
+        address += 1
+
+    # Second pass: Emit the bytecode
+    opcodes: List[int] = []
+    arg1s: List[int] = []
+    arg2s: List[int] = []
+    sources: List[Tuple[str, Command]] = []
+    function_name = ""
+    for file_name, command in commands:
+        command_type, arg1, arg2 = command
+        if command_type == "C_LABEL":
+            continue
+        address = len(opcodes)
+        # C_RETURN is the only command without arguments
+        opcode, first, second = RETURN, 0, 0
+        if command_type in ("C_PUSH", "C_POP"):
+            opcode, first = _compile_push_pop(
+                command_type, arg1, arg2, file_name, statics
+            )
+        elif command_type == "C_ARITHMETIC":
+            opcode = ARITHMETIC_OPCODES[arg1]
+        elif command_type in ("C_GOTO", "C_IF"):
+            first = _resolve(labels, f"{function_name}${arg1}", "label")
+            opcode = GOTO if command_type == "C_GOTO" else IF_GOTO
+            if opcode == GOTO and first == address:
+                # The infinite loop (label WHILE, goto WHILE) ending a program
+                opcode = HALT
+        elif command_type == "C_FUNCTION":
+            function_name = arg1
+            opcode, first = FUNCTION, _argument(arg2)
+        elif command_type == "C_CALL":
+            if arg1 in HALT_FUNCTIONS:
+                opcode, first = HALT, address
+            else:
+                opcode = CALL
+                first = _resolve(functions, arg1, "function")
+                second = _argument(arg2)
+        opcodes.append(opcode)
+        arg1s.append(first)
+        arg2s.append(second)
+        sources.append((file_name, command))
+
+    # The execution halts when it runs past the last command
+    opcodes.append(HALT)
+    arg1s.append(len(arg1s))
+    arg2s.append(0)
+    sources.append(("", Command("C_GOTO")))
+
+    start = 0 if bootstrap else functions.get("Sys.init", 0)
+    return Bytecode(opcodes, arg1s, arg2s, functions, sources, start)
+
+
+def compile_path(path: Path, bootstrap: bool = False) -> Bytecode:
+    """Compile a .vm file or all the .vm files of a directory.
+
+    Args:
+        path (Path): The .vm file or the directory containing .vm files
+        bootstrap (bool, optional): Whether to write the bootstrap code if Sys.init exists.
+            Defaults to False.
+
+    Returns:
+        Bytecode: The compiled program
+    """
+    return compile_commands(read_commands(vm_files(path)), bootstrap=bootstrap)
+
+
+def _compile_push_pop(
+    command_type: str,
+    segment: str,
+    index: Optional[int],
+    file_name: str,
+    statics: Dict[Tuple[str, int], int],
+) -> Tuple[int, int]:
+    """Compile a push or pop command.
+
+    Args:
+        command_type (str): C_PUSH or C_POP
+        segment (str): The memory segment
+        index (Optional[int]): The index in the segment
+        file_name (str): The file name stem which scopes the static segment
+        statics (Dict[Tuple[str, int], int]): The allocated static variables
+
+    Raises:
+        ValueError: If the segment is unknown
+
+    Returns:
+        Tuple[int, int]: The opcode and its argument
+    """
+    index = _argument(index)
+    push = command_type == "C_PUSH"
+    if segment == "constant" and push:
+        return PUSH_CONSTANT, index
+    if segment in PUSH_OPCODES:
+        return (PUSH_OPCODES if push else POP_OPCODES)[segment], index
+    if segment in FIXED_SEGMENTS:
+        address = FIXED_SEGMENTS[segment] + index
+    elif segment == "static":
+        # NOTE: The static variables are allocated in the order of their first appearance, like
+        #       the assembler does for the Xxx.i symbols
+        address = statics.setdefault((file_name, index), STATIC_BASE + len(statics))
+    else:
+        raise ValueError(f"Cannot {command_type} the {segment} segment")
+    return (PUSH_RAM if push else POP_RAM), address
+
+
+def _resolve(addresses: Dict[str, int], name: str, kind: str) -> int:
+    """Return the address of a label or a function.
+
+    Args:
+        addresses (Dict[str, int]): The resolved addresses
+        name (str): The name to look up
+        kind (str): What is being looked up, used in the error message
+
+    Raises:
+        ValueError: If the name is unknown
+
+    Returns:
+        int: The address
+    """
+    if name not in addresses:
+        raise ValueError(f"Unknown {kind} {name}")
+    return addresses[name]
+
+
+def _argument(arg2: Optional[int]) -> int:
+    """Return the numeric argument of a command.
+
+    Args:
+        arg2 (Optional[int]): The numeric argument as parsed
+
+    Raises:
+        ValueError: If the argument is missing
+
+    Returns:
+        int: The argument
+    """
+    if arg2 is None:
+        raise ValueError("Missing numeric argument")
+    return arg2
@@ -0,0 +1,201 @@
+"""Module containing the VM class interpreting the bytecode."""
+
+from itertools import count
+from pathlib import Path
+from typing import List, Optional, Union
+
+from vm_emulator.bytecode import (
+    ADD,
+    AND,
+    CALL,
+    EQ,
+    FUNCTION,
+    GOTO,
+    GT,
+    HALT,
+    IF_GOTO,
+    LT,
+    NEG,
+    NOT,
+    POP_ARGUMENT,
+    POP_LOCAL,
+    POP_RAM,
+    POP_THAT,
+    POP_THIS,
+    PUSH_ARGUMENT,
+    PUSH_CONSTANT,
+    PUSH_LOCAL,
+    PUSH_RAM,
+    PUSH_THAT,
+    PUSH_THIS,
+    RETURN,
+    SUB,
+    Bytecode,
+    compile_path,
+)
+
+# Number of words in the RAM
+RAM_SIZE = 2**15
+# The addresses of the registers
+SP = 0
+LCL = 1
+ARG = 2
+THIS = 3
+THAT = 4
+# The initial value of the stack pointer
+STACK_BASE = 256
+
+
+class VM:
+    """Class interpreting compiled VM programs.
+
+    The memory model of the Hack VM is kept, so the stack and the call frames are stored in the
+    RAM, and the state of a program can be compared with the state of its translation.
+    The RAM is a preallocated list of 16 bit signed integers.
+
+    NOTE: SP, LCL and ARG are cached in local variables while running, and are only written back
+          to the RAM when run returns
+    """
+
+    def __init__(self, bytecode: Bytecode) -> None:
+        """Load the bytecode and reset the VM.
+
+        Args:
+            bytecode (Bytecode): The compiled program
+        """
+        self.bytecode = bytecode
+        self.ram: List[int] = [0] * RAM_SIZE
+        self.ip = 0
+        self.steps = 0
+        self.halted = False
+        self.reset()
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path], bootstrap: bool = False) -> "VM":
+        """Create a VM running a .vm file or all the .vm files of a directory.
+
+        Args:
+            path (Union[str, Path]): The .vm file or the directory containing .vm files
+            bootstrap (bool, optional): Whether to call Sys.init from bootstrap code if it
+                exists. Defaults to False.
+
+        Returns:
+            VM: The VM with the program loaded
+        """
+        return cls(compile_path(Path(path), bootstrap=bootstrap))
+
+    def reset(self) -> None:
+        """Reset the instruction pointer to the start of the program."""
+        self.ip = self.bytecode.start
+        self.steps = 0
+        self.halted = False
+
+    def run(self, steps: Optional[int] = None) -> int:
+        """Execute VM commands.
+
+        The execution stops early if the program halts.
+
+        Args:
+            steps (Optional[int], optional): The number of commands to execute.
+                If None, the program is executed until it halts. Defaults to None.
+
+        Returns:
+            int: The number of executed commands
+        """
+        # pylint: disable=too-many-branches,too-many-statements,too-many-locals
+        opcodes, arg1s, arg2s = self.bytecode[:3]
+        ram = self.ram
+        ip = self.ip
+        sp, lcl, arg = ram[SP], ram[LCL], ram[ARG]
+        executed = 0
+        for executed in count(1) if steps is None else range(1, steps + 1):
+            opcode = opcodes[ip]
+            if opcode <= PUSH_RAM:
+                if opcode == PUSH_CONSTANT:
+                    ram[sp] = arg1s[ip]
+                elif opcode == PUSH_LOCAL:
+                    ram[sp] = ram[lcl + arg1s[ip]]
+                elif opcode == PUSH_ARGUMENT:
+                    ram[sp] = ram[arg + arg1s[ip]]
+                elif opcode == PUSH_THIS:
+                    ram[sp] = ram[ram[THIS] + arg1s[ip]]
+                elif opcode == PUSH_THAT:
+                    ram[sp] = ram[ram[THAT] + arg1s[ip]]
+                else:
+                    ram[sp] = ram[arg1s[ip]]
+                sp += 1
+                ip += 1
+            elif opcode <= POP_RAM:
+                sp -= 1
+                if opcode == POP_LOCAL:
+                    ram[lcl + arg1s[ip]] = ram[sp]
+                elif opcode == POP_ARGUMENT:
+                    ram[arg + arg1s[ip]] = ram[sp]
+                elif opcode == POP_THIS:
+                    ram[ram[THIS] + arg1s[ip]] = ram[sp]
+                elif opcode == POP_THAT:
+                    ram[ram[THAT] + arg1s[ip]] = ram[sp]
+                else:
+                    ram[arg1s[ip]] = ram[sp]
+                ip += 1
+            elif opcode <= NOT:
+                if opcode == NEG:
+                    ram[sp - 1] = ((-ram[sp - 1] + 0x8000) & 0xFFFF) - 0x8000
+                elif opcode == NOT:
+                    ram[sp - 1] = ~ram[sp - 1]
+                else:
+                    sp -= 1
+                    x = ram[sp - 1]
+                    y = ram[sp]
+                    if opcode == ADD:
+                        ram[sp - 1] = ((x + y + 0x8000) & 0xFFFF) - 0x8000
+                    elif opcode == SUB:
+                        ram[sp - 1] = ((x - y + 0x8000) & 0xFFFF) - 0x8000
+                    elif opcode == EQ:
+                        ram[sp - 1] = -1 if x == y else 0
+                    elif opcode == GT:
+                        ram[sp - 1] = -1 if x > y else 0
+                    elif opcode == LT:
+                        ram[sp - 1] = -1 if x < y else 0
+                    elif opcode == AND:
+                        ram[sp - 1] = x & y
+                    else:
+                        ram[sp - 1] = x | y
+                ip += 1
+            elif opcode == GOTO:
+                ip = arg1s[ip]
+            elif opcode == IF_GOTO:
+                sp -= 1
+                ip = arg1s[ip] if ram[sp] else ip + 1
+            elif opcode == CALL:
+                ram[sp] = ip + 1
+                ram[sp + 1] = lcl
+                ram[sp + 2] = arg
+                ram[sp + 3] = ram[THIS]
+                ram[sp + 4] = ram[THAT]
+                sp += 5
+                arg = sp - 5 - arg2s[ip]
+                lcl = sp
+                ip = arg1s[ip]
+            elif opcode == FUNCTION:
+                n_locals = arg1s[ip]
+                ram[sp : sp + n_locals] = [0] * n_locals
+                sp += n_locals
+                ip += 1
+            elif opcode == RETURN:
+                frame = lcl
+                ip = ram[frame - 5]
+                ram[arg] = ram[sp - 1]
+                sp = arg + 1
+                ram[THAT] = ram[frame - 1]
+                ram[THIS] = ram[frame - 2]
+                arg = ram[frame - 3]
+                lcl = ram[frame - 4]
+            elif opcode == HALT:
+                ip = arg1s[ip]
+                self.halted = True
+                break
+        ram[SP], ram[LCL], ram[ARG] = sp, lcl, arg
+        self.ip = ip
+        self.steps += executed
+        return executed
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+"""File containing functions for running .vm programs and VME .tst test scripts."""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional
+
+from vm_emulator.script import Script
+from vm_emulator.vm import SP, STACK_BASE, VM
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse input arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Run Hack Virtual Machine code or a VME .tst test script"
+    )
+    parser.add_argument(
+        "path",
+        type=Path,
+        help="Directory or file containing Hack Virtual Machine code, or the test script",
+    )
+    parser.add_argument(
+        "-n",
+        "--steps",
+        type=int,
+        default=None,
+        help="Number of VM commands to execute (programs run until they halt by default)",
+    )
+    return parser.parse_args()
+
+
+def main(in_path: Path, steps: Optional[int] = None) -> int:
+    """Run Hack Virtual Machine code or a test script.
+
+    Args:
+        in_path (Path): The .vm file, the directory containing .vm files or the .tst file
+        steps (Optional[int], optional): Number of VM commands to execute.
+            If None, the program runs until it halts. Defaults to None.
+
+    Returns:
+        int: The exit code, 1 if the test script output differs from the compare-to file
+    """
+    if in_path.suffix == ".tst":
+        script = Script(in_path)
+        script.run()
+        line_number = script.compare()
+        if line_number is not None:
+            print(f"Comparison failure at line {line_number}")
+            return 1
+        print("End of script - Comparison ended successfully")
+        return 0
+
+    vm = VM.from_path(in_path, bootstrap=True)
+    # Set up the stack like the bootstrap code of the VM translator does before calling Sys.init
+    vm.ram[SP] = STACK_BASE
+    start = time.perf_counter()
+    executed = vm.run(steps)
+    elapsed = time.perf_counter() - start
+    state = "Halted" if vm.halted else "Stopped"
+    print(
+        f"{state} after {executed} commands in {elapsed:.3f} s "
+        f"({executed / max(elapsed, 1e-9) / 1e6:.2f} million commands per second)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    raise SystemExit(main(args.path.resolve(), steps=args.steps))
@@ -0,0 +1,198 @@
+"""Module containing the BuildCache class.
+
+The build cache stores the outputs of the tools of the toolchain (the Jack compiler, the VM
+translator and the assembler) on disk, keyed by the hash of their input.
+All the tools share the same cache directory, and include their name and the hash of their own
+source code in the keys, so that the outputs of an older version of a tool are never reused.
+
+NOTE: This module is duplicated in the packages of the Jack compiler, the VM translator and the
+      assembler, as the projects are independent of each other
+"""
+
+import hashlib
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Environment variable overriding the default cache directory
+CACHE_ENVIRONMENT_VARIABLE = "NAND2TETRIS_CACHE"
+# The least recently used entries are evicted when the cache grows above this size
+DEFAULT_MAX_SIZE = 64 * 2**20
+
+
+@lru_cache(maxsize=None)
+def source_version(package: Path = Path(__file__).parent) -> str:
+    """Return the hash of the source code of a package.
+
+    Args:
+        package (Path, optional): The package directory. Defaults to the package of this module.
+
+    Returns:
+        str: The hex digest of the .py files of the package
+    """
+    digest = hashlib.sha256()
+    for path in sorted(package.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """Class storing build outputs in a directory with one subdirectory per entry.
+
+    The modification time of an entry is updated whenever it is used, and the least recently used
+    entries are evicted when the total size exceeds the size cap.
+    The total size is kept as a running total of the entries stored by this instance, so that
+    the entries are only scanned when the total exceeds the size cap.
+    Entries are written to a temporary directory which is renamed, so that processes building
+    in parallel never see partial entries.
+    """
+
+    def __init__(
+        self, directory: Optional[Path] = None, max_size: int = DEFAULT_MAX_SIZE
+    ) -> None:
+        """Create the cache directory if needed.
+
+        Args:
+            directory (Optional[Path], optional): The cache directory. If None, the directory
+                is read from the NAND2TETRIS_CACHE environment variable, and defaults to
+                ~/.cache/nand2tetris. Defaults to None.
+            max_size (int, optional): The size cap in bytes. Defaults to DEFAULT_MAX_SIZE.
+        """
+        if directory is None:
+            directory = Path(
+                os.environ.get(
+                    CACHE_ENVIRONMENT_VARIABLE,
+                    Path.home().joinpath(".cache", "nand2tetris"),
+                )
+            )
+        self.directory = directory
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # The total size is only computed when the first entry is stored
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(*parts: Union[str, bytes]) -> str:
+        """Return the key of the parts identifying a build.
+
+        Args:
+            *parts (Union[str, bytes]): For example the tool name, the tool version, the options
+                and the content of the input
+
+        Returns:
+            str: The hex digest of the parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            data = part.encode() if isinstance(part, str) else part
+            # The length prefix prevents different splits of the same bytes from colliding
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, bytes]]:
+        """Return the outputs of an entry and mark it as recently used.
+
+        Args:
+            key (str): The key of the entry
+
+        Returns:
+            Optional[Dict[str, bytes]]: Map from the output names to their content, or None if
+                the entry is not in the cache
+        """
+        entry = self.directory.joinpath(key)
+        try:
+            outputs = {path.name: path.read_bytes() for path in entry.iterdir()}
+            os.utime(entry)
+        except FileNotFoundError:
+            # Either a miss, or the entry was evicted by another process while reading
+            return None
+        return outputs
+
+    def put(self, key: str, outputs: Dict[str, bytes]) -> None:
+        """Store the outputs of a build and evict entries if the cache is too large.
+
+        Args:
+            key (str): The key of the entry
+            outputs (Dict[str, bytes]): Map from the output names to their content
+        """
+        entry = self.directory.joinpath(key)
+        temporary = self.directory.joinpath(f".{key}.{os.getpid()}")
+        temporary.mkdir(exist_ok=True)
+        for name, content in outputs.items():
+            temporary.joinpath(name).write_bytes(content)
+        try:
+            os.replace(temporary, entry)
+        except OSError:
+            # Another process stored the same entry in the meantime
+            shutil.rmtree(temporary, ignore_errors=True)
+            return
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += sum(len(content) for content in outputs.values())
+        if self._size > self.max_size:
+            self.evict()
+
+    def restore_or_build(
+        self, key: str, paths: Sequence[Path], build: Callable[[], None]
+    ) -> bool:
+        """Restore output files from the cache, or build and store them.
+
+        Args:
+            key (str): The key of the build
+            paths (Sequence[Path]): The output files of the build, which must have unique names
+            build (Callable[[], None]): Function writing the output files
+
+        Returns:
+            bool: True if the files were restored from the cache
+        """
+        outputs = self.get(key)
+        if outputs is not None and all(path.name in outputs for path in paths):
+            for path in paths:
+                path.write_bytes(outputs[path.name])
+            return True
+        build()
+        self.put(key, {path.name: path.read_bytes() for path in paths})
+        return False
+
+    def size(self) -> int:
+        """Return the total size of the entries.
+
+        Returns:
+            int: The size in bytes
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache is below the size cap."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+        self._size = total
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """Return the entries of the cache.
+
+        Returns:
+            List[Tuple[float, int, Path]]: The time of the last use, the size and the path of
+                the entries
+        """
+        entries = []
+        for entry in self.directory.iterdir():
+            # Temporary directories of entries being written start with a dot
+            if entry.name.startswith("."):
+                continue
+            try:
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except FileNotFoundError:
+                continue
+        return entries
@@ -1,11 +1,75 @@
 """Module containing the CodeWriter class."""
 
+# The assembly code is written out verbatim with explanatory comments, which takes many lines
+# pylint: disable=too-many-lines
 
+from functools import lru_cache
+from io import StringIO
 from pathlib import Path
-from typing import Dict, Literal
+from typing import Dict, List, Literal, Optional, TextIO, Tuple, Union
 
+from vm_translator.parser import Command
 
-class CodeWriter:
+
+@lru_cache(maxsize=4096)
+def strip_comments(code: str) -> str:
+    """Return the instructions and labels of commented assembly code.
+
+    NOTE: Most of the code written by the CodeWriter comes from constant templates, so the
+          stripped lines are cached
+
+    Args:
+        code (str): The assembly code with comments, indentation and blank lines
+
+    Returns:
+        str: The lines containing instructions and labels
+    """
+    lines = []
+    for line in code.splitlines():
+        stripped = line.split("//", 1)[0].strip()
+        if stripped:
+            lines.append(f"{stripped}\n")
+    return "".join(lines)
+
+
+class CompactFile:
+    """File-like class which writes assembly code without comments and blank lines."""
+
+    def __init__(self, file: TextIO) -> None:
+        """Wrap the file.
+
+        Args:
+            file (TextIO): The file to write to
+        """
+        self._file = file
+
+    @property
+    def name(self) -> str:
+        """Return the name of the file.
+
+        Returns:
+            str: The name of the wrapped file
+        """
+        return self._file.name
+
+    def write(self, code: str) -> int:
+        """Write the instructions and labels of commented assembly code.
+
+        Args:
+            code (str): The assembly code with comments
+
+        Returns:
+            int: The number of characters of the code (like TextIO.write)
+        """
+        self._file.write(strip_comments(code))
+        return len(code)
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class CodeWriter:  # pylint: disable=too-many-instance-attributes
     """Class which writes symbolic Hack assembly code."""
 
     # See the docstring of write_push_pop for explanation of addresses
@@ -38,15 +102,80 @@ class CodeWriter:
         ),
     }
 
-    def __init__(self, path: str, bootstrap=False) -> None:
+    # Registers holding the base address of the segments
+    segment_register_map = {
+        "local": "LCL",
+        "argument": "ARG",
+        "this": "THIS",
+        "that": "THAT",
+    }
+    # The base address of the segments with fixed addresses
+    segment_base_map = {
+        "pointer": 3,
+        "temp": 5,
+    }
+    # The comp mnemonics of the binary operators (with D as y)
+    binary_operator_map = {
+        "add": "M+D",
+        "sub": "M-D",
+        "and": "M&D",
+        "or": "M|D",
+    }
+    # The jump mnemonics of the comparisons and of their negations
+    comparison_jump_map = {
+        "eq": ("JEQ", "JNE"),
+        "gt": ("JGT", "JLE"),
+        "lt": ("JLT", "JGE"),
+    }
+    # The sequences of VM commands which are fused by the peephole optimizer
+    fused_patterns = (
+        ("push", "pop"),
+        ("push", "binary"),
+        ("push", "comparison", "if-goto"),
+        ("push", "comparison", "not", "if-goto"),
+        ("comparison", "if-goto"),
+        ("comparison", "not", "if-goto"),
+    )
+    # The command types which may be held back by the peephole optimizer
+    stack_command_types = ("C_ARITHMETIC", "C_PUSH", "C_POP", "C_IF")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: str,
+        bootstrap=False,
+        optimize=False,
+        trampolines=False,
+        compact=False,
+        file: Optional[TextIO] = None,
+    ) -> None:
         """Open the output file/stream and gets ready to write into it.
 
         Args:
             path (str): Path to file to write to.
             boostrap (bool): Whether or not to write the bootstrap code
+            optimize (bool): Whether or not to fuse common sequences of VM commands into shorter
+                assembly code
+            trampolines (bool): Whether or not calls and returns should jump to shared routines
+                instead of inlining the frame handling
+            compact (bool): Whether or not to leave out the comments, the indentation and the
+                blank lines
+            file (Optional[TextIO]): Stream to write to instead of the file at path
         """
+        self.optimize = optimize
+        self.trampolines = trampolines
+        # Whether the shared routines must be written when closing
+        self.trampolines_used = False
+        # The commands held back by the peephole optimizer
+        self._pending: List[Command] = []
+
         self.out_path = Path(path)
-        self.file = self.out_path.resolve().open("w")
+        if file is None:
+            file = self.out_path.resolve().open("w")
+        self.file: Union[TextIO, CompactFile] = CompactFile(file) if compact else file
+        self.compact = compact
+        # The cached compact code of the commands, which is written directly to the file
+        self._compact_code: Dict[Tuple[Command, str], str] = {}
+        self._write_raw = file.write
 
         self.file_name = self.out_path.resolve().with_suffix("").name
 
@@ -79,18 +208,55 @@ class CodeWriter:
     def set_file_name(self, file_name: str) -> None:
         """Inform the object that the translation of a new VM file has started.
 
+        The labels of the comparisons are numbered per file, so that the translation of a file
+        does not depend on the files translated before it.
+
         Args:
             file_name (str): The new file name
         """
+        self.flush()
         self.file_name = file_name
+        self._counter_map = dict.fromkeys(self._counter_map, 0)
+        self._current_function = ""
 
     def write_init(self) -> None:
         """Write the assembly instructions that effect the bootstrap code that initializes the VM.
 
         The code generated here myst be placed at the beginning of the generated *.asm file.
         """
+        self.flush()
         self.write_call(function_name="Sys.init", num_args=0)
 
+    def write_command(self, command: Command) -> None:
+        """Write a parsed VM command.
+
+        The push, pop, arithmetic and if-goto commands are written as they are, the other
+        commands are dispatched to their write method.
+
+        Args:
+            command (Command): The command to write
+        """
+        command_type, arg1, arg2 = command
+        if command_type == "C_IF":
+            command = Command(command_type, self._scope_label(arg1))
+        if command_type in self.stack_command_types:
+            if self.optimize:
+                self._hold(command)
+            else:
+                self._write_command(command)
+        elif command_type == "C_LABEL":
+            self.write_label(label=arg1)
+        elif command_type == "C_GOTO":
+            self.write_goto(label=arg1)
+        elif command_type == "C_FUNCTION":
+            # Type ignore as mypy doesn't detect that arg2 is set for C_FUNCTION
+            self.write_function(function_name=arg1, num_vars=arg2)  # type: ignore
+        elif command_type == "C_CALL":
+            # Type ignore as mypy doesn't detect that arg2 is set for C_CALL
+            self.write_call(function_name=arg1, num_args=arg2)  # type: ignore
+        elif command_type == "C_RETURN":
+            self.write_return()
+
     def write_arithmetic(
         self,
         command: Literal["add", "sub", "eq", "gt", "lt", "and", "or", "neg", "not"],
@@ -114,6 +280,23 @@ class CodeWriter:
         True = 11...1 (in base 2) = -1 (in decimal with 2's compliment)
         False = 00...0 (in base 2) = 0 (in decimal)
 
+        Args:
+            command (Literal["add", "sub", "eq", "gt", "lt", "and", "or", "neg", "not"]):
+                The command to translate into assembly
+        """
+        if self.optimize:
+            self._hold(Command("C_ARITHMETIC", command))
+        else:
+            self._write_command(Command("C_ARITHMETIC", command))
+
+    def _write_arithmetic(
+        self,
+        command: Literal["add", "sub", "eq", "gt", "lt", "and", "or", "neg", "not"],
+    ) -> None:
+        """Write the assembly code of an arithmetic command without optimization.
+
+        See write_arithmetic for details.
+
         Args:
             command (Literal["add", "sub", "eq", "gt", "lt", "and", "or", "neg", "not"]):
                 The command to translate into assembly
@@ -213,23 +396,23 @@ class CodeWriter:
             "lt": "JLT",
             "gt": "JGT",
         }
-        counter = self._counter_map[command]
+        label = f"{self.file_name}.{command.upper()}_{self._counter_map[command]}"
         jump = jump_statement[command]
         self.file.write(
             f"   //{' '*4}Check for '{command}'\n"
             "   D=M-D  // By subtracting M and D we can check for equality\n"
-            f"   @{command.upper()}_{counter}\n"
+            f"   @{label}\n"
             f"   D;{jump}  // Jump to label above if true\n"
             "   @SP  // Select the current stack pointer (first non-free address)\n"
             "   A=M-1  // Dereference previous stack pointer\n"
             "   M=0  // Condition checked for was false\n"
-            f"   @END_{command.upper()}_{counter}\n"
+            f"   @{label}_END\n"
             "   0;JMP  // Always jump to the end\n"
-            f"({command.upper()}_{counter})\n"
+            f"({label})\n"
             "   @SP  // Select the current stack pointer (first non-free address)\n"
             "   A=M-1  // Dereference previous stack pointer\n"
             "   M=-1  // Condition checked for was true\n"
-            f"(END_{command.upper()}_{counter})\n"
+            f"({label}_END)\n"
         )
         # Increment counter
         self._counter_map[command] += 1
@@ -284,7 +467,31 @@ class CodeWriter:
 
         Args:
             command (Literal["C_PUSH", "C_POP"]): The command to translate into assembly
-            segment (Literal["local", "argument", "this", "that", "constant", "static", "pointer", "temp"]):
+            segment (Literal["local", "argument", "this", "that", "constant", "static",
+                "pointer", "temp"]): Which virtual memory segment to push from/pop to
+            index (int): Segment index to push from/pop to
+        """
+        if self.optimize:
+            self._hold(Command(command, segment, index))
+        else:
+            self._write_command(Command(command, segment, index))
+
+    def _write_push_pop(
+        self,
+        command: Literal["C_PUSH", "C_POP"],
+        segment: Literal[
+            "local", "argument", "this", "that", "constant", "static", "pointer", "temp"
+        ],
+        index: int,
+    ) -> None:
+        """Write the assembly code of a push or pop command without optimization.
+
+        See write_push_pop for details.
+
+        Args:
+            command (Literal["C_PUSH", "C_POP"]): The command to translate into assembly
+            segment (Literal["local", "argument", "this", "that", "constant", "static", "pointer",
+            "temp"]):
                 Which virtual memory segment to push from/pop to
             index (int): Segment index to push from/pop to
         """
@@ -418,12 +625,31 @@ class CodeWriter:
                         "   D=D+A  // Set D to index (D) + constant address (A)\n"
                     )
 
+    def _scope_label(self, label: str) -> str:
+        """Return the label in the scope of the current function.
+
+        The labels of the VM language are local to their function, so the same label can be
+        used in several functions.
+
+        Args:
+            label (str): The label of the VM command
+
+        Returns:
+            str: The label prefixed by the function as functionName$label, or the label as is
+                outside of functions
+        """
+        if self._current_function:
+            return f"{self._current_function}${label}"
+        return label
+
     def write_label(self, label: str) -> None:
         """Write assembly code that effects the `label` command.
 
         Args:
             label (str): The label to effect
         """
+        self.flush()
+        label = self._scope_label(label)
         self.file.write(f"({label})\n")
         # Add 2 newlines to make the code more readable
         self.file.write("\n" * 2)
@@ -434,6 +660,8 @@ class CodeWriter:
         Args:
             label (str): The label to go to
         """
+        self.flush()
+        label = self._scope_label(label)
         self.file.write(
             f"// goto {label}\n"
             f"   @{label}  // Select label to jump to\n"
@@ -445,6 +673,18 @@ class CodeWriter:
     def write_if(self, label: str) -> None:
         """Write assembly code that effects the `if-goto` command.
 
+        Args:
+            label (str): The label to go to
+        """
+        command = Command("C_IF", self._scope_label(label))
+        if self.optimize:
+            self._hold(command)
+        else:
+            self._write_command(command)
+
+    def _write_if(self, label: str) -> None:
+        """Write the assembly code of an `if-goto` command without optimization.
+
         Args:
             label (str): The label to go to
         """
@@ -467,6 +707,7 @@ class CodeWriter:
             function_name (str): Name of the function
             num_vars (int): Number of local variables in the function
         """
+        self.flush()
         # Update the current function (needed for adding a return label during calls)
         self._current_function = function_name
         self.file.write(
@@ -498,21 +739,47 @@ class CodeWriter:
             function_name (str): Name of the function
             num_args (int): Number of arguments passed to the function
         """
+        self.flush()
         # Update return map
-        if self._current_function not in self._return_map.keys():
-            self._return_map[self._current_function] = 1
+        # NOTE: Calls outside of functions are scoped by the file name
+        scope = self._current_function or self.file_name
+        if scope not in self._return_map.keys():
+            self._return_map[scope] = 1
         else:
-            self._return_map[self._current_function] += 1
+            self._return_map[scope] += 1
+
+        return_label = f"{scope}$return.{self._return_map[scope]}"
+
+        if self.trampolines:
+            self.trampolines_used = True
+            self.file.write(
+                f"// call {function_name} {num_args}\n"
+                f"   //{' '*4}Pass the function and the number of arguments in temp addresses\n"
+                f"   @{function_name}  // Select the function to call\n"
+                "   D=A  // Store the address of the function to D\n"
+                "   @13  // Select the first temp address\n"
+                "   M=D  // Store the address of the function to tmp\n"
+                f"   @{num_args}  // Set A to the number of arguments\n"
+                "   D=A  // Store the number of arguments to D\n"
+                "   @14  // Select the second temp address\n"
+                "   M=D  // Store the number of arguments to tmp\n"
+                f"   //{' '*4}Pass the return address in D and jump to the call routine\n"
+                f"   @{return_label}\n"
+                "   D=A  // Store the return address to D\n"
+                "   @$CALL\n"
+                "   0;JMP\n"
+                f"({return_label})\n"
+            )
+            # Add 2 newlines to make the code more readable
+            self.file.write("\n" * 2)
+            return
 
         # Write code
         self.file.write(
             f"// call {function_name} {num_args}\n"
             f"   //{' '*4}Push the return address to the stack\n"
         )
-        self._push_address_to_stack(
-            f"{self._current_function}$return.{self._return_map[self._current_function]}",
-            label=True,
-        )
+        self._push_address_to_stack(return_label, label=True)
         self.file.write(f"   //{' '*4}Push LCL of the caller to the stack\n")
         self._push_address_to_stack("LCL")
         self.file.write(f"   //{' '*4}Push ARG of the caller to the stack\n")
@@ -541,7 +808,7 @@ class CodeWriter:
             f"   @{function_name}\n"
             "   0;JMP\n"
             f"   //{' '*4}Make the return label\n"
-            f"({self._current_function}$return.{self._return_map[self._current_function]})\n"
+            f"({return_label})\n"
         )
 
         # Add 2 newlines to make the code more readable
@@ -576,8 +843,23 @@ class CodeWriter:
 
     def write_return(self) -> None:
         """Write assembly code that effects the `return` command."""
+        self.flush()
+        self.file.write("// return\n")
+        if self.trampolines:
+            self.trampolines_used = True
+            self.file.write(
+                "   @$RETURN  // Select the return routine\n"
+                "   0;JMP  // Let the return routine restore the frame of the caller\n"
+            )
+        else:
+            self._write_return_frame()
+
+        # Add 2 newlines to make the code more readable
+        self.file.write("\n" * 2)
+
+    def _write_return_frame(self) -> None:
+        """Write the assembly code restoring the frame of the caller and jumping back to it."""
         self.file.write(
-            "// return\n"
             f"   //{' '*4}Store endFrame as a temporary variable\n"
             "   @LCL  // Get the local address (side effect: M is set to the content of RAM[LCL])\n"
             "   D=M  // Store the address of LCL to D\n"
@@ -641,9 +923,328 @@ class CodeWriter:
             "   0;JMP\n"
         )
 
-        # Add 2 newlines to make the code more readable
+    def _write_trampolines(self) -> None:
+        """Write the routines shared by all calls and returns.
+
+        The call sites pass the address of the function in RAM[13], the number of arguments in
+        RAM[14] and the return address in D, so that the call routine only needs to push the
+        frame of the caller and reposition ARG and LCL.
+        The return routine is the same code which is otherwise inlined for every return.
+        """
+        self.file.write(
+            "// Call routine\n"
+            "($CALL)\n"
+            f"   //{' '*4}Push the return address to the stack\n"
+            "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+            "   A=M  // Let the address point to the next free position in the stack\n"
+            "   M=D  // Store the return address\n"
+        )
+        for register in ("LCL", "ARG", "THIS", "THAT"):
+            self.file.write(
+                f"   //{' '*4}Push {register} of the caller to the stack\n"
+                f"   @{register}  // Select {register}\n"
+                f"   D=M  // Store the address pointed to by {register} to D\n"
+                "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+                "   AM=M+1  // Increment the SP and let the address point to it\n"
+                f"   M=D  // Store the value of {register}\n"
+            )
+        self.file.write(
+            f"   //{' '*4}Reposition LCL to LCL = SP\n"
+            "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+            "   MD=M+1  // Increment the SP past the frame and store it to D\n"
+            "   @LCL  // Set A to LCL\n"
+            "   M=D  // Let LCL point to SP\n"
+            f"   //{' '*4}Reposition ARG to ARG = SP-5-nArgs\n"
+            "   @14  // Select the number of arguments\n"
+            "   D=D-M  // SP-nArgs\n"
+            "   @5  // Set A to 5\n"
+            "   D=D-A  // SP-5-nArgs\n"
+            "   @ARG  // Set A to ARG\n"
+            "   M=D  // Let ARG point to SP-5-nArgs\n"
+            f"   //{' '*4}Transfers control to the called function\n"
+            "   @13  // Select the address of the function\n"
+            "   A=M  // Set A to the address of the function\n"
+            "   0;JMP\n"
+        )
+        self.file.write("\n" * 2)
+        self.file.write("// Return routine\n($RETURN)\n")
+        self._write_return_frame()
         self.file.write("\n" * 2)
 
+    def _hold(self, command: Command) -> None:
+        """Hold back a command for the peephole optimizer.
+
+        The pending commands are written as soon as they either complete one of the fused
+        patterns, or can no longer be the start of one.
+
+        Args:
+            command (Command): The command to hold back
+        """
+        self._pending.append(command)
+        while self._pending:
+            kinds = tuple(self._kind(pending) for pending in self._pending)
+            if kinds in self.fused_patterns:
+                self._write_fused(self._pending)
+                self._pending = []
+            elif any(pattern[: len(kinds)] == kinds for pattern in self.fused_patterns):
+                return
+            else:
+                self._write_command(self._pending.pop(0))
+
+    def flush(self) -> None:
+        """Write the commands held back by the peephole optimizer without fusing them."""
+        while self._pending:
+            self._write_command(self._pending.pop(0))
+
+    def _kind(self, command: Command) -> str:
+        """Return the role a command can play in the fused patterns.
+
+        Args:
+            command (Command): The command
+
+        Returns:
+            str: One of "push", "pop", "binary", "comparison", "not" and "if-goto", or an empty
+                string if the command is not part of any pattern
+        """
+        command_type, arg1, _ = command
+        if command_type != "C_ARITHMETIC":
+            return {"C_PUSH": "push", "C_POP": "pop", "C_IF": "if-goto"}.get(
+                command_type, ""
+            )
+        if arg1 in self.binary_operator_map:
+            return "binary"
+        if arg1 in self.comparison_jump_map:
+            return "comparison"
+        return "not" if arg1 == "not" else ""
+
+    def _write_command(self, command: Command) -> None:
+        """Write a push, pop, arithmetic or if-goto command without fusing it.
+
+        In compact mode the code of the commands is cached, as the same commands are repeated
+        throughout the programs.
+        The comparisons are not cached as their code contains unique labels.
+
+        Args:
+            command (Command): The command to write
+        """
+        if not self.compact or self._kind(command) == "comparison":
+            self._write_commented(command)
+            return
+        key = (command, self.file_name)
+        code = self._compact_code.get(key)
+        if code is None:
+            # Render the commented code once and strip it
+            file = self.file
+            self.file = StringIO()
+            self._write_commented(command)
+            code = strip_comments(self.file.getvalue())
+            self._compact_code[key] = code
+            self.file = file
+        self._write_raw(code)
+
+    def _write_commented(self, command: Command) -> None:
+        """Write the commented code of a push, pop, arithmetic or if-goto command.
+
+        Args:
+            command (Command): The command to write
+        """
+        command_type, arg1, arg2 = command
+        if command_type == "C_ARITHMETIC":
+            # The command has been checked by write_arithmetic
+            self._write_arithmetic(arg1)  # type: ignore
+        elif command_type == "C_IF":
+            self._write_if(arg1)
+        else:
+            # The command has been checked by write_push_pop
+            self._write_push_pop(command_type, arg1, arg2)  # type: ignore
+
+    def _write_fused(self, commands: List[Command]) -> None:
+        """Write the assembly code of a sequence of commands matching a fused pattern.
+
+        The fused code avoids the round trip through the stack of the intermediate results.
+
+        Args:
+            commands (List[Command]): The commands to fuse
+        """
+        command_map = {"C_PUSH": "push", "C_POP": "pop", "C_IF": "if-goto"}
+        for command_type, arg1, arg2 in commands:
+            words = (command_map.get(command_type, ""), arg1, arg2)
+            self.file.write(
+                f"// {' '.join(str(word) for word in words if word not in ('', None))}\n"
+            )
+
+        first, second = commands[:2]
+        # The conditional jump starts after the push (if any)
+        condition = commands
+        if self._kind(first) == "push":
+            if second.command_type == "C_POP":
+                # Type ignore as mypy doesn't detect that arg2 is set for C_PUSH and C_POP
+                self._write_fused_push_pop(
+                    first.arg1, first.arg2, second.arg1, second.arg2  # type: ignore
+                )
+                return
+            if second.command_type == "C_ARITHMETIC" and self._kind(second) == "binary":
+                # Type ignore as mypy doesn't detect that arg2 is set for C_PUSH
+                self._write_fused_binary(first.arg1, first.arg2, second.arg1)  # type: ignore
+                return
+            # The pushed value is the y of the comparison
+            condition = commands[1:]
+            self.file.write(
+                # Type ignore as mypy doesn't detect that arg2 is set for C_PUSH
+                self._load_to_d(first.arg1, first.arg2)  # type: ignore
+                + "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+                "   AM=M-1  // Pop x\n"
+                "   D=M-D  // Compare x with y\n"
+            )
+        else:
+            self.file.write(
+                "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+                "   AM=M-1  // Pop y\n"
+                "   D=M  // Store y to D\n"
+                "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+                "   AM=M-1  // Pop x\n"
+                "   D=M-D  // Compare x with y\n"
+            )
+        jump, negated_jump = self.comparison_jump_map[condition[0].arg1]
+        # A "not" between the comparison and the if-goto negates the jump
+        self.file.write(
+            f"   @{condition[-1].arg1}  // Select label to jump to\n"
+            f"   D;{negated_jump if len(condition) == 3 else jump}  // Jump if true\n"
+        )
+        self.file.write("\n" * 2)
+
+    def _write_fused_push_pop(
+        self, push_segment: str, push_index: int, pop_segment: str, pop_index: int
+    ) -> None:
+        """Write the assembly code of a push directly followed by a pop.
+
+        Args:
+            push_segment (str): Which virtual memory segment to push from
+            push_index (int): Segment index to push from
+            pop_segment (str): Which virtual memory segment to pop to
+            pop_index (int): Segment index to pop to
+        """
+        if pop_segment in self.segment_register_map and pop_index > 1:
+            # Selecting the target needs D, so the address is computed before the value
+            self.file.write(
+                f"   @{pop_index}  // Set A to 'index'\n"
+                "   D=A  // Store the index to the D register\n"
+                f"   @{self.segment_register_map[pop_segment]}  // Set A to the base address\n"
+                "   D=D+M  // Set D to the target address\n"
+                "   @13  // Select the first temp address\n"
+                "   M=D  // Store the target address to tmp\n"
+                + self._load_to_d(push_segment, push_index)
+                + "   @13  // Select the first temp address\n"
+                "   A=M  // Set A to the target address\n"
+                "   M=D  // Store the value\n"
+            )
+        else:
+            self.file.write(
+                self._load_to_d(push_segment, push_index)
+                + self._select(pop_segment, pop_index)
+                + "   M=D  // Store the value\n"
+            )
+        self.file.write("\n" * 2)
+
+    def _write_fused_binary(self, segment: str, index: int, operator: str) -> None:
+        """Write the assembly code of a push directly followed by a binary operator.
+
+        The pushed value is the y of the operator, and the result replaces x on the stack.
+
+        Args:
+            segment (str): Which virtual memory segment to push from
+            index (int): Segment index to push from
+            operator (str): The binary operator
+        """
+        if segment == "constant" and index == 1 and operator in ("add", "sub"):
+            # Increments and decrements do not need D
+            self.file.write(
+                "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+                "   A=M-1  // Select x\n"
+                f"   M=M{'+' if operator == 'add' else '-'}1  // Update x in place\n"
+            )
+        else:
+            self.file.write(
+                self._load_to_d(segment, index)
+                + "   @SP  // Set A to 0 (side effect: M is set to content of RAM[0])\n"
+                "   A=M-1  // Select x\n"
+                f"   M={self.binary_operator_map[operator]}  // Update x in place\n"
+            )
+        self.file.write("\n" * 2)
+
+    def _load_to_d(self, segment: str, index: int) -> str:
+        """Return the assembly code storing the content of a segment entry to D.
+
+        Args:
+            segment (str): The virtual memory segment
+            index (int): The segment index
+
+        Returns:
+            str: The assembly code
+        """
+        if segment == "constant":
+            return f"   @{index}  // Set A to the constant\n   D=A  // Store the constant to D\n"
+        return self._select(segment, index) + "   D=M  // Store the value to D\n"
+
+    def _select(self, segment: str, index: int) -> str:
+        """Return the assembly code setting A to the address of a segment entry.
+
+        NOTE: D is overwritten if the base address is stored in a register and the index is
+              larger than 1
+
+        Args:
+            segment (str): The virtual memory segment
+            index (int): The segment index
+
+        Returns:
+            str: The assembly code
+        """
+        if segment == "static":
+            return f"   @{self.file_name}.{index}  // Select the static variable\n"
+        if segment in self.segment_base_map:
+            return (
+                f"   @{self.segment_base_map[segment] + index}  // Select the address\n"
+            )
+        register = self.segment_register_map[segment]
+        if index == 0:
+            return (
+                f"   @{register}  // Set A to the base address\n"
+                "   A=M  // Select the address\n"
+            )
+        if index == 1:
+            return (
+                f"   @{register}  // Set A to the base address\n"
+                "   A=M+1  // Select the address\n"
+            )
+        return (
+            f"   @{index}  // Set A to 'index'\n"
+            "   D=A  // Store the index to the D register\n"
+            f"   @{register}  // Set A to the base address\n"
+            "   A=D+M  // Select the address\n"
+        )
+
+    def write_translation(self, code: str, trampolines_used: bool) -> None:
+        """Write code translated by another CodeWriter with the same options.
+
+        Args:
+            code (str): The translated code
+            trampolines_used (bool): Whether the code jumps to the shared routines
+        """
+        self.flush()
+        self._write_raw(code)
+        self.trampolines_used |= trampolines_used
+
+    def finish(self) -> None:
+        """Write the pending commands and the shared routines without closing the output.
+
+        Used when the output is an in-memory stream which is read after the translation.
+        """
+        self.flush()
+        if self.trampolines_used:
+            self._write_trampolines()
+            self.trampolines_used = False
+
     def close(self) -> None:
         """Close the output file."""
+        self.finish()
         self.file.close()
@@ -1,9 +1,23 @@
 """Module containing Parser class."""
 
-import re
 from enum import Enum
 from pathlib import Path
-from typing import Literal
+from typing import Dict, Iterable, Iterator, Literal, NamedTuple, Optional
+
+# Size of the chunks read from the input file
+BUFFER_SIZE = 2**20
+
+CommandType = Literal[
+    "C_ARITHMETIC",
+    "C_PUSH",
+    "C_POP",
+    "C_LABEL",
+    "C_GOTO",
+    "C_IF",
+    "C_FUNCTION",
+    "C_RETURN",
+    "C_CALL",
+]
 
 
 class CommandEnum(Enum):
@@ -31,8 +45,74 @@ class CommandEnum(Enum):
     CALL = "C_CALL"
 
 
+# Map from the command as written in the .vm file to the command type
+# NOTE: __members__ also includes the aliases (members sharing the same value)
+COMMAND_TYPE_MAP: Dict[str, CommandType] = {
+    name.lower().replace("_", "-"): member.value
+    for name, member in CommandEnum.__members__.items()
+}
+
+
+class Command(NamedTuple):
+    """A parsed VM command.
+
+    arg1 is the command itself for C_ARITHMETIC, and empty for C_RETURN.
+    arg2 is only populated for C_PUSH, C_POP, C_FUNCTION and C_CALL.
+    """
+
+    command_type: CommandType
+    arg1: str = ""
+    arg2: Optional[int] = None
+
+
+def strip_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the commands of the lines stripped of comments and whitespace.
+
+    Blank lines and lines only containing comments are skipped.
+
+    Args:
+        lines (Iterable[str]): The lines of the .vm program
+
+    Yields:
+        str: The stripped command
+    """
+    for line in lines:
+        line = line.split("//", 1)[0].strip()
+        if line:
+            yield line
+
+
+def parse_command(instruction: str) -> Command:
+    """Parse a stripped command.
+
+    Args:
+        instruction (str): Command stripped of comments and surrounding whitespace
+
+    Returns:
+        Command: The parsed command
+    """
+    parts = instruction.split()
+    command_type = COMMAND_TYPE_MAP[parts[0]]
+    if command_type == "C_ARITHMETIC":
+        return Command(command_type, parts[0])
+    if command_type == "C_RETURN":
+        return Command(command_type)
+    if len(parts) > 2:
+        return Command(command_type, parts[1], int(parts[2]))
+    return Command(command_type, parts[1])
+
+
 class Parser:
-    """Class parsing .vm files."""
+    """Class parsing .vm files.
+
+    The preferred way of using the parser is to iterate over it
+
+    >>> for command in Parser("Prog.vm"):
+    ...     print(command.command_type)
+
+    has_more_commands and advance are kept for compatibility, and are served by the same
+    buffered line iterator.
+    """
 
     def __init__(self, path: str) -> None:
         """Open input file to parse.
@@ -40,29 +120,39 @@ class Parser:
         Args:
             path (str): Path to file to parse
         """
-        self.file = Path(path).resolve().open("r")
+        self.file = Path(path).resolve().open("r", buffering=BUFFER_SIZE)
         self.current_instruction = ""
-        # Regexes
-        starting_with_comment = r"^\s*(\/{2,}|\n)"
-        self.ignore_re = re.compile(starting_with_comment)
+        self._instructions = strip_lines(self.file)
+        # Command read by has_more_commands, but not yet made current by advance
+        self._next_instruction: Optional[str] = None
 
     def __del__(self):
         """Close the file."""
         self.file.close()
 
+    def __iter__(self) -> Iterator[Command]:
+        """Iterate over the remaining commands.
+
+        Yields:
+            Command: The next parsed command
+        """
+        if self._next_instruction is not None:
+            # The command has already been read by has_more_commands
+            self.advance()
+            yield parse_command(self.current_instruction)
+        for instruction in self._instructions:
+            self.current_instruction = instruction
+            yield parse_command(instruction)
+
     def has_more_commands(self) -> bool:
         """Return if the file has more commands.
 
         Returns:
-            bool: True if the file has more lines
+            bool: True if the file has more commands
         """
-        cur_pos = self.file.tell()
-        # The return value of .readline() is unambiguous
-        # It will return "" only on the last line
-        # A blank line will be returned as "\n"
-        next_line_not_empty = bool(self.file.readline())
-        self.file.seek(cur_pos)
-        return next_line_not_empty
+        if self._next_instruction is None:
+            self._next_instruction = next(self._instructions, None)
+        return self._next_instruction is not None
 
     def advance(self) -> None:
         """Read the next instruction and make it the current instruction.
@@ -72,27 +162,9 @@ class Parser:
 
         This method should be called only if has_more_lines is true.
         """
-        found_line = False
-
-        while not found_line:
-            line = self.file.readline()
-            # Check if we are at the end of the file
-            if line == "":
-                self.current_instruction = ""
-                return
-
-            # Check if this line can be skipped
-            if self.ignore_re.match(line) is not None:
-                continue
-
-            # We've found an instruction
-            found_line = True
-            self.current_instruction = line
-
-        # Remove any comments
-        self.current_instruction = self.current_instruction.split("//")[0]
-        # Remove trailing whitespaces
-        self.current_instruction = self.current_instruction.rstrip().lstrip()
+        self.has_more_commands()
+        self.current_instruction = self._next_instruction or ""
+        self._next_instruction = None
 
     def command_type(
         self,
@@ -3,10 +3,15 @@
 """File containing functions for translating .asm files to .hack files."""
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from itertools import repeat
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+from vm_translator.build_cache import BuildCache, source_version
 from vm_translator.code_writer import CodeWriter
-from vm_translator.parser import Parser
+from vm_translator.parser import Command, Parser
 
 
 def parse_args() -> argparse.Namespace:
@@ -24,6 +29,36 @@ def parse_args() -> argparse.Namespace:
         help="Directory or file containing Hack Virtual Machine code to translate to symbolic "
         "Hack assembly code",
     )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Fuse common sequences of VM commands into shorter assembly code",
+    )
+    parser.add_argument(
+        "--trampolines",
+        action="store_true",
+        help="Jump to shared call and return routines instead of inlining them",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Write the assembly code with explanatory comments",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes translating the files in parallel (0 uses all the CPUs)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            "Reuse the translations of unchanged files from the build cache "
+            "($NAND2TETRIS_CACHE, defaults to ~/.cache/nand2tetris)"
+        ),
+    )
     return parser.parse_args()
 
 
@@ -34,60 +69,145 @@ def process_file(file_to_parse: Path, code_writer: CodeWriter) -> None:
         file_to_parse (Path): File to parse
         code_writer (CodeWriter): The code writer to ues
     """
-    print(f"Processing {file_to_parse}...")
-    parser = Parser(str(file_to_parse))
     code_writer.set_file_name(file_to_parse.name)
+    write_commands(Parser(str(file_to_parse)), code_writer)
 
-    while parser.has_more_commands():
-        parser.advance()
-        command_type = parser.command_type()
-        if command_type != "C_RETURN":
-            arg1 = parser.arg1()
-        if command_type == "C_ARITHMETIC":
-            # mypy correctly complains that segment want's a literal, and not a str
-            # However, as we know that we are dealing with C_ARITHMETIC we know
-            # that the argument can only be one of the literals
-            code_writer.write_arithmetic(command=arg1)  # type: ignore
-        # mypy throws error when using in
-        # pylint: disable=consider-using-in
-        elif command_type == "C_PUSH" or command_type == "C_POP":
-            index = parser.arg2()
-            # mypy correctly complains that segment want's a literal, and not a str
-            # However, as we know that we are not dealing with C_ARITHMETIC we know
-            # that the argument can only be one of the literals
-            code_writer.write_push_pop(
-                command=command_type, segment=arg1, index=index  # type: ignore
-            )
-        elif command_type == "C_LABEL":
-            code_writer.write_label(label=arg1)
-        elif command_type == "C_GOTO":
-            code_writer.write_goto(label=arg1)
-        elif command_type == "C_IF":
-            code_writer.write_if(label=arg1)
-        elif command_type == "C_FUNCTION":
-            num_vars = parser.arg2()
-            code_writer.write_function(function_name=arg1, num_vars=num_vars)
-        elif command_type == "C_CALL":
-            num_args = parser.arg2()
-            code_writer.write_call(function_name=arg1, num_args=num_args)
-        elif command_type == "C_RETURN":
-            code_writer.write_return()
-
-
-def main(in_path: Path) -> None:
+
+def write_commands(commands: Iterable[Command], code_writer: CodeWriter) -> None:
+    """Write commands with the code writer.
+
+    Args:
+        commands (Iterable[Command]): The parsed commands
+        code_writer (CodeWriter): The code writer to use
+    """
+    write_command = code_writer.write_command
+    for command in commands:
+        write_command(command)
+
+
+def translate_file(
+    file_to_parse: Path,
+    optimize: bool,
+    trampolines: bool,
+    compact: bool,
+    cache: Optional[BuildCache] = None,
+) -> Tuple[str, bool]:
+    """Translate a single file into an independent buffer.
+
+    Args:
+        file_to_parse (Path): File to parse
+        optimize (bool): Whether or not to fuse common sequences of VM commands
+        trampolines (bool): Whether or not to use shared call and return routines
+        compact (bool): Whether or not to leave out the comments
+        cache (Optional[BuildCache], optional): If given, the translation is reused when the
+            file and the options are unchanged. Defaults to None.
+
+    Returns:
+        Tuple[str, bool]: The assembly code, and whether it jumps to the shared routines
+    """
+    if cache is not None:
+        # The file name is part of the key as it is used in the static symbols and the labels
+        key = cache.key(
+            "vm_translator",
+            source_version(),
+            f"{optimize} {trampolines} {compact}",
+            file_to_parse.name,
+            file_to_parse.read_bytes(),
+        )
+        outputs = cache.get(key)
+        if outputs is not None:
+            return outputs["asm"].decode(), outputs["trampolines"] == b"1"
+        code, trampolines_used = translate_file(
+            file_to_parse, optimize, trampolines, compact
+        )
+        cache.put(
+            key,
+            {"asm": code.encode(), "trampolines": b"1" if trampolines_used else b"0"},
+        )
+        return code, trampolines_used
+
+    buffer = StringIO()
+    code_writer = CodeWriter(
+        str(file_to_parse.with_suffix(".asm")),
+        optimize=optimize,
+        trampolines=trampolines,
+        compact=compact,
+        file=buffer,
+    )
+    process_file(file_to_parse, code_writer)
+    code_writer.flush()
+    return buffer.getvalue(), code_writer.trampolines_used
+
+
+def translate_files(  # pylint: disable=too-many-arguments
+    files_to_parse: List[Path],
+    optimize: bool,
+    trampolines: bool,
+    compact: bool,
+    jobs: int,
+    cache: Optional[BuildCache],
+) -> Iterator[Tuple[str, bool]]:
+    """Translate files into independent buffers.
+
+    Args:
+        files_to_parse (List[Path]): Files to parse
+        optimize (bool): Whether or not to fuse common sequences of VM commands
+        trampolines (bool): Whether or not to use shared call and return routines
+        compact (bool): Whether or not to leave out the comments
+        jobs (int): Number of processes translating the files in parallel, where 0 uses all
+            the CPUs
+        cache (Optional[BuildCache]): If given, the translations of unchanged files are reused
+
+    Yields:
+        Tuple[str, bool]: The assembly code of the files in the order of the files, and whether
+            it jumps to the shared routines
+    """
+    arguments = (
+        files_to_parse,
+        repeat(optimize),
+        repeat(trampolines),
+        repeat(compact),
+        repeat(cache),
+    )
+    if jobs == 1:
+        yield from map(translate_file, *arguments)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+            yield from executor.map(translate_file, *arguments)
+
+
+def main(  # pylint: disable=too-many-arguments
+    in_path: Path,
+    optimize: bool = False,
+    trampolines: bool = False,
+    debug: bool = False,
+    jobs: int = 1,
+    cache: Optional[BuildCache] = None,
+) -> None:
     """Translate Hack Virtual Machine code to symbolic Hack assembly code.
 
     The input xxx.vm will be translated to xxx.asm.
 
     Args:
         in_path (Path): File or directory to translate
+        optimize (bool, optional): Whether or not to fuse common sequences of VM commands.
+            Defaults to False.
+        trampolines (bool, optional): Whether or not to use shared call and return routines.
+            Defaults to False.
+        debug (bool, optional): Whether or not to write the comments explaining the assembly
+            code. Defaults to False.
+        jobs (int, optional): Number of processes translating the files in parallel, where 0
+            uses all the CPUs. The output is the same as for the serial translation.
+            Defaults to 1.
+        cache (Optional[BuildCache], optional): If given, the translations of unchanged files
+            are reused. Defaults to None.
 
     Raises:
         ValueError: If a input directory contains no .vm file
         ValueError: If the input file is not a .vm file
     """
     if in_path.is_dir():
-        files_to_parse = list(in_path.glob("*.vm"))
+        files_to_parse = sorted(in_path.glob("*.vm"))
         if len(files_to_parse) == 0:
             raise ValueError(f"{in_path} contains no *.vm files")
         print(f"{in_path} is a dir, will write bootstrap code")
@@ -101,14 +221,37 @@ def main(in_path: Path) -> None:
     code_writer = CodeWriter(
         str(in_dir.joinpath(in_dir.name).with_suffix(".asm")),
         bootstrap=in_path.is_dir(),
+        optimize=optimize,
+        trampolines=trampolines,
+        compact=not debug,
     )
 
-    for file_to_parse in files_to_parse:
-        process_file(file_to_parse, code_writer)
+    if jobs == 1 and cache is None:
+        for file_to_parse in files_to_parse:
+            print(f"Processing {file_to_parse}...")
+            process_file(file_to_parse, code_writer)
+    else:
+        translations = translate_files(
+            files_to_parse, optimize, trampolines, not debug, jobs, cache
+        )
+        # The translations are merged in the order of the files
+        for file_to_parse, (code, trampolines_used) in zip(
+            files_to_parse, translations
+        ):
+            print(f"Processing {file_to_parse}...")
+            code_writer.write_translation(code, trampolines_used)
+    code_writer.close()
 
     print(f"{code_writer.out_path} written!")
 
 
 if __name__ == "__main__":
     args = parse_args()
-    main(args.path.resolve())
+    main(
+        args.path.resolve(),
+        optimize=args.optimize,
+        trampolines=args.trampolines,
+        debug=args.debug,
+        jobs=args.jobs,
+        cache=BuildCache() if args.cache else None,
+    )
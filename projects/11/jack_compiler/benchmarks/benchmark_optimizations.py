@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+
+"""Benchmark of the code generated by the Jack compiler at the optimization levels.
+
+The programs are compiled together with the operating system of project 12 to Hack machine
+code, and executed on the Hack emulator of project 06 until Sys.halt is called.
+The keyboard is scripted: every call of Keyboard.keyPressed alternately presses the next key of
+the input and releases it, so no cycles are spent waiting for a key.
+The screens the programs leave behind are compared with the one of -O0, so that a miscompiled
+program fails the benchmark instead of showing up as a speedup. Only the screen is compared, as
+the stack and the heap may legitimately differ between the optimization levels.
+"""
+
+import argparse
+import hashlib
+import time
+from itertools import chain
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from jack_compiler.hackc import compile_class, translate
+from jack_compiler.optimizer import OPTIMIZATION_LEVELS
+
+# The projects of the assembler and the emulator are added to the path by hackc (mypy finds
+# them through MYPYPATH)
+# pylint: disable=wrong-import-order,import-error
+from assembler.assembler import assemble, resolve_symbols  # type: ignore[import-not-found]  # isort: skip
+from assembler.parser import parse_instructions  # type: ignore[import-not-found]  # isort: skip
+from hack_emulator.cpu import CPU, KBD, SCREEN, make_halt_operation  # type: ignore[import-not-found]  # isort: skip
+
+# pylint: enable=wrong-import-order,import-error
+
+PROJECTS_PATH = Path(__file__).parents[3]
+OS_PATH = PROJECTS_PATH.joinpath("12")
+
+NEWLINE = 128
+
+# The keys typed into the programs
+INPUTS: Dict[str, List[int]] = {
+    "Pong": [],
+    "Average": [
+        key
+        for line in ("3", "10", "20", "33")
+        for key in chain((ord(char) for char in line), (NEWLINE,))
+    ],
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse input arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the code generated at the optimization levels"
+    )
+    parser.add_argument(
+        "programs",
+        nargs="*",
+        default=sorted(INPUTS),
+        help=f"The programs of project 11 to benchmark, out of {', '.join(sorted(INPUTS))}",
+    )
+    return parser.parse_args()
+
+
+def program_files(name: str) -> List[Path]:
+    """Return the .jack files of a program together with the operating system.
+
+    Args:
+        name (str): The name of the program directory in project 11
+
+    Returns:
+        List[Path]: The files ordered by their class names
+    """
+    files = {path.stem: path for path in OS_PATH.glob("*.jack")}
+    files.update(
+        (path.stem, path) for path in PROJECTS_PATH.joinpath("11", name).glob("*.jack")
+    )
+    return [files[stem] for stem in sorted(files)]
+
+
+def count_vm_commands(files: Sequence[Path], opt_level: int) -> int:
+    """Count the VM commands of the compiled program.
+
+    Args:
+        files (Sequence[Path]): The .jack files
+        opt_level (int): The optimization level
+
+    Returns:
+        int: The number of VM commands
+    """
+    commands = 0
+
+    def sink(_: object) -> None:
+        nonlocal commands
+        commands += 1
+
+    for path in files:
+        compile_class(path, sink, opt_level=opt_level)
+    return commands
+
+
+def run(
+    words: List[int], addresses: Dict[str, int], keys: Sequence[int]
+) -> Tuple[int, str]:
+    """Run a program on the Hack emulator until it halts.
+
+    Args:
+        words (List[int]): The machine code
+        addresses (Dict[str, int]): The addresses of the labels of the program
+        keys (Sequence[int]): The keys to type
+
+    Returns:
+        int: The number of executed instructions
+        str: The hash of the screen after the program halted
+    """
+    cpu = CPU(words)
+    # NOTE: The closures of the functions are replaced in the dispatch table of the CPU
+    dispatch_table = cpu._dispatch_table  # pylint: disable=protected-access
+    typed: Iterator[int] = chain.from_iterable((key, 0) for key in keys)
+    key_pressed = addresses["Keyboard.keyPressed"]
+    read_keyboard = dispatch_table[key_pressed]
+
+    def type_key() -> int:
+        cpu.ram[KBD] = next(typed, 0)
+        return read_keyboard()
+
+    dispatch_table[key_pressed] = type_key
+    dispatch_table[addresses["Sys.halt"]] = make_halt_operation(addresses["Sys.halt"])
+    cycles = cpu.run()
+    return cycles, hashlib.sha256(cpu.ram[SCREEN:KBD].tobytes()).hexdigest()
+
+
+def benchmark(name: str, opt_level: int) -> Tuple[Dict[str, float], str]:
+    """Compile and run a program.
+
+    Args:
+        name (str): The name of the program directory in project 11
+        opt_level (int): The optimization level
+
+    Returns:
+        Dict[str, float]: The number of VM commands, machine words and executed instructions
+            together with the time spent running the program
+        str: The hash of the screen after the program halted
+    """
+    files = program_files(name)
+    asm_code = translate(
+        files,
+        PROJECTS_PATH.joinpath("11", name, f"{name}.asm"),
+        bootstrap=True,
+        # Without the shorter assembly code the programs do not fit in the ROM
+        optimize=True,
+        trampolines=True,
+        opt_level=opt_level,
+    )
+    lines = asm_code.splitlines()
+    words = assemble(lines)
+    addresses = resolve_symbols(parse_instructions(lines)).symbol_table
+    start = time.perf_counter()
+    cycles, screen = run(words, addresses, INPUTS[name])
+    return {
+        "VM commands": count_vm_commands(files, opt_level),
+        "words": len(words),
+        "cycles": cycles,
+        "seconds": time.perf_counter() - start,
+    }, screen
+
+
+def main(programs: Sequence[str]) -> None:
+    """Benchmark the optimization levels on programs.
+
+    Args:
+        programs (Sequence[str]): The names of the program directories in project 11
+
+    Raises:
+        RuntimeError: If the screen of a program differs from the one of -O0
+    """
+    columns: Dict[str, Callable[[float], str]] = {
+        "VM commands": lambda value: f"{value:>13.0f}",
+        "words": lambda value: f"{value:>8.0f}",
+        "cycles": lambda value: f"{value:>12.0f}",
+        "seconds": lambda value: f"{value:>9.2f}",
+    }
+    header = "".join(
+        f"{column:>{len(formatter(0))}}" for column, formatter in columns.items()
+    )
+    print(f"{'program':<10}{'-O':>3}{header}")
+    mismatches: List[str] = []
+    for name in programs:
+        baseline: Dict[str, float] = {}
+        baseline_screen = ""
+        for opt_level in OPTIMIZATION_LEVELS:
+            result, screen = benchmark(name, opt_level)
+            baseline = baseline or result
+            baseline_screen = baseline_screen or screen
+            if screen != baseline_screen:
+                mismatches.append(f"{name} -O{opt_level}")
+            print(
+                f"{name:<10}{opt_level:>3}"
+                + "".join(
+                    formatter(result[column]) for column, formatter in columns.items()
+                )
+                + f"{100 * (result['cycles'] / baseline['cycles'] - 1):>+8.2f} %"
+                + ("" if screen == baseline_screen else "  screen differs from -O0")
+            )
+    if mismatches:
+        raise RuntimeError(
+            f"The screens of {', '.join(mismatches)} differ from the ones of -O0"
+        )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(programs=args.programs)
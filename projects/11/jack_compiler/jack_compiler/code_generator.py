@@ -0,0 +1,561 @@
+"""Module containing the CodeGenerator class."""
+
+from typing import Dict, List, Optional, Tuple
+
+from jack_compiler import KIND
+from jack_compiler.symbol_table import SymbolTable
+from jack_compiler.syntax_tree import (
+    ArrayEntry,
+    BinaryOp,
+    Class,
+    ClassVarDec,
+    DoStatement,
+    Expression,
+    IfStatement,
+    IntegerConstant,
+    KeywordConstant,
+    LetStatement,
+    NodeVisitor,
+    Parameter,
+    ParenthesizedExpression,
+    ReturnStatement,
+    Statement,
+    StringConstant,
+    SubroutineCall,
+    SubroutineDec,
+    UnaryOp,
+    VarDec,
+    VarName,
+    WhileStatement,
+)
+from jack_compiler.vm_writer import VMWriter
+
+# The largest number of doublings and additions replacing a call of Math.multiply
+MAX_MULTIPLY_STEPS = 8
+
+
+def constant_factor(expression: Expression) -> Optional[int]:
+    """Return the value of an integer constant, which may be negated or parenthesized.
+
+    Args:
+        expression (Expression): The expression
+
+    Returns:
+        Optional[int]: The value, or None if the expression is not an integer constant
+    """
+    if isinstance(expression, ParenthesizedExpression):
+        return constant_factor(expression.expression)
+    if isinstance(expression, IntegerConstant):
+        return expression.value
+    if isinstance(expression, UnaryOp) and expression.op == "-":
+        value = constant_factor(expression.operand)
+        if value is not None:
+            return -value
+    return None
+
+
+def multiply_steps(factor: int) -> int:
+    """Return the number of operations multiplying by a constant with doublings and additions.
+
+    Args:
+        factor (int): The constant
+
+    Returns:
+        int: The number of doublings and additions
+    """
+    magnitude = abs(factor)
+    return max(magnitude.bit_length() - 1, 0) + max(bin(magnitude).count("1") - 1, 0)
+
+
+class CodeGenerator(NodeVisitor):  # pylint: disable=too-many-public-methods
+    """Class which generates the VM code of a syntax tree."""
+
+    op_map = {
+        "+": "ADD",
+        "-": "SUB",
+        "&": "AND",
+        "|": "OR",
+        "<": "LT",
+        ">": "GT",
+        "=": "EQ",
+    }
+    unary_op_map = {"-": "NEG", "~": "NOT"}
+
+    def __init__(
+        self,
+        vm_writer: VMWriter,
+        strength_reduction: bool = False,
+        string_pool: bool = False,
+    ) -> None:
+        """Create a new code generator.
+
+        Args:
+            vm_writer (VMWriter): The writer of the VM commands
+            strength_reduction (bool, optional): Whether or not to replace the calls of
+                Math.multiply and Math.divide by constants with stack arithmetic.
+                Defaults to False.
+            string_pool (bool, optional): Whether or not to build every string constant once
+                per class, and share it between the evaluations. Defaults to False.
+        """
+        self._vm_writer = vm_writer
+        self._strength_reduction = strength_reduction
+        # Map from the pooled string constants to the static variables holding them, or None
+        # if the string constants are built on every evaluation
+        self._pooled_strings: Optional[Dict[str, int]] = {} if string_pool else None
+        self._symbol_tables = {"class": SymbolTable(), "subroutine": SymbolTable()}
+        self._class_name = ""
+        self._subroutine: Optional[SubroutineDec] = None
+        # We start on -2 as the first thing the if and while generation is going to do is
+        # to increment these values by 2
+        self._labels = {"while_counter": -2, "if_counter": -2, "string_counter": -1}
+
+    def _lookup(self, name: str) -> Tuple[Optional[KIND], int, str]:
+        """Return the kind, index and type of a variable.
+
+        Args:
+            name (str): Name of the variable
+
+        Returns:
+            Tuple[Optional[KIND], int, str]: The kind, index and type, where the kind is None
+                if the name is not a variable
+        """
+        # Search first in the subroutine table, then in the class table
+        for table in (self._symbol_tables["subroutine"], self._symbol_tables["class"]):
+            kind = table.kind_of(name)
+            if kind is not None:
+                return kind, table.index_of(name), table.type_of(name)
+        return None, 0, ""
+
+    def _variable(self, name: str) -> Tuple[KIND, int]:
+        """Return the kind and index of a variable.
+
+        Args:
+            name (str): Name of the variable
+
+        Raises:
+            RuntimeError: If the variable is not defined
+
+        Returns:
+            Tuple[KIND, int]: The kind and index
+        """
+        kind, index, _ = self._lookup(name)
+        if kind is None:
+            raise RuntimeError(f"Undefined variable {name} in {self._class_name}")
+        return kind, index
+
+    def visit_class(self, node: Class) -> None:
+        """Generate the code of a class.
+
+        Args:
+            node (Class): The class
+        """
+        self._class_name = node.name
+        for class_var_dec in node.class_var_decs:
+            self.visit(class_var_dec)
+        for subroutine_dec in node.subroutine_decs:
+            self.visit(subroutine_dec)
+
+    def visit_class_var_dec(self, node: ClassVarDec) -> None:
+        """Define static or field variables.
+
+        Args:
+            node (ClassVarDec): The declaration
+        """
+        for name in node.names:
+            # Type ignore as mypy doesn't detect that the kind is either STATIC or FIELD
+            self._symbol_tables["class"].define(
+                name=name, identifier_type=node.var_type, kind=node.kind.upper()  # type: ignore
+            )
+
+    def visit_subroutine_dec(self, node: SubroutineDec) -> None:
+        """Generate the code of a method, function or constructor.
+
+        Args:
+            node (SubroutineDec): The subroutine
+        """
+        self._subroutine = node
+        self._symbol_tables["subroutine"] = SymbolTable()
+        if node.subroutine_type == "method":
+            # Populate the symbol table with the implicit `this`
+            self._symbol_tables["subroutine"].define(
+                name="this", identifier_type=self._class_name, kind="ARG"
+            )
+        for parameter in node.parameters:
+            self.visit(parameter)
+        for var_dec in node.var_decs:
+            self.visit(var_dec)
+
+        # As the subroutine table has been populated, we can now write vm statements
+        self._vm_writer.write_function(
+            name=f"{self._class_name}.{node.name}",
+            n_locals=self._symbol_tables["subroutine"].var_count("VAR"),
+        )
+        if node.subroutine_type == "constructor":
+            # Pushes size of object
+            self._vm_writer.write_push(
+                "CONST", self._symbol_tables["class"].var_count("FIELD")
+            )
+            # Allocates object
+            self._vm_writer.write_call("Memory.alloc", 1)
+            # Anchors this at the base address
+            self._vm_writer.write_pop("POINTER", 0)
+        elif node.subroutine_type == "method":
+            # Associate `this` with the object on which the method was called to operate
+            # Push the first argument to the stack
+            self._vm_writer.write_push(segment="ARG", index=0)
+            # Set this to the element first in the stack
+            self._vm_writer.write_pop(segment="POINTER", index=0)
+
+        self._visit_statements(node.statements)
+
+    def visit_parameter(self, node: Parameter) -> None:
+        """Define a parameter.
+
+        Args:
+            node (Parameter): The parameter
+        """
+        self._symbol_tables["subroutine"].define(
+            name=node.name, identifier_type=node.var_type, kind="ARG"
+        )
+
+    def visit_var_dec(self, node: VarDec) -> None:
+        """Define local variables.
+
+        Args:
+            node (VarDec): The declaration
+        """
+        for name in node.names:
+            self._symbol_tables["subroutine"].define(
+                name=name, identifier_type=node.var_type, kind="VAR"
+            )
+
+    def visit_let_statement(self, node: LetStatement) -> None:
+        """Generate the code of a let statement.
+
+        Args:
+            node (LetStatement): The statement
+        """
+        kind, index = self._variable(node.name)
+        if node.subscript is None:
+            self.visit(node.value)
+            # Type ignore as mypy doesn't detect that the VM writer maps the kinds
+            self._vm_writer.write_pop(segment=kind, index=index)  # type: ignore
+            return
+
+        # Push the address of the entry
+        self._vm_writer.write_push(segment=kind, index=index)  # type: ignore
+        self.visit(node.subscript)
+        self._vm_writer.write_arithmetic(command="ADD")
+        self.visit(node.value)
+        # In order not to overwrite the array pointer in case the value is an array entry, we
+        # must use the general solution for array access
+        # Push the value to temp
+        self._vm_writer.write_pop(segment="TEMP", index=0)
+        # Pop the LHS address to the array pointer
+        self._vm_writer.write_pop(segment="POINTER", index=1)
+        # Push the RHS value to the stack
+        self._vm_writer.write_push(segment="TEMP", index=0)
+        # Add the value to the LHS address
+        self._vm_writer.write_pop(segment="THAT", index=0)
+
+    def _visit_statements(self, statements: List[Statement]) -> None:
+        """Generate the code of a sequence of statements.
+
+        Args:
+            statements (List[Statement]): The statements
+        """
+        for statement in statements:
+            self.visit(statement)
+
+    def visit_if_statement(self, node: IfStatement) -> None:
+        """Generate the code of an if statement.
+
+        Args:
+            node (IfStatement): The statement
+        """
+        # One label for the else statements and one for the end
+        self._labels["if_counter"] += 2
+        label = self._labels["if_counter"]
+        self.visit(node.condition)
+        # Negate the expression in order to simplify the vm code
+        self._vm_writer.write_arithmetic(command="NOT")
+        self._vm_writer.write_if(label=f"NOT_IF_L{label}")
+        self._visit_statements(node.statements)
+        if node.else_statements is None:
+            self._vm_writer.write_label(label=f"NOT_IF_L{label}")
+            return
+        self._vm_writer.write_goto(label=f"IF_END_L{label + 1}")
+        self._vm_writer.write_label(label=f"NOT_IF_L{label}")
+        self._visit_statements(node.else_statements)
+        self._vm_writer.write_label(label=f"IF_END_L{label + 1}")
+
+    def visit_while_statement(self, node: WhileStatement) -> None:
+        """Generate the code of a while statement.
+
+        Args:
+            node (WhileStatement): The statement
+        """
+        # One label for the start and one for the end
+        self._labels["while_counter"] += 2
+        label = self._labels["while_counter"]
+        self._vm_writer.write_label(label=f"WHILE_START_L{label}")
+        self.visit(node.condition)
+        # Negate the expression in order to simplify the vm code
+        self._vm_writer.write_arithmetic(command="NOT")
+        self._vm_writer.write_if(label=f"WHILE_END_L{label + 1}")
+        self._visit_statements(node.statements)
+        self._vm_writer.write_goto(label=f"WHILE_START_L{label}")
+        self._vm_writer.write_label(label=f"WHILE_END_L{label + 1}")
+
+    def visit_do_statement(self, node: DoStatement) -> None:
+        """Generate the code of a do statement.
+
+        Args:
+            node (DoStatement): The statement
+        """
+        self.visit(node.call)
+        # Dump the returned value
+        self._vm_writer.write_pop(segment="TEMP", index=0)
+
+    def visit_return_statement(self, node: ReturnStatement) -> None:
+        """Generate the code of a return statement.
+
+        Args:
+            node (ReturnStatement): The statement
+        """
+        if node.value is not None:
+            self.visit(node.value)
+        # Void functions return 0
+        if self._subroutine is not None and self._subroutine.return_type == "void":
+            self._vm_writer.write_push(segment="CONST", index=0)
+        self._vm_writer.write_return()
+
+    def visit_integer_constant(self, node: IntegerConstant) -> None:
+        """Generate the code of an integer constant.
+
+        Args:
+            node (IntegerConstant): The constant
+        """
+        self._vm_writer.write_push(segment="CONST", index=node.value)
+
+    def visit_string_constant(self, node: StringConstant) -> None:
+        """Generate the code of a string constant.
+
+        Args:
+            node (StringConstant): The constant
+        """
+        if self._pooled_strings is not None:
+            self._write_pooled_string(self._pooled_strings, node.value)
+        else:
+            self._write_new_string(node.value)
+
+    def _write_new_string(self, value: str) -> None:
+        """Build a new string object.
+
+        Args:
+            value (str): The characters of the string
+        """
+        # NOTE: The constructor is NOT String.new("string"), but String.new(6)
+        # We need to create a new string object and use appendChar to fill it
+        self._vm_writer.write_push(segment="CONST", index=len(value))
+        self._vm_writer.write_call(name="String.new", n_args=1)
+        for char in value:
+            # NOTE: The character set follows the ASCII mapping, hence we can use ord
+            self._vm_writer.write_push(segment="CONST", index=ord(char))
+            # Two arguments: One for this and one for the character
+            self._vm_writer.write_call(name="String.appendChar", n_args=2)
+
+    def _write_pooled_string(self, pooled_strings: Dict[str, int], value: str) -> None:
+        """Push a string object which is built on the first evaluation only.
+
+        Every distinct string constant of the class is held by a static variable following
+        the static variables of the class.
+        As the RAM starts zeroed, the static variable is 0 until the string has been built.
+
+        Args:
+            pooled_strings (Dict[str, int]): Map from the pooled string constants to the static
+                variables holding them
+            value (str): The characters of the string
+        """
+        index = pooled_strings.setdefault(
+            value,
+            self._symbol_tables["class"].var_count("STATIC") + len(pooled_strings),
+        )
+        self._labels["string_counter"] += 1
+        label = f"STRING_POOLED_L{self._labels['string_counter']}"
+        self._vm_writer.write_push(segment="STATIC", index=index)
+        self._vm_writer.write_if(label=label)
+        self._write_new_string(value)
+        self._vm_writer.write_pop(segment="STATIC", index=index)
+        self._vm_writer.write_label(label=label)
+        self._vm_writer.write_push(segment="STATIC", index=index)
+
+    def visit_keyword_constant(self, node: KeywordConstant) -> None:
+        """Generate the code of a keyword constant.
+
+        Args:
+            node (KeywordConstant): The constant
+        """
+        if node.keyword in ("null", "false"):
+            self._vm_writer.write_push(segment="CONST", index=0)
+        elif node.keyword == "true":
+            self._vm_writer.write_push(segment="CONST", index=1)
+            self._vm_writer.write_arithmetic(command="NEG")
+        elif node.keyword == "this":
+            self._vm_writer.write_push(segment="POINTER", index=0)
+
+    def visit_var_name(self, node: VarName) -> None:
+        """Generate the code of a variable.
+
+        Args:
+            node (VarName): The variable
+        """
+        kind, index = self._variable(node.name)
+        # Type ignore as mypy doesn't detect that the VM writer maps the kinds
+        self._vm_writer.write_push(segment=kind, index=index)  # type: ignore
+
+    def visit_array_entry(self, node: ArrayEntry) -> None:
+        """Generate the code of an array entry.
+
+        Args:
+            node (ArrayEntry): The array entry
+        """
+        kind, index = self._variable(node.name)
+        self._vm_writer.write_push(segment=kind, index=index)  # type: ignore
+        self.visit(node.subscript)
+        # Add [expression] to varName
+        self._vm_writer.write_arithmetic(command="ADD")
+        # Set the address to the array segment pointer
+        self._vm_writer.write_pop(segment="POINTER", index=1)
+        # Obtain the value of the address pointed to by pointer 1
+        self._vm_writer.write_push(segment="THAT", index=0)
+
+    def visit_subroutine_call(self, node: SubroutineCall) -> None:
+        """Generate the code of a subroutine call.
+
+        Args:
+            node (SubroutineCall): The call
+        """
+        n_args = len(node.arguments)
+        if node.receiver is None:
+            # Without a receiver we must be operating on this object, which is pushed first in
+            # the argument list
+            call_name = f"{self._class_name}.{node.name}"
+            n_args += 1
+            self._vm_writer.write_push(segment="POINTER", index=0)
+        else:
+            kind, index, var_type = self._lookup(node.receiver)
+            if kind is None:
+                # The receiver must be a class name
+                call_name = f"{node.receiver}.{node.name}"
+            else:
+                # A method of the variable is called, so the variable must be pushed to the
+                # front of the argument list
+                call_name = f"{var_type}.{node.name}"
+                n_args += 1
+                self._vm_writer.write_push(segment=kind, index=index)  # type: ignore
+        for argument in node.arguments:
+            self.visit(argument)
+        self._vm_writer.write_call(name=call_name, n_args=n_args)
+
+    def visit_unary_op(self, node: UnaryOp) -> None:
+        """Generate the code of a unary operation.
+
+        Args:
+            node (UnaryOp): The operation
+        """
+        self.visit(node.operand)
+        # Type ignore as mypy doesn't detect that the op map contains arithmetic commands
+        self._vm_writer.write_arithmetic(command=self.unary_op_map[node.op])  # type: ignore
+
+    def visit_parenthesized_expression(self, node: ParenthesizedExpression) -> None:
+        """Generate the code of an expression enclosed in parentheses.
+
+        Args:
+            node (ParenthesizedExpression): The expression
+        """
+        self.visit(node.expression)
+
+    def visit_binary_op(self, node: BinaryOp) -> None:
+        """Generate the code of a binary operation.
+
+        As the stack is postfixed, the operation follows its operands.
+
+        Args:
+            node (BinaryOp): The operation
+        """
+        if self._strength_reduction and self._reduce_strength(node):
+            return
+        self.visit(node.left)
+        self.visit(node.right)
+        if node.op == "*":
+            self._vm_writer.write_call(name="Math.multiply", n_args=2)
+        elif node.op == "/":
+            self._vm_writer.write_call(name="Math.divide", n_args=2)
+        else:
+            self._vm_writer.write_arithmetic(command=self.op_map[node.op])  # type: ignore
+
+    def _reduce_strength(self, node: BinaryOp) -> bool:
+        """Generate the code of a multiplication or division by a constant without calls.
+
+        Multiplications by constants of at most MAX_MULTIPLY_STEPS doublings and additions
+        are written as stack arithmetic, and so are divisions by 1 and -1.
+        The latter differ from Math.divide only for -32768, which it does not divide.
+
+        Args:
+            node (BinaryOp): The operation
+
+        Returns:
+            bool: Whether the code of the operation was generated
+        """
+        right = constant_factor(node.right)
+        if node.op == "*":
+            left = constant_factor(node.left)
+            if right is not None and multiply_steps(right) <= MAX_MULTIPLY_STEPS:
+                # The constant has no side effects, so the operands may be swapped
+                operand, factor = node.left, right
+            elif left is not None and multiply_steps(left) <= MAX_MULTIPLY_STEPS:
+                operand, factor = node.right, left
+            else:
+                return False
+            self.visit(operand)
+            self._write_multiply(factor)
+            return True
+        if node.op == "/" and right in (1, -1):
+            self.visit(node.left)
+            if right == -1:
+                self._vm_writer.write_arithmetic(command="NEG")
+            return True
+        return False
+
+    def _write_multiply(self, factor: int) -> None:
+        """Multiply the top of the stack by a constant.
+
+        The product is doubled for every bit of the constant following the leading one, and
+        the operand is added for the set bits.
+        The operand is kept in temp 1 and temp 0 is used to duplicate the product, neither of
+        which is in use while an expression is evaluated.
+
+        Args:
+            factor (int): The constant
+        """
+        magnitude = abs(factor)
+        if magnitude == 0:
+            # The operand is only evaluated for its side effects
+            self._vm_writer.write_pop(segment="TEMP", index=0)
+            self._vm_writer.write_push(segment="CONST", index=0)
+            return
+        bits = bin(magnitude)[3:]
+        if "1" in bits:
+            self._vm_writer.write_pop(segment="TEMP", index=1)
+            self._vm_writer.write_push(segment="TEMP", index=1)
+        for bit in bits:
+            self._vm_writer.write_pop(segment="TEMP", index=0)
+            self._vm_writer.write_push(segment="TEMP", index=0)
+            self._vm_writer.write_push(segment="TEMP", index=0)
+            self._vm_writer.write_arithmetic(command="ADD")
+            if bit == "1":
+                self._vm_writer.write_push(segment="TEMP", index=1)
+                self._vm_writer.write_arithmetic(command="ADD")
+        if factor < 0:
+            self._vm_writer.write_arithmetic(command="NEG")
@@ -1,46 +1,48 @@
 """Module containing the CompilationEngine class."""
-# pylint: disable=too-many-lines
 
-from io import TextIOWrapper
 from pathlib import Path
-from typing import List, Literal, Optional, Tuple, TypedDict, Union, cast, get_args
+from typing import Callable, Dict, List, Literal, Optional, Sequence, TextIO, get_args
 
-from jack_compiler import KIND
+from jack_compiler.code_generator import CodeGenerator
 from jack_compiler.jack_tokenizer import JackTokenizer
-from jack_compiler.symbol_table import SymbolTable
-from jack_compiler.vm_writer import VMWriter
-
-TerminalElement = Literal[
-    "keyword", "symbol", "integerConstant", "stringConstant", "identifier"
-]
-
-NonTerminalElement = Literal[
-    "class",
-    "classVarDec",
-    "subroutineDec",
-    "parameterList",
-    "subroutineBody",
-    "varDec",
-    "statements",
-    "letStatement",
-    "ifStatement",
-    "whileStatement",
-    "doStatement",
-    "returnStatement",
-    "expression",
-    "term",
-    "expressionList",
-]
+from jack_compiler.syntax_tree import (
+    ArrayEntry,
+    BinaryOp,
+    Class,
+    ClassVarDec,
+    DoStatement,
+    Expression,
+    IfStatement,
+    IntegerConstant,
+    KeywordConstant,
+    LetStatement,
+    Parameter,
+    ParenthesizedExpression,
+    ReturnStatement,
+    Statement,
+    StringConstant,
+    SubroutineCall,
+    SubroutineDec,
+    UnaryOp,
+    VarDec,
+    VarName,
+    WhileStatement,
+)
+from jack_compiler.vm_writer import Command, VMWriter
+from jack_compiler.xml_writer import XMLWriter
 
 Op = Literal["+", "-", "*", "/", "&", "|", "<", ">", "="]
-OpName = Literal[
-    "ADD", "SUB", "MUL", "DIV", "AND", "OR", "LT", "GT", "EQ", "NEG", "NOT"
-]
 
+# A pass transforms the syntax tree between the parsing and the code generation
+Pass = Callable[[Class], Class]
 
-class CompilationEngine:
+
+class CompilationEngine:  # pylint: disable=too-many-instance-attributes
     """Class which generates the compiler's output.
 
+    The class is parsed to a syntax tree, from which the parse tree XML is written.
+    The passes are then applied to the tree, before the VM code is generated from it.
+
     Note:
         There is no operator precedence of expressions.
         Expressions are simply compiled from left to the right.
@@ -53,93 +55,79 @@ class CompilationEngine:
         "INT_CONST": {"text": "integerConstant", "function_name": "int_val"},
         "STRING_CONST": {"text": "stringConstant", "function_name": "string_val"},
     }
-    segment_map = {"STATIC": "STATIC", "FIELD": "THIS", "ARG": "ARG", "VAR": "LOCAL"}
-    op_map = {
-        "+": "ADD",
-        "-": "SUB",
-        "*": "MUL",
-        "/": "DIV",
-        "&": "AND",
-        "|": "OR",
-        "<": "LT",
-        ">": "GT",
-        "=": "EQ",
-        "NEG": "NEG",
-        "~": "NOT",
-    }
 
-    def __init__(self, jack_tokenizer: JackTokenizer, out_file: TextIOWrapper) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        jack_tokenizer: JackTokenizer,
+        out_file: Optional[TextIO] = None,
+        vm_file: Optional[TextIO] = None,
+        vm_sink: Optional[Callable[[Command], None]] = None,
+        passes: Sequence[Pass] = (),
+        strength_reduction: bool = False,
+        string_pool: bool = False,
+    ) -> None:
         """Create a new compilation engine with the given input and output.
 
         Args:
             jack_tokenizer (JackTokenizer): The tokenizer
-            out_file (TextIOWrapper): Stream to the output file
+            out_file (Optional[TextIO], optional): Stream to the .xml output file.
+                If None, no XML is formatted. Defaults to None.
+            vm_file (Optional[TextIO], optional): Stream to write the VM code to.
+                If None and no vm_sink is given, the .vm file next to the .xml file is opened,
+                and must be closed with close. Defaults to None.
+            vm_sink (Optional[Callable[[Command], None]], optional): Function consuming the VM
+                commands as they are compiled. Defaults to None.
+            passes (Sequence[Pass], optional): The passes to apply in order to the syntax tree
+                before the code generation. Defaults to ().
+            strength_reduction (bool, optional): Whether or not to replace the calls of
+                Math.multiply and Math.divide by constants with stack arithmetic.
+                Defaults to False.
+            string_pool (bool, optional): Whether or not to build every string constant once
+                per class, and share it between the evaluations. Defaults to False.
 
         Raises:
+            ValueError: If there is neither a .xml file, a VM stream nor a VM sink
             RuntimeError: If the file does not contain any tokens
         """
         self._jack_tokenizer = jack_tokenizer
         self._out_file = out_file
-
-        self._symbol_tables = {"class": SymbolTable(), "subroutine": SymbolTable()}
-        context_type = TypedDict(
-            "context_type",
-            {
-                "class_name": str,
-                "subroutine_type": str,
-                "subroutine_name": str,
-                "return_type": str,
-                "assign_to": str,
-                "do_statement": bool,
-                "current_statement": List[str],
-                "expression_list_count": List[int],
-                "xml_indent": int,
-            },
-        )
-        self._context_details: context_type = {
-            "class_name": "",
-            "subroutine_type": "",
-            "subroutine_name": "",
-            "return_type": "",
-            "assign_to": "",
-            "do_statement": False,
-            "current_statement": list(),
-            "expression_list_count": list(),
-            "xml_indent": 0,
-        }
-        # We start on -2 as the first thing the if and while compiler is going to do is
-        # to increment these values by 2
-        label_type = TypedDict(
-            "label_type",
-            {
-                "while_counter": int,
-                "if_counter": int,
-                "while": List[int],
-                "if": List[int],
-            },
-        )
-        self._labels: label_type = {
-            "while_counter": -2,
-            "if_counter": -2,
-            "while": list(),
-            "if": list(),
-        }
+        self._passes = passes
+        self._strength_reduction = strength_reduction
+        self._string_pool = string_pool
 
         self.token = {"type": "", "token": ""}
 
-        self._vm_writer = VMWriter(Path(out_file.name).with_suffix(".vm").open("w"))
+        # The .vm file opened by the engine, which is closed by close
+        self._opened_vm_file: Optional[TextIO] = None
+        if vm_file is None and vm_sink is None:
+            if out_file is None:
+                raise ValueError(
+                    "Either an out_file, a vm_file or a vm_sink must be given"
+                )
+            vm_file = Path(out_file.name).with_suffix(".vm").open("w")
+            self._opened_vm_file = vm_file
+        self._vm_writer = VMWriter(vm_file, sink=vm_sink)
 
         if not jack_tokenizer.has_more_tokens():
             raise RuntimeError(
                 f"Running tokenizer on empty file {jack_tokenizer.file.name}"
             )
-        # Above we use the file to check whether we have more tokens
-        # This alters the file pointer of the file
-        # Hence we must reset the pointer:
-        self._jack_tokenizer.reset()
 
-    def _advance(self) -> None:
-        """Advance the tokenizer."""
+    def close(self) -> None:
+        """Close the .vm file if it was opened by the engine.
+
+        The streams given by the caller are left open.
+        """
+        if self._opened_vm_file is not None:
+            self._opened_vm_file.close()
+
+    def _advance(self) -> str:
+        """Advance the tokenizer.
+
+        Returns:
+            str: The new current token
+        """
+        assert self._jack_tokenizer.has_more_tokens()
         self._jack_tokenizer.advance()
 
         token_type = self._jack_tokenizer.token_type()
@@ -150,1032 +138,329 @@ class CompilationEngine:
         self.token["type"] = self.token_map[token_type]["text"]
         if token_type == "KEYWORD":
             self.token["token"] = self.token["token"].lower()
+        return self.token["token"]
 
     def compile_tokens_only(self) -> None:
         """Only compile tokens."""
+        if self._out_file is None:
+            return
+        xml_writer = XMLWriter(self._out_file)
         while self._jack_tokenizer.has_more_tokens():
             self._advance()
-            # Type ignore as mypy doesn't detect that we are ensuring the
-            # correct input type for token_type
-            self._write_token(
-                token_type=self.token["type"], token=self.token["token"]  # type: ignore
-            )
-
-    def _write_token(
-        self, token_type: TerminalElement, token: Union[str, int], definition=False
-    ) -> None:
-        """Write the token or grammar wrapped by the xml type to the out_file.
-
-        Args:
-            token_type (TERMINAL_ELEMENT): The type to use as a tag
-            token (Union[str, int]): The body inside the tag.
-                <, >, ", and & are outputted as &lt;, &gt;, &quot;, and &amp;
-            definition (bool): Whether an identifier is being defined or used
-        """
-        token_str = str(token)
-        # If the type is identifier, we need to distinguish between
-        # 1. The category (var, arg, static, field, class, subroutine)
-        # 2. If category not in (class, subroutine): The running index
-        # 3. If the identifier is being defined or used
-        if token_type == "identifier":
-            # First we figure out where our symbol is (if in any)
-            # Search first in the subroutine table
-            kind = self._symbol_tables["subroutine"].kind_of(token_str)
-            table = self._symbol_tables["subroutine"]
-            if kind is None:
-                # Search then in the class table
-                kind = self._symbol_tables["class"].kind_of(token_str)
-                table = self._symbol_tables["class"]
-            if kind is None:
-                # We must be dealing with either a class or a subroutine
-                # If it is a subroutine name it must be followed by a "("
-                class_or_subroutine = (
-                    "subroutine"
-                    if self._jack_tokenizer.look_ahead() == "("
-                    else "class"
-                )
-                cur_token_type = (
-                    f"{class_or_subroutine}_{'definition' if definition else 'usage'}"
+            if self.token["type"] == "identifier":
+                # Without declarations an identifier followed by ( must be a subroutine
+                xml_writer.write_identifier(
+                    self.token["token"],
+                    subroutine=self._jack_tokenizer.look_ahead() == "(",
                 )
             else:
-                index = table.index_of(token_str)
-                cur_token_type = (
-                    f"{kind.lower()}_{index}_{'definition' if definition else 'usage'}"
+                # Type ignore as mypy doesn't detect that we are ensuring the
+                # correct input type for token_type
+                xml_writer.write_terminal(
+                    self.token["type"], str(self.token["token"])  # type: ignore
                 )
-        else:
-            cur_token_type = token_type
-        token = (
-            token_str.replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-            .replace('"', "&quot;")
-        )
-        self._out_file.write(
-            f"{' '*self._context_details['xml_indent']}"
-            f"<{cur_token_type}> {token} </{cur_token_type}>\n"
-        )
 
-    def _open_grammar(self, grammar_type: NonTerminalElement) -> None:
-        """Open a grammar body.
-
-        Args:
-            grammar_type (NON_TERMINAL_ELEMENT): The grammar tag
-        """
-        self._out_file.write(
-            f"{' '*self._context_details['xml_indent']}<{grammar_type}>\n"
-        )
-        # Increase the current indentation
-        self._context_details["xml_indent"] += 2
+    def compile_class(self) -> None:
+        """Compile a complete class."""
+        syntax_tree = self.parse_class()
+        if self._out_file is not None:
+            XMLWriter(self._out_file).visit(syntax_tree)
+        for transform in self._passes:
+            syntax_tree = transform(syntax_tree)
+        CodeGenerator(
+            self._vm_writer,
+            strength_reduction=self._strength_reduction,
+            string_pool=self._string_pool,
+        ).visit(syntax_tree)
+
+    def parse_class(self) -> Class:
+        """Parse a complete class.
 
-    def _close_grammar(self, grammar_type: NonTerminalElement) -> None:
-        """Close the grammar body.
+        Raises:
+            RuntimeError: If the file does not start with a class
 
-        Args:
-            grammar_type (NON_TERMINAL_ELEMENT): The grammar tag
+        Returns:
+            Class: The syntax tree of the class
         """
-        # Decrease the current indentation
-        self._context_details["xml_indent"] = max(
-            0, self._context_details["xml_indent"] - 2
-        )
-        self._out_file.write(
-            f"{' '*self._context_details['xml_indent']}</{grammar_type}>\n"
-        )
-
-    def compile_class(self) -> None:
-        """Compile a complete class."""
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        if self.token["token"] != "class":
+        if self._advance() != "class":
             raise RuntimeError(
                 f"{self._jack_tokenizer.file.name} did not start with a definition of 'class'"
             )
-        # Write class
-        self._open_grammar("class")
-        # Type ignore as mypy doesn't detect that we are ensuring the
-        # correct input type for token_type
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # Class name
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        # This is a definition
-        self._write_token(self.token["type"], self.token["token"], definition=True)  # type: ignore
-        # Set the class name
-        self._context_details["class_name"] = self.token["token"]
-
+        name = self._advance()
         # The { symbol
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
 
         # Zero or more classVarDec
-        next_token = self._jack_tokenizer.look_ahead()
-        while next_token in ("static", "field"):
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_class_var_dec()
-            next_token = self._jack_tokenizer.look_ahead()
+        class_var_decs: List[ClassVarDec] = []
+        while self._jack_tokenizer.look_ahead() in ("static", "field"):
+            class_var_decs.append(self._parse_class_var_dec())
 
         # Zero or more subroutineDec
-        next_token = self._jack_tokenizer.look_ahead()
-        while next_token in ("constructor", "function", "method"):
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_subroutine_dec()
-            next_token = self._jack_tokenizer.look_ahead()
+        subroutine_decs: List[SubroutineDec] = []
+        while self._jack_tokenizer.look_ahead() in (
+            "constructor",
+            "function",
+            "method",
+        ):
+            subroutine_decs.append(self._parse_subroutine_dec())
 
         # The } symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        self._close_grammar("class")
-
-    def compile_class_var_dec(self) -> None:
-        """Compile a static variable declaration or a field variable declaration."""
-        self._open_grammar("classVarDec")
-
-        # static | field
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        kind = self.token["token"].upper()
-        if kind not in get_args(KIND):
-            raise RuntimeError(f"Unknown kind: {kind}, must be one of {KIND}")
-
-        # type
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        # We may be dealing with a class, which in this case is being used
-        self._write_token(self.token["type"], self.token["token"], definition=False)  # type: ignore
-        identifier_type = self.token["token"]
-
-        # varName
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        # Here the variables are being defined
-        # Add to the class table before writing
-        # mypy seem unable to detect that we are checking for the correct type
-        self._symbol_tables["class"].define(
-            name=self.token["token"], identifier_type=identifier_type, kind=kind  # type: ignore
-        )
-        self._write_token(self.token["type"], self.token["token"], definition=True)  # type: ignore
-
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
+        return Class(name, class_var_decs, subroutine_decs)
 
-        # (, varName)*
-        while self.token["token"] == ",":
-            # The , symbol
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
+    def _parse_names(self) -> List[str]:
+        """Parse varName (, varName)* ;.
 
-            # varName
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            # Here the variables are being defined
-            # Add to the class table before writing
-            # mypy seem unable to detect that we are checking for the correct type
-            self._symbol_tables["class"].define(
-                name=self.token["token"], identifier_type=identifier_type, kind=kind  # type: ignore
-            )
-            self._write_token(
-                self.token["type"], self.token["token"], definition=True  # type: ignore
-            )
-
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
+        Returns:
+            List[str]: The names
+        """
+        names = [self._advance()]
+        # The , and ; symbols
+        while self._advance() == ",":
+            names.append(self._advance())
+        return names
 
-        # The ; symbol
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        self._close_grammar("classVarDec")
-
-    def compile_subroutine_dec(self) -> None:
-        """Compile a complete method, function or constructor."""
-        self._open_grammar("subroutineDec")
-
-        # constructor | function | method
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        self._context_details["subroutine_type"] = self.token["token"]
-        if self._context_details["subroutine_type"] == "method":
-            # Populate the symbol table with the implicit `this`
-            self._symbol_tables["subroutine"].define(
-                name="this",
-                identifier_type=self._context_details["class_name"],
-                kind="ARG",
-            )
+    def _parse_class_var_dec(self) -> ClassVarDec:
+        """Parse a static variable declaration or a field variable declaration.
 
-        # void | type
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        self._context_details["return_type"] = self.token["token"]
+        Returns:
+            ClassVarDec: The declaration
+        """
+        kind = self._advance()
+        var_type = self._advance()
+        return ClassVarDec(kind, var_type, self._parse_names())
 
-        # subroutineName
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        # We are here defining the subroutine
-        self._write_token(self.token["type"], self.token["token"], definition=True)  # type: ignore
-        self._context_details["subroutine_name"] = self.token["token"]
+    def _parse_subroutine_dec(self) -> SubroutineDec:
+        """Parse a complete method, function or constructor.
 
+        Returns:
+            SubroutineDec: The subroutine
+        """
+        subroutine_type = self._advance()
+        return_type = self._advance()
+        name = self._advance()
         # The ( symbol
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
 
         # parameterList
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token != ")":
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_parameter_list()
-        else:
-            self._open_grammar("parameterList")
-            self._close_grammar("parameterList")
-
-        # The ) symbol
-        assert self._jack_tokenizer.has_more_tokens()
+        parameters: List[Parameter] = []
+        if self._jack_tokenizer.look_ahead() != ")":
+            parameters.append(Parameter(self._advance(), self._advance()))
+            while self._jack_tokenizer.look_ahead() == ",":
+                self._advance()
+                parameters.append(Parameter(self._advance(), self._advance()))
+        # The ) and { symbols
         self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # subRoutine body
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self.compile_subroutine_body()
-
-        self._close_grammar("subroutineDec")
-
-        # Reset the tables["subroutine"]
-        self._symbol_tables["subroutine"] = SymbolTable()
-
-    def compile_parameter_list(self) -> None:
-        """Compile a (possibly empty) parameter list.
-
-        Does not handle the enclosing "()"
-        """
-        self._open_grammar("parameterList")
-        kind: KIND = "ARG"
-        cast(KIND, kind)
-
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token != ")":
-            # Add the implicit `this` parameter if present in the subroutine table
-            if self._symbol_tables["subroutine"].kind_of("this") is not None:
-                self._write_token("identifier", "myClass", definition=False)
-                self._write_token("identifier", "this", definition=True)
-                self._write_token("symbol", ",")
-
-            # type
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-            identifier_type = self.token["token"]
-
-            # varName
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            # Add to the subroutine table before writing
-            self._symbol_tables["subroutine"].define(
-                name=self.token["token"], identifier_type=identifier_type, kind=kind
-            )
-            # Here the variables are being defined
-            self._write_token(
-                self.token["type"], self.token["token"], definition=True  # type: ignore
-            )
-
-            next_token = self._jack_tokenizer.look_ahead()
-            while next_token == ",":
-                # ,
-                assert self._jack_tokenizer.has_more_tokens()
-                self._advance()
-                self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-                # type
-                assert self._jack_tokenizer.has_more_tokens()
-                self._advance()
-                self._write_token(self.token["type"], self.token["token"])  # type: ignore
-                identifier_type = self.token["token"]
-
-                # varName
-                assert self._jack_tokenizer.has_more_tokens()
-                self._advance()
-                # Here the variables are being defined
-                # Add to the subroutine table before writing
-                self._symbol_tables["subroutine"].define(
-                    name=self.token["token"], identifier_type=identifier_type, kind=kind
-                )
-                self._write_token(
-                    self.token["type"],  # type: ignore
-                    self.token["token"],
-                    definition=True,
-                )
-
-                next_token = self._jack_tokenizer.look_ahead()
-
-        self._close_grammar("parameterList")
-
-    def compile_subroutine_body(self) -> None:
-        """Compile a subroutine's body."""
-        self._open_grammar("subroutineBody")
-
-        # The { symbol
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
 
         # varDec
-        next_token = self._jack_tokenizer.look_ahead()
-        while next_token == "var":
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_var_dec()
-            next_token = self._jack_tokenizer.look_ahead()
-
-        # As the subroutine table has been populated, we can now write vm statements
-        self._vm_writer.write_function(
-            name=f"{self._context_details['class_name']}."
-            f"{self._context_details['subroutine_name']}",
-            n_locals=self._symbol_tables["subroutine"].var_count("VAR"),
-        )
-
-        # If we are dealing with the constructor
-        if self._context_details["subroutine_type"] == "constructor":
-            # Pushes size of object
-            self._vm_writer.write_push(
-                "CONST", self._symbol_tables["class"].var_count("FIELD")
-            )
-            # Allocates object
-            self._vm_writer.write_call("Memory.alloc", 1)
-            # Anchors this at the base address
-            self._vm_writer.write_pop("POINTER", 0)
-        # If we are dealing with a method
-        if self._context_details["subroutine_type"] == "method":
-            # Associate `this` with the object on which the method was called to operate
-            # Push the first argument to the stack
-            self._vm_writer.write_push(segment="ARG", index=0)
-            # Set this to the element first in the stack
-            self._vm_writer.write_pop(segment="POINTER", index=0)
-
-        # statements
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token != "}":
-            assert self._jack_tokenizer.has_more_tokens()
+        var_decs: List[VarDec] = []
+        while self._jack_tokenizer.look_ahead() == "var":
             self._advance()
-            self.compile_statements()
+            var_type = self._advance()
+            var_decs.append(VarDec(var_type, self._parse_names()))
 
+        statements = self._parse_statements()
         # The } symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        self._close_grammar("subroutineBody")
-
-    def compile_var_dec(self) -> None:
-        """Compile a var declaration."""
-        self._open_grammar("varDec")
-        kind: KIND = "VAR"
-
-        # var
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # type
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        identifier_type = self.token["token"]
-
-        # varName
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        # Here the tokens are being defined
-        # Add to the subroutine table before writing
-        self._symbol_tables["subroutine"].define(
-            name=self.token["token"], identifier_type=identifier_type, kind=kind
+        return SubroutineDec(
+            subroutine_type, return_type, name, parameters, var_decs, statements
         )
-        self._write_token(self.token["type"], self.token["token"], definition=True)  # type: ignore
-
-        # (, varName)*
-        next_token = self._jack_tokenizer.look_ahead()
-        while next_token == ",":
-            # The , symbol
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-            # varName
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            # Here the tokens are being defined
-            # Add to the subroutine table before writing
-            self._symbol_tables["subroutine"].define(
-                name=self.token["token"], identifier_type=identifier_type, kind=kind
-            )
-            self._write_token(
-                self.token["type"],  # type: ignore
-                self.token["token"],
-                definition=True,
-            )
-
-            next_token = self._jack_tokenizer.look_ahead()
 
-        # The symbol ;
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        self._close_grammar("varDec")
-
-    def compile_statements(self) -> None:
-        """Compile a sequence of statements.
+    def _parse_statements(self) -> List[Statement]:
+        """Parse a sequence of statements.
 
         Does not handle the enclosing "{}"
-        """
-        self._open_grammar("statements")
-
-        while self.token["token"] in ("let", "if", "while", "do", "return"):
-            if self.token["token"] == "let":
-                self.compile_let()
-            elif self.token["token"] == "if":
-                self.compile_if()
-            elif self.token["token"] == "while":
-                self.compile_while()
-            elif self.token["token"] == "do":
-                self.compile_do()
-            elif self.token["token"] == "return":
-                self.compile_return()
-            next_token = self._jack_tokenizer.look_ahead()
-            if next_token in ("let", "if", "while", "do", "return"):
-                assert self._jack_tokenizer.has_more_tokens()
-                self._advance()
-
-        self._close_grammar("statements")
 
-    def compile_let(self) -> None:
-        """Compile a `let` statement."""
-        self._open_grammar("letStatement")
-        # If we have let arr[exp] we should save the RHS value to temp
-        # to prevent overwriting of pointer 1
-        entered_array_lhs = False
+        Returns:
+            List[Statement]: The statements
+        """
+        parsers: Dict[str, Callable[[], Statement]] = {
+            "let": self._parse_let,
+            "if": self._parse_if,
+            "while": self._parse_while,
+            "do": self._parse_do,
+            "return": self._parse_return,
+        }
+        statements: List[Statement] = []
+        while self._jack_tokenizer.look_ahead() in parsers:
+            statements.append(parsers[self._advance()]())
+        return statements
 
-        # let
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
+    def _parse_body(self) -> List[Statement]:
+        """Parse '{statements}'.
 
-        # varName
-        assert self._jack_tokenizer.has_more_tokens()
+        Returns:
+            List[Statement]: The statements
+        """
+        # The { symbol
         self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        # Get the address, table and segment we want to pop to
-        self._context_details["assign_to"] = self.token["token"]
-        table, segment = self._get_table_segment(self._context_details["assign_to"])
-
-        # [expression]
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token == "[":
-            entered_array_lhs = True
-
-            # Push the varName
-            self._vm_writer.write_push(
-                segment=segment,  # type: ignore
-                index=table.index_of(self._context_details["assign_to"]),
-            )
+        statements = self._parse_statements()
+        # The } symbol
+        self._advance()
+        return statements
 
-            # The symbol [
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
+    def _parse_let(self) -> LetStatement:
+        """Parse a `let` statement.
 
-            # expression
-            assert self._jack_tokenizer.has_more_tokens()
+        Returns:
+            LetStatement: The statement
+        """
+        name = self._advance()
+        subscript = None
+        if self._jack_tokenizer.look_ahead() == "[":
             self._advance()
-            self.compile_expression()
-
-            # The symbol ]
-            assert self._jack_tokenizer.has_more_tokens()
+            subscript = self._parse_expression()
+            # The ] symbol
             self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-            # Add in order to get the appropriate address
-            self._vm_writer.write_arithmetic(command="ADD")
-
-        # The symbol =
-        assert self._jack_tokenizer.has_more_tokens()
+        # The = symbol
         self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # expression
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self.compile_expression()
-
+        value = self._parse_expression()
         # The ; symbol
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        if entered_array_lhs:
-            # In order not to overwrite the array pointer we must use the
-            # general solution for array access
-            # Push the value to temp
-            self._vm_writer.write_pop(segment="TEMP", index=0)
-            # Pop the LHS address to the array pointer
-            self._vm_writer.write_pop(segment="POINTER", index=1)
-            # Push the RHS value to the stack
-            self._vm_writer.write_push(segment="TEMP", index=0)
-            # Add the value to the LHS address
-            self._vm_writer.write_pop(segment="THAT", index=0)
-        else:
-            # We are dealing with a normal variable
-            # Write the pop (assign) command
-            # mypy doesn't recognize the segment_map
-            self._vm_writer.write_pop(
-                segment=self.segment_map[segment],  # type: ignore
-                index=table.index_of(self._context_details["assign_to"]),
-            )
+        return LetStatement(name, subscript, value)
 
-        self._close_grammar("letStatement")
+    def _parse_condition(self) -> Expression:
+        """Parse '('expression')'.
 
-    def _write_expression_body(self) -> None:
-        """Write '('expression')''{statements}'."""
+        Returns:
+            Expression: The expression
+        """
         # The ( symbol
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # expression
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self.compile_expression()
-
+        condition = self._parse_expression()
         # The ) symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        if self._context_details["current_statement"][-1] == "while_statement":
-            # Negate the expression in order to simplify the vm code
-            self._vm_writer.write_arithmetic(command="NOT")
-            # NOTE: We use the list instead of the counter
-            self._vm_writer.write_if(label=f"WHILE_END_L{self._labels['while'][-1]+1}")
-        elif self._context_details["current_statement"][-1] == "if_statement":
-            # Negate the expression in order to simplify the vm code
-            self._vm_writer.write_arithmetic(command="NOT")
-            # NOTE: We use the list instead of the counter
-            self._vm_writer.write_if(label=f"NOT_IF_L{self._labels['if'][-1]}")
-
-        # '{statements}'
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self._write_body()
+        return condition
 
-    def _write_body(self) -> None:
-        """Write '{statements}'."""
-        # The { symbol
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
+    def _parse_if(self) -> IfStatement:
+        """Parse an `if` statement, possibly with a trailing else clause.
 
-        # statements
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token != "}":
-            assert self._jack_tokenizer.has_more_tokens()
+        Returns:
+            IfStatement: The statement
+        """
+        condition = self._parse_condition()
+        statements = self._parse_body()
+        else_statements = None
+        if self._jack_tokenizer.look_ahead() == "else":
             self._advance()
-            self.compile_statements()
-        else:
-            self._open_grammar("statements")
-            self._close_grammar("statements")
+            else_statements = self._parse_body()
+        return IfStatement(condition, statements, else_statements)
 
-        # The } symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-    def compile_if(self) -> None:
-        """Compile an `if` statement, possibly with a trailing else clause."""
-        self._open_grammar("ifStatement")
+    def _parse_while(self) -> WhileStatement:
+        """Parse a `while` statement.
 
-        # As we can have nested statements we need to have a structure to account for this
-        # We will to this by appending and popping a list
-        # We start by add 2 to the counter
-        # (one for an if statement, one for a potential else statement)
-        self._labels["if_counter"] += 2
-        self._labels["if"].append(self._labels["if_counter"])
-        self._context_details["current_statement"].append("if_statement")
+        Returns:
+            WhileStatement: The statement
+        """
+        condition = self._parse_condition()
+        return WhileStatement(condition, self._parse_body())
 
-        # if
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
+    def _parse_do(self) -> DoStatement:
+        """Parse a `do` statement.
 
-        # '('expression')''{statements}'
-        assert self._jack_tokenizer.has_more_tokens()
+        Returns:
+            DoStatement: The statement
+        """
+        call = self._parse_subroutine_call(self._advance())
+        # The ; symbol
         self._advance()
-        self._write_expression_body()
-
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token == "else":
-            # Add the goto L2 and label L1 before compiling the statements
-            self._vm_writer.write_goto(label=f"IF_END_L{self._labels['if'][-1] + 1}")
-            self._vm_writer.write_label(label=f"NOT_IF_L{self._labels['if'][-1]}")
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-            # '{statements}'
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_body()
-
-            # Add the L2 label
-            self._vm_writer.write_label(label=f"IF_END_L{self._labels['if'][-1] + 1}")
-        else:
-            self._vm_writer.write_label(label=f"NOT_IF_L{self._labels['if'][-1]}")
-
-        # Pop the list
-        self._labels["if"].pop()
-        self._context_details["current_statement"].pop()
-        self._close_grammar("ifStatement")
+        return DoStatement(call)
 
-    def compile_while(self) -> None:
-        """Compile a `while` statement."""
-        self._open_grammar("whileStatement")
-        self._context_details["current_statement"].append("while_statement")
+    def _parse_return(self) -> ReturnStatement:
+        """Parse a `return` statement.
 
-        # As we can have nested statements we need to have a structure to account for this
-        # We will to this by appending and popping a list
-        # We start by add 2 to the counter
-        # (one for the start, and one for the end)
-        self._labels["while_counter"] += 2
-        self._labels["while"].append(self._labels["while_counter"])
-
-        # while
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # Add label L1
-        self._vm_writer.write_label(label=f"WHILE_START_L{self._labels['while'][-1]}")
-
-        # '('expression')''{statements}'
-        assert self._jack_tokenizer.has_more_tokens()
+        Returns:
+            ReturnStatement: The statement
+        """
+        value = None
+        if self._jack_tokenizer.look_ahead() != ";":
+            value = self._parse_expression()
+        # The ; symbol
         self._advance()
-        self._write_expression_body()
-
-        # goto L1, label L2
-        self._vm_writer.write_goto(label=f"WHILE_START_L{self._labels['while'][-1]}")
-        self._vm_writer.write_label(label=f"WHILE_END_L{self._labels['while'][-1] + 1}")
-
-        # Pop the lists
-        self._labels["while"].pop()
-        self._context_details["current_statement"].pop()
-        self._close_grammar("whileStatement")
-
-    def _write_subroutine_call(self):
-        """Write the subroutine call."""
-        # subroutineName | varName | className
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        token = self.token["token"]
-        is_method = False
-
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token == ".":
-            # The symbol .
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
+        return ReturnStatement(value)
 
-            # subroutineName
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-            subroutine_name = self.token["token"]
-
-            # We here check if the token is a variable name
-            table, segment = self._get_table_segment(token)
-            if segment is not None:
-                call_name = f"{table.type_of(token)}.{subroutine_name}"
-                # Since we have found the variable in one of the tables,
-                # we know that it must be a method we are calling
-                is_method = True
-                # We must push the object we are working on to the front of the argument list
-                self._vm_writer.write_push(segment=segment, index=table.index_of(token))
-            else:
-                # The token must be a class name
-                call_name = f"{token}.{subroutine_name}"
-        else:
-            # If we have no "." accessor, we must be operating on this object
-            call_name = f"{self._context_details['class_name']}.{token}"
+    def _parse_subroutine_call(self, name: str) -> SubroutineCall:
+        """Parse a subroutine call.
 
-            is_method = True
-            # We are working on "this" object, and must push it in first in the argument list
-            self._vm_writer.write_push(segment="POINTER", index=0)
+        Args:
+            name (str): The subroutine name, class name or variable name starting the call
 
+        Returns:
+            SubroutineCall: The call
+        """
+        receiver = None
+        if self._jack_tokenizer.look_ahead() == ".":
+            self._advance()
+            receiver, name = name, self._advance()
         # The ( symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # The expression list
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self.compile_expression_list()
-
+        arguments: List[Expression] = []
+        if self._jack_tokenizer.look_ahead() != ")":
+            arguments.append(self._parse_expression())
+            while self._jack_tokenizer.look_ahead() == ",":
+                self._advance()
+                arguments.append(self._parse_expression())
         # The ) symbol
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # Write the call to the subroutine
-        # We need to add +1 if we are calling a method
-        expression_list_count = self._context_details["expression_list_count"].pop()
-        if is_method:
-            expression_list_count += 1
-
-        self._vm_writer.write_call(name=call_name, n_args=expression_list_count)
-        # If the called function was a void function, we need to dump the
-        # returned value
-        # We know whether it was a void function or not to see if we are
-        # currently calling do
-        if self._context_details["do_statement"]:
-            self._vm_writer.write_pop(segment="TEMP", index=0)
-
-    def compile_do(self) -> None:
-        """Compile a `do` statement."""
-        self._open_grammar("doStatement")
-        self._context_details["do_statement"] = True
-
-        # do
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        assert self._jack_tokenizer.has_more_tokens()
         self._advance()
-        self._write_subroutine_call()
+        return SubroutineCall(receiver, name, arguments)
 
-        # The ; symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        self._context_details["do_statement"] = False
-        self._close_grammar("doStatement")
-
-    def compile_return(self) -> None:
-        """Compile a `return` statement."""
-        self._open_grammar("returnStatement")
-
-        # return
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        next_token = self._jack_tokenizer.look_ahead()
-        if next_token != ";":
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_expression()
-
-        # The ; symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # Handling of void
-        if self._context_details["return_type"] == "void":
-            self._vm_writer.write_push(segment="CONST", index=0)
-        self._vm_writer.write_return()
-
-        self._close_grammar("returnStatement")
-
-    def compile_expression(self) -> None:
-        """Compile an `expression` statement.
+    def _parse_expression(self) -> Expression:
+        """Parse an expression.
 
         Note:
-            - There is no operator precedence of expressions.
-              Expressions are simply compiled from left to the right.
-            - A more industrial strength compiler would make a syntax tree
-        """
-        self._open_grammar("expression")
-
-        # term
-        self.compile_term()
-
-        next_token = self._jack_tokenizer.look_ahead()
+            There is no operator precedence of expressions.
+            Expressions are simply parsed from left to the right.
 
-        # (op term)*
-        while next_token in get_args(Op):
-            # next_token cannot be None
-            cur_op = self.op_map[next_token]  # type: ignore
-            # op
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-            # term
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_term()
-
-            # As stack is postfixed, we will add the ops to the very end
-            # Due to op_map, cur_op must be in OpName
-            self._write_op(cur_op)  # type: ignore
-
-            next_token = self._jack_tokenizer.look_ahead()
-
-        self._close_grammar("expression")
+        Returns:
+            Expression: The expression
+        """
+        expression = self._parse_term()
+        while self._jack_tokenizer.look_ahead() in get_args(Op):
+            op = self._advance()
+            expression = BinaryOp(expression, op, self._parse_term())
+        return expression
 
-    def compile_term(self) -> None:
-        """Compile a term.
+    def _parse_term(self) -> Expression:  # pylint: disable=too-many-return-statements
+        """Parse a term.
 
         If the current token is an `IDENTIFIER`, the routine distinguishes
         between a variable, an array entry, or a subroutine call.
         A single look-ahead token, which may be one of `[`, `(`, or `.` is used
         to distinguish between the possibilities.
-        Any other token is not part of this term will not be advanced over.
-        """
-        self._open_grammar("term")
-
-        # Expressions in parantheses must be evaluated first
-        if self.token["token"] == "(":
-            # '('expression')'
-
-            # '('
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-            # expression
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_expression()
-
-            # ')'
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        elif self.token["type"] == "stringConstant":
-            # stringConstant
-            string = self.token["token"].replace('"', "")
-
-            # NOTE: The constructor is NOT String.new("string"), but String.new(6)
-            # Use-cases:
-            # foo("string")
-            # let a = "string"
-            # For both use cases we need to create a new string object and use appendChar to fill
-            self._vm_writer.write_push(segment="CONST", index=len(string))
-            self._vm_writer.write_call(name="String.new", n_args=1)
-            for char in string:
-                # NOTE: The character set follows the ASCII mapping, hence we can use ord
-                self._vm_writer.write_push(segment="CONST", index=ord(char))
-                # Two arguments: One for this and one for the character
-                self._vm_writer.write_call(name="String.appendChar", n_args=2)
-
-            self._write_token(self.token["type"], string)  # type: ignore
-        elif self.token["type"] in ("integerConstant", "keyword"):
-            # integerConstant | keywordConstant
-            self._write_integer_or_keyword()
-        elif self.token["type"] == "identifier":
-            # varName | varName'['expression']' | subroutineCall
-            next_token = self._jack_tokenizer.look_ahead()
-
-            if next_token == "[":
-                # varName'['expression']'
-                self._write_array_expression()
-            elif next_token in ("(", "."):
-                self._write_subroutine_call()
-            else:
-                # varName
-                self._write_token(self.token["type"], self.token["token"])  # type: ignore
-                var_name = self.token["token"]
-                table, segment = self._get_table_segment(var_name=var_name)
-                self._vm_writer.write_push(
-                    segment=self.segment_map[segment],  # type: ignore
-                    index=table.index_of(var_name),
-                )
-        elif self.token["type"] == "symbol":
-            # unaryOp term
-
-            # 'unaryOp'
-            self._write_token(self.token["type"], self.token["token"])  # type: ignore
-            cur_op = self.op_map[self.token["token"]]
-
-            # term
-            assert self._jack_tokenizer.has_more_tokens()
-            self._advance()
-            self.compile_term()
-
-            # As stack is postfixed, we will add the ops to the very end
-            # Due to op_map, cur_op must be in OpName
-            if cur_op == "SUB":
-                cur_op = "NEG"
-            self._write_op(cur_op)  # type: ignore
-        else:
-            raise RuntimeError(
-                f"Token type {self.token['type']} with token "
-                f"{self.token['token']} not recognized as a term"
-            )
-
-        self._close_grammar("term")
-
-    def _write_integer_or_keyword(self) -> None:
-        """Write an integer or a keyword constant."""
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        if self.token["type"] == "integerConstant":
-            self._vm_writer.write_push(segment="CONST", index=int(self.token["token"]))
-        elif self.token["token"] == "null":
-            self._vm_writer.write_push(segment="CONST", index=0)
-        elif self.token["token"] == "false":
-            self._vm_writer.write_push(segment="CONST", index=0)
-        elif self.token["token"] == "true":
-            self._vm_writer.write_push(segment="CONST", index=1)
-            self._vm_writer.write_arithmetic(command="NEG")
-        elif self.token["token"] == "this":
-            self._vm_writer.write_push(segment="POINTER", index=0)
-
-    def _write_array_expression(self) -> None:
-        """Write an array expression."""
-        # We potentially have a rhs expression
-        # NOTE: This is appropriately dealt with in compile_let
-        # self._context_details["array_rhs"] = True
-
-        # varName
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-        var_name = self.token["token"]
-        table, segment = self._get_table_segment(var_name=var_name)
-        self._vm_writer.write_push(
-            segment=self.segment_map[segment],  # type: ignore
-            index=table.index_of(var_name),
-        )
-
-        # The [ symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # expression
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self.compile_expression()
-
-        # The ] symbol
-        assert self._jack_tokenizer.has_more_tokens()
-        self._advance()
-        self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-        # Add [expression] to varName
-        self._vm_writer.write_arithmetic(command="ADD")
-
-        # Set the address to the array segment pointer
-        self._vm_writer.write_pop(segment="POINTER", index=1)
-        # Obtain the value of the address pointed to by pointer 1
-        self._vm_writer.write_push(segment="THAT", index=0)
 
-    def _write_op(self, cur_op: OpName) -> None:
-        """Write the op to vm code.
-
-        Args:
-            cur_op (OpName): The op to write
-        """
-        if cur_op == "MUL":
-            self._vm_writer.write_call(name="Math.multiply", n_args=2)
-        elif cur_op == "DIV":
-            self._vm_writer.write_call(name="Math.divide", n_args=2)
-        else:
-            self._vm_writer.write_arithmetic(command=cur_op)
-
-    def _get_table_segment(self, var_name: str) -> Tuple[SymbolTable, Optional[KIND]]:
-        """Return table and segment of the variable.
-
-        Args:
-            var_name (str): Name of the variable
+        Raises:
+            RuntimeError: If the token can not start a term
 
         Returns:
-            Tuple[SymbolTable, Optional[KIND]]: The var name, table and segment
+            Expression: The term
         """
-        table = self._symbol_tables["subroutine"]
-        segment = table.kind_of(name=var_name)
-        if segment is None:
-            table = self._symbol_tables["class"]
-            segment = table.kind_of(name=var_name)
-        return table, segment
-
-    def compile_expression_list(self) -> None:
-        """Compile a (possibly empty) comma-separated list of expressions."""
-        self._open_grammar("expressionList")
-        # NOTE: We can have nested expression lists
-        # Reset the expression list count
-        self._context_details["expression_list_count"].append(0)
-
-        if self.token["token"] != ")":
-            # expression
-            self.compile_expression()
-            self._context_details["expression_list_count"][-1] += 1
-
+        token = self._advance()
+        token_type = self.token["type"]
+        if token_type == "integerConstant":
+            return IntegerConstant(int(token))
+        if token_type == "stringConstant":
+            return StringConstant(token)
+        if token_type == "keyword":
+            return KeywordConstant(token)
+        if token_type == "identifier":
             next_token = self._jack_tokenizer.look_ahead()
-            if next_token == ")":
-                # Advance at the end of the list, so that self.token["token"] is
-                # the same irrespective of whether the expression list
-                # was empty or not
-                assert self._jack_tokenizer.has_more_tokens()
-                self._advance()
-
-            # (',' expression)*
-            while next_token != ")":
-                # The , symbol
-                assert self._jack_tokenizer.has_more_tokens()
+            if next_token == "[":
                 self._advance()
-                self._write_token(self.token["type"], self.token["token"])  # type: ignore
-
-                # expression
-                assert self._jack_tokenizer.has_more_tokens()
+                subscript = self._parse_expression()
+                # The ] symbol
                 self._advance()
-                self.compile_expression()
-                self._context_details["expression_list_count"][-1] += 1
-                next_token = self._jack_tokenizer.look_ahead()
-
-                if next_token == ")":
-                    # Advance at the end of the list, so that self.token["token"] is
-                    # the same irrespective of whether the expression list
-                    # was empty or not
-                    assert self._jack_tokenizer.has_more_tokens()
-                    self._advance()
-
-        self._close_grammar("expressionList")
+                return ArrayEntry(token, subscript)
+            if next_token in ("(", "."):
+                return self._parse_subroutine_call(token)
+            return VarName(token)
+        if token == "(":
+            expression = self._parse_expression()
+            # The ) symbol
+            self._advance()
+            return ParenthesizedExpression(expression)
+        if token in ("-", "~"):
+            return UnaryOp(token, self._parse_term())
+        raise RuntimeError(
+            f"Token type {token_type} with token {token} not recognized as a term"
+        )
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+
+"""Module containing the hackc driver compiling Jack code all the way to Hack machine code.
+
+The Jack compiler, the VM translator of project 08 and the assembler of project 06 are chained
+in memory, so that the intermediate .xml, .vm and .asm files are only written when requested.
+The VM commands are streamed from the compilation engine into the code writer as they are
+compiled, so the VM code is never formatted as text and parsed back.
+"""
+
+import argparse
+import sys
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Iterable, List, Literal, get_args
+
+from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.jack_tokenizer import JackTokenizer
+from jack_compiler.optimizer import (
+    OPTIMIZATION_LEVELS,
+    STRENGTH_REDUCTION_LEVEL,
+    STRING_POOL_LEVEL,
+    optimization_passes,
+)
+from jack_compiler.vm_writer import Command
+
+# The VM translator and the assembler are developed in the earlier projects
+# NOTE: The paths are appended, so that they can not shadow the packages of this project
+for tool_path in (
+    Path(__file__).parents[3].joinpath("08", "vm_translator"),
+    Path(__file__).parents[3].joinpath("06", "assembler"),
+):
+    if str(tool_path) not in sys.path:
+        sys.path.append(str(tool_path))
+
+# The imports depend on the paths above, so they can neither be placed at the top nor be
+# resolved by static analysis (unless mypy is given the paths in MYPYPATH)
+# pylint: disable=wrong-import-position,wrong-import-order,import-error
+from assembler.assembler import assemble  # type: ignore[import-not-found]
+from assembler.rom import (  # type: ignore[import-not-found]
+    ByteOrder,
+    OutputFormat,
+    write_hack,
+    write_rom,
+)
+from vm_translator.code_writer import CodeWriter  # type: ignore[import-not-found]
+from vm_translator.parser import Command as VMCommand  # type: ignore[import-not-found]
+from vm_translator.parser import Parser  # type: ignore[import-not-found]
+from vm_translator.vm_translator import write_commands  # type: ignore[import-not-found]
+
+# pylint: enable=wrong-import-position,wrong-import-order,import-error
+
+Intermediate = Literal["xml", "vm", "asm"]
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse input arguments.
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Compile Jack code to Hack machine code without intermediate files"
+    )
+    parser.add_argument(
+        "path",
+        type=Path,
+        help="Directory or file containing Jack code to compile to Hack machine code. "
+        "The .vm files of a directory without a corresponding .jack file (for example the "
+        "operating system) are included as is",
+    )
+    parser.add_argument(
+        "--keep",
+        choices=get_args(Intermediate),
+        action="append",
+        default=[],
+        help="Also write the intermediate files of a stage (can be repeated)",
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Fuse common sequences of VM commands into shorter assembly code",
+    )
+    parser.add_argument(
+        "-O",
+        "--opt-level",
+        type=int,
+        choices=OPTIMIZATION_LEVELS,
+        default=0,
+        help=(
+            "Optimization level: 0 is none, 1 folds the constants, 2 also replaces "
+            "multiplications and divisions by constants with stack arithmetic, 3 also "
+            "builds every string constant once per class"
+        ),
+    )
+    parser.add_argument(
+        "--fresh-strings",
+        action="store_true",
+        help=(
+            "Build the string constants on every evaluation, for programs which modify or "
+            "dispose them"
+        ),
+    )
+    parser.add_argument(
+        "--trampolines",
+        action="store_true",
+        help="Jump to shared call and return routines instead of inlining them",
+    )
+    parser.add_argument(
+        "--format",
+        choices=get_args(OutputFormat),
+        default="hack",
+        help="Write the instructions as .hack text or as a packed binary .bin ROM image",
+    )
+    parser.add_argument(
+        "--byteorder",
+        choices=get_args(ByteOrder),
+        default="little",
+        help="Byte order of the words in the binary ROM image",
+    )
+    parser.add_argument(
+        "--pad",
+        action="store_true",
+        help="Pad the binary ROM image with zeros to the full ROM size",
+    )
+    return parser.parse_args()
+
+
+def compile_class(
+    in_path: Path,
+    sink: Callable[[Command], None],
+    keep: Iterable[Intermediate] = (),
+    opt_level: int = 0,
+    fresh_strings: bool = False,
+) -> None:
+    """Compile a .jack file, streaming the VM commands into the sink.
+
+    Args:
+        in_path (Path): The .jack file
+        sink (Callable[[Command], None]): Function consuming the VM commands
+        keep (Iterable[Intermediate], optional): The intermediate files to write.
+            Defaults to ().
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
+    """
+    xml_file = StringIO() if "xml" in keep else None
+    vm_file = StringIO() if "vm" in keep else None
+    with in_path.open("r", encoding="utf-8") as in_file:
+        compilation_engine = CompilationEngine(
+            jack_tokenizer=JackTokenizer(in_file),
+            out_file=xml_file,
+            vm_file=vm_file,
+            vm_sink=sink,
+            passes=optimization_passes(opt_level),
+            strength_reduction=opt_level >= STRENGTH_REDUCTION_LEVEL,
+            string_pool=opt_level >= STRING_POOL_LEVEL and not fresh_strings,
+        )
+        compilation_engine.compile_class()
+    if xml_file is not None:
+        in_path.with_suffix(".xml").write_text(xml_file.getvalue())
+    if vm_file is not None:
+        in_path.with_suffix(".vm").write_text(vm_file.getvalue())
+
+
+def translate(  # pylint: disable=too-many-arguments
+    files: Iterable[Path],
+    out_path: Path,
+    bootstrap: bool,
+    keep: Iterable[Intermediate] = (),
+    optimize: bool = False,
+    trampolines: bool = False,
+    opt_level: int = 0,
+    fresh_strings: bool = False,
+) -> str:
+    """Compile .jack files and translate them together with .vm files into assembly code.
+
+    The VM commands of the .jack files are passed directly from the compilation engine to the
+    code writer, so they are neither formatted nor parsed.
+
+    Args:
+        files (Iterable[Path]): The .jack and .vm files
+        out_path (Path): The path of the .asm file, which names the program
+        bootstrap (bool): Whether or not to write the bootstrap code
+        keep (Iterable[Intermediate], optional): The intermediate files to write.
+            Defaults to ().
+        optimize (bool, optional): Whether or not to fuse common sequences of VM commands.
+            Defaults to False.
+        trampolines (bool, optional): Whether or not to use shared call and return routines.
+            Defaults to False.
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
+
+    Returns:
+        str: The assembly code
+    """
+    asm_file = StringIO()
+    code_writer = CodeWriter(
+        str(out_path),
+        bootstrap=bootstrap,
+        optimize=optimize,
+        trampolines=trampolines,
+        compact=True,
+        file=asm_file,
+    )
+    for path in files:
+        code_writer.set_file_name(path.with_suffix(".vm").name)
+        if path.suffix == ".vm":
+            write_commands(Parser(str(path)), code_writer)
+        else:
+            # The commands of the compiler have the same fields as the commands of the VM
+            # translator, which are separate classes as the projects are independent
+            compile_class(
+                path,
+                lambda command: code_writer.write_command(VMCommand(*command)),
+                keep,
+                opt_level,
+                fresh_strings,
+            )
+    code_writer.finish()
+    return asm_file.getvalue()
+
+
+def main(  # pylint: disable=too-many-arguments
+    in_path: Path,
+    keep: Iterable[Intermediate] = (),
+    optimize: bool = False,
+    trampolines: bool = False,
+    output_format: OutputFormat = "hack",
+    byteorder: ByteOrder = "little",
+    pad: bool = False,
+    opt_level: int = 0,
+    fresh_strings: bool = False,
+) -> Path:
+    """Compile Jack code to Hack machine code.
+
+    The output is identical to running the Jack compiler, the VM translator and the assembler
+    one after another.
+    The input xxx.jack will be compiled to xxx.hack, and a directory xxx to xxx/xxx.hack, where
+    the bootstrap code is only written for directories.
+
+    Args:
+        in_path (Path): File or directory to compile
+        keep (Iterable[Intermediate], optional): The intermediate files to write.
+            Defaults to ().
+        optimize (bool, optional): Whether or not to fuse common sequences of VM commands.
+            Defaults to False.
+        trampolines (bool, optional): Whether or not to use shared call and return routines.
+            Defaults to False.
+        output_format (OutputFormat, optional): Format of the instructions. Defaults to "hack".
+        byteorder (ByteOrder, optional): Byte order of the words in the binary ROM image.
+            Defaults to "little".
+        pad (bool, optional): Whether to pad the binary ROM image to the full ROM size.
+            Defaults to False.
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
+
+    Raises:
+        ValueError: If a input directory contains no .jack file
+        ValueError: If the input file is not a .jack file
+
+    Returns:
+        Path: The path to the machine code
+    """
+    keep = tuple(keep)
+    if in_path.is_dir():
+        jack_files = sorted(in_path.glob("*.jack"))
+        if len(jack_files) == 0:
+            raise ValueError(f"{in_path} contains no *.jack files")
+        stems = {path.stem for path in jack_files}
+        # The files are ordered like the .vm files are ordered by the VM translator
+        files: List[Path] = sorted(
+            jack_files
+            + [path for path in in_path.glob("*.vm") if path.stem not in stems],
+            key=lambda path: path.stem,
+        )
+        out_path = in_path.joinpath(in_path.name)
+    else:
+        if in_path.suffix != ".jack":
+            raise ValueError(f"{in_path} is not a .jack file")
+        files = [in_path]
+        out_path = in_path.with_suffix("")
+
+    asm_code = translate(
+        files,
+        out_path.with_suffix(".asm"),
+        bootstrap=in_path.is_dir(),
+        keep=keep,
+        optimize=optimize,
+        trampolines=trampolines,
+        opt_level=opt_level,
+        fresh_strings=fresh_strings,
+    )
+    if "asm" in keep:
+        out_path.with_suffix(".asm").write_text(asm_code)
+
+    words = assemble(asm_code)
+    if output_format == "bin":
+        out_path = out_path.with_suffix(".bin")
+        write_rom(out_path, words, byteorder=byteorder, pad=pad)
+    else:
+        out_path = out_path.with_suffix(".hack")
+        write_hack(out_path, words)
+    return out_path
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    written_path = main(
+        args.path.resolve(),
+        keep=args.keep,
+        optimize=args.optimize,
+        trampolines=args.trampolines,
+        output_format=args.format,
+        byteorder=args.byteorder,
+        pad=args.pad,
+        opt_level=args.opt_level,
+        fresh_strings=args.fresh_strings,
+    )
+    print(f"{written_path} written!")
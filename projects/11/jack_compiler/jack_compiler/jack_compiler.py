@@ -1,13 +1,26 @@
 #!/usr/bin/env python
 
-"""Module containing functions for translating .jack files to .vm files."""
+"""Module containing functions for translating .jack files to .vm files.
+
+The parse tree is only written to .xml files on request, so that the compilation to VM code does
+not spend any time on formatting XML.
+"""
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
+from jack_compiler.build_cache import BuildCache, source_version
 from jack_compiler.compilation_engine import CompilationEngine
 from jack_compiler.jack_tokenizer import JackTokenizer
+from jack_compiler.optimizer import (
+    OPTIMIZATION_LEVELS,
+    STRENGTH_REDUCTION_LEVEL,
+    STRING_POOL_LEVEL,
+    optimization_passes,
+)
 
 
 def parse_args() -> argparse.Namespace:
@@ -24,58 +37,325 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         help="Directory or file containing Jack code to translate to Hack Virtual Machine code",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes compiling the classes in parallel (0 uses all the CPUs)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            "Reuse the outputs of unchanged classes from the build cache "
+            "($NAND2TETRIS_CACHE, defaults to ~/.cache/nand2tetris)"
+        ),
+    )
+    parser.add_argument(
+        "--xml",
+        action="store_true",
+        help="Also write the parse tree of the classes to .xml files",
+    )
+    parser.add_argument(
+        "--token-cache",
+        action="store_true",
+        help="Persist the tokens next to the .jack files, and reuse them while unchanged",
+    )
+    parser.add_argument(
+        "-O",
+        "--opt-level",
+        type=int,
+        choices=OPTIMIZATION_LEVELS,
+        default=0,
+        help=(
+            "Optimization level: 0 is none, 1 folds the constants, 2 also replaces "
+            "multiplications and divisions by constants with stack arithmetic, 3 also "
+            "builds every string constant once per class"
+        ),
+    )
+    parser.add_argument(
+        "--fresh-strings",
+        action="store_true",
+        help=(
+            "Build the string constants on every evaluation, for programs which modify or "
+            "dispose them"
+        ),
+    )
     return parser.parse_args()
 
 
-def process_file(
-    in_path: Path, tokens_only: bool = False, out_path: Optional[Path] = None
+def process_file(  # pylint: disable=too-many-arguments
+    in_path: Path,
+    tokens_only: bool = False,
+    out_path: Optional[Path] = None,
+    cache: Optional[BuildCache] = None,
+    token_cache: bool = False,
+    xml: bool = False,
+    opt_level: int = 0,
+    fresh_strings: bool = False,
 ) -> None:
     """Process a single file.
 
     Args:
         in_path (Path): File to parse
-        tokens_only (bool, optional): Whether or not to only parse tokens. Defaults to False.
-        out_path (Optional[Path], optional): The out path. Defaults to None.
+        tokens_only (bool, optional): Whether or not to only parse tokens. The tokens are
+            always written to the .xml file. Defaults to False.
+        out_path (Optional[Path], optional): The out path of the .xml file. If given, the
+            parse tree is written as with xml. Defaults to None.
+        cache (Optional[BuildCache], optional): If given, the outputs are restored from the
+            cache when the file is unchanged. Defaults to None.
+        token_cache (bool, optional): Whether or not to persist the tokens next to the source
+            files, and reuse them while the files are unchanged. Defaults to False.
+        xml (bool, optional): Whether or not to also write the parse tree to the .xml file.
+            Defaults to False.
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
     """
     print(f"Processing {in_path}...", end="\r")
+    xml = xml or tokens_only or out_path is not None
     if out_path is None:
         out_path = in_path.with_suffix(".xml")
 
-    with in_path.open("r", encoding="utf-8") as in_file, out_path.open(
-        "w", encoding="utf-8"
-    ) as out_file:
-        jack_tokenizer = JackTokenizer(in_file)
-        compilation_engine = CompilationEngine(
-            jack_tokenizer=jack_tokenizer, out_file=out_file
+    _compile(
+        in_path=in_path,
+        out_path=out_path,
+        tokens_only=tokens_only,
+        cache=cache,
+        token_cache=token_cache,
+        xml=xml,
+        opt_level=opt_level,
+        fresh_strings=fresh_strings,
+    )
+
+    if tokens_only:
+        print(f"Processing {in_path}...{out_path} written in tokens only mode")
+    else:
+        print(f"Processing {in_path}")
+        if xml:
+            print(f"...{out_path} written")
+        print(f"...{out_path.with_suffix('.vm')} written")
+
+
+def compile_file(  # pylint: disable=too-many-arguments
+    in_path: Path,
+    cache: Optional[BuildCache] = None,
+    token_cache: bool = False,
+    xml: bool = False,
+    opt_level: int = 0,
+    fresh_strings: bool = False,
+) -> Path:
+    """Compile a single file without printing the progress.
+
+    Args:
+        in_path (Path): File to parse
+        cache (Optional[BuildCache], optional): If given, the outputs are restored from the
+            cache when the file is unchanged. Defaults to None.
+        token_cache (bool, optional): Whether or not to persist the tokens next to the source
+            files, and reuse them while the files are unchanged. Defaults to False.
+        xml (bool, optional): Whether or not to also write the parse tree to the .xml file.
+            Defaults to False.
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
+
+    Raises:
+        RuntimeError: If the compilation fails, the message starts with the class name
+
+    Returns:
+        Path: The path to the .vm file
+    """
+    out_path = in_path.with_suffix(".xml")
+    try:
+        _compile(
+            in_path=in_path,
+            out_path=out_path,
+            tokens_only=False,
+            cache=cache,
+            token_cache=token_cache,
+            xml=xml,
+            opt_level=opt_level,
+            fresh_strings=fresh_strings,
         )
+    except Exception as error:  # pylint: disable=broad-except
+        # The errors are reported together with the name of the class
+        raise RuntimeError(f"{in_path.stem}: {error}") from error
+    return out_path.with_suffix(".vm")
+
+
+def _compile(  # pylint: disable=too-many-arguments,too-many-locals
+    in_path: Path,
+    out_path: Path,
+    tokens_only: bool,
+    cache: Optional[BuildCache] = None,
+    token_cache: bool = False,
+    xml: bool = False,
+    opt_level: int = 0,
+    fresh_strings: bool = False,
+) -> None:
+    """Compile a file.
+
+    Args:
+        in_path (Path): File to parse
+        out_path (Path): The out path of the .xml file
+        tokens_only (bool): Whether or not to only parse tokens, which requires xml
+        cache (Optional[BuildCache], optional): If given, the .xml and .vm files are restored
+            from the cache when the file is unchanged. The cache is not used in tokens only
+            mode. Defaults to None.
+        token_cache (bool, optional): Whether or not to persist the tokens next to the source
+            files, and reuse them while the files are unchanged. Defaults to False.
+        xml (bool, optional): Whether or not to also write the parse tree to the .xml file.
+            Defaults to False.
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
+    """
+    vm_path = out_path.with_suffix(".vm")
+    if cache is not None and not tokens_only:
+        key = cache.key(
+            "jack_compiler",
+            source_version(),
+            "xml" if xml else "vm",
+            f"O{opt_level}",
+            "fresh strings" if fresh_strings else "pooled strings",
+            in_path.name,
+            in_path.read_bytes(),
+        )
+        cache.restore_or_build(
+            key,
+            [out_path, vm_path] if xml else [vm_path],
+            lambda: _compile(
+                in_path=in_path,
+                out_path=out_path,
+                tokens_only=False,
+                token_cache=token_cache,
+                xml=xml,
+                opt_level=opt_level,
+                fresh_strings=fresh_strings,
+            ),
+        )
+        return
+
+    with ExitStack() as stack:
+        in_file = stack.enter_context(in_path.open("r", encoding="utf-8"))
+        jack_tokenizer = JackTokenizer(in_file, token_cache=token_cache)
+        passes = optimization_passes(opt_level)
+        strength_reduction = opt_level >= STRENGTH_REDUCTION_LEVEL
+        string_pool = opt_level >= STRING_POOL_LEVEL and not fresh_strings
+        if xml:
+            compilation_engine = CompilationEngine(
+                jack_tokenizer=jack_tokenizer,
+                out_file=stack.enter_context(out_path.open("w", encoding="utf-8")),
+                passes=passes,
+                strength_reduction=strength_reduction,
+                string_pool=string_pool,
+            )
+            # The engine opens the .vm file next to the .xml file
+            stack.callback(compilation_engine.close)
+        else:
+            compilation_engine = CompilationEngine(
+                jack_tokenizer=jack_tokenizer,
+                vm_file=stack.enter_context(vm_path.open("w", encoding="utf-8")),
+                passes=passes,
+                strength_reduction=strength_reduction,
+                string_pool=string_pool,
+            )
 
         if tokens_only:
             compilation_engine.compile_tokens_only()
         else:
             compilation_engine.compile_class()
 
-    if tokens_only:
-        print(f"Processing {in_path}...{out_path} written in tokens only mode")
-    else:
-        print(f"Processing {in_path}")
-        print(f"...{out_path} written")
-        print(f"...{out_path.with_suffix('.vm')} written")
+
+def compile_files(  # pylint: disable=too-many-arguments
+    files_to_parse: List[Path],
+    jobs: int,
+    cache: Optional[BuildCache] = None,
+    token_cache: bool = False,
+    xml: bool = False,
+    opt_level: int = 0,
+    fresh_strings: bool = False,
+) -> None:
+    """Compile files in parallel.
+
+    A progress line is printed whenever a class is compiled, and the errors are reported once
+    all the classes have been compiled.
+
+    Args:
+        files_to_parse (List[Path]): The files to compile
+        jobs (int): Number of processes, where 0 uses all the CPUs
+        cache (Optional[BuildCache], optional): If given, the outputs of unchanged classes are
+            restored from the cache. Defaults to None.
+        token_cache (bool, optional): Whether or not to persist the tokens next to the source
+            files, and reuse them while the files are unchanged. Defaults to False.
+        xml (bool, optional): Whether or not to also write the parse tree to the .xml file.
+            Defaults to False.
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
+
+    Raises:
+        RuntimeError: If any of the classes could not be compiled
+    """
+    errors: List[str] = []
+    with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+        futures = {
+            executor.submit(
+                compile_file,
+                file_to_parse,
+                cache,
+                token_cache,
+                xml,
+                opt_level,
+                fresh_strings,
+            ): file_to_parse
+            for file_to_parse in files_to_parse
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            progress = f"[{done}/{len(futures)}] {futures[future]}"
+            try:
+                print(f"{progress} -> {future.result()} written", flush=True)
+            except RuntimeError as error:
+                errors.append(str(error))
+                print(f"{progress} failed", flush=True)
+    if errors:
+        raise RuntimeError("\n".join(["Compilation failed", *sorted(errors)]))
 
 
-def main(in_path: Path) -> None:
+def main(  # pylint: disable=too-many-arguments
+    in_path: Path,
+    jobs: int = 1,
+    cache: Optional[BuildCache] = None,
+    token_cache: bool = False,
+    xml: bool = False,
+    opt_level: int = 0,
+    fresh_strings: bool = False,
+) -> None:
     """Translate Jack code to Hack Virtual Machine code.
 
     The input xxx.jack will be translated to xxx.vm.
 
     Args:
         in_path (Path): File or directory to translate
+        jobs (int, optional): Number of processes compiling the classes in parallel, where 0
+            uses all the CPUs. Defaults to 1.
+        cache (Optional[BuildCache], optional): If given, the outputs of unchanged classes are
+            restored from the cache. Defaults to None.
+        token_cache (bool, optional): Whether or not to persist the tokens next to the source
+            files, and reuse them while the files are unchanged. Defaults to False.
+        xml (bool, optional): Whether or not to also write the parse tree to the .xml file.
+            Defaults to False.
+        opt_level (int, optional): The optimization level of the code. Defaults to 0.
+        fresh_strings (bool, optional): Whether or not to build the string constants on every
+            evaluation, also at the optimization levels which pool them. Defaults to False.
 
     Raises:
         ValueError: If a input directory contains no .jack file
         ValueError: If the input file is not a .jack file
     """
     if in_path.is_dir():
-        files_to_parse = list(in_path.glob("*.jack"))
+        files_to_parse = sorted(in_path.glob("*.jack"))
         if len(files_to_parse) == 0:
             raise ValueError(f"{in_path} contains no *.jack files")
     else:
@@ -83,10 +363,37 @@ def main(in_path: Path) -> None:
             raise ValueError(f"{in_path} is not a .jack file")
         files_to_parse = [in_path]
 
+    if jobs != 1:
+        compile_files(
+            files_to_parse,
+            jobs=jobs,
+            cache=cache,
+            token_cache=token_cache,
+            xml=xml,
+            opt_level=opt_level,
+            fresh_strings=fresh_strings,
+        )
+        return
+
     for file_to_parse in files_to_parse:
-        process_file(file_to_parse)
+        process_file(
+            file_to_parse,
+            cache=cache,
+            token_cache=token_cache,
+            xml=xml,
+            opt_level=opt_level,
+            fresh_strings=fresh_strings,
+        )
 
 
 if __name__ == "__main__":
     args = parse_args()
-    main(args.path.resolve())
+    main(
+        args.path.resolve(),
+        jobs=args.jobs,
+        cache=BuildCache() if args.cache else None,
+        token_cache=args.token_cache,
+        xml=args.xml,
+        opt_level=args.opt_level,
+        fresh_strings=args.fresh_strings,
+    )
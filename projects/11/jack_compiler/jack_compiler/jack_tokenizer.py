@@ -1,8 +1,17 @@
-"""Module containing the JackTokenizer class."""
+"""Module containing the JackTokenizer class.
 
+The whole source is tokenized in one pass when the tokenizer is created, and the tokens are
+stored in parallel lists which are served by index.
+The tokens of a source are cached in memory, and can be persisted next to the source file, so
+that the tokens-only XML, the parse tree XML and the VM code reuse one tokenization.
+"""
+
+import hashlib
+import json
 import re
-from io import TextIOWrapper
-from typing import Literal, Optional, cast, get_args
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Literal, NamedTuple, Optional, TextIO, Tuple, cast, get_args
 
 TOKEN = Literal[
     "KEYWORD",
@@ -58,6 +67,154 @@ SYMBOL = Literal[
     "~",
 ]
 
+# The alternatives are tried in order at every position:
+# - The comments are matched before the SYMBOL /
+# - We have (?!\w) in keywords as we might have variables like `do_this` which would have
+#   matched with `do` and `this` instead of `do_this`
+# - Block comments and strings which do not match as a whole are unterminated
+# - INT_CONST matches at most 5 digits
+# - Any other character is an error
+TOKEN_REGEX = re.compile(
+    r"(?P<SKIP>\s+|//[^\n]*|/\*.*?\*/)|"
+    r"\"(?P<STRING_CONST>[^\"\n]*)\"|"
+    r"(?P<UNTERMINATED>/\*|\")|"
+    rf"(?P<KEYWORD>(?:{'|'.join(kw.lower() for kw in get_args(KEYWORD))})(?!\w))|"
+    rf"(?P<SYMBOL>[{re.escape(''.join(get_args(SYMBOL)))}])|"
+    r"(?P<INT_CONST>\d{1,5})|"
+    r"(?P<IDENTIFIER>\w+)|"
+    r"(?P<ERROR>.)",
+    re.DOTALL,
+)
+
+# Identifies the tokenization in the persisted tokens, so that they are discarded when the
+# regex changes
+TOKENIZER_VERSION = hashlib.sha256(TOKEN_REGEX.pattern.encode()).hexdigest()[:16]
+
+KEYWORDS = frozenset(get_args(KEYWORD))
+SYMBOLS = frozenset(get_args(SYMBOL))
+
+
+class Tokens(NamedTuple):
+    """The tokens of a source stored in parallel lists."""
+
+    types: List[TOKEN]
+    # The text of the tokens, where the string constants are stripped of their double quotes
+    values: List[str]
+    # The line (starting at 1) and column (starting at 0) of the tokens
+    lines: List[int]
+    columns: List[int]
+    # The number of regex matches performed, including the ones of whitespace and comments
+    matches: int = 0
+
+
+def tokenize(source: str, name: str = "<string>") -> Tokens:
+    """Tokenize Jack code.
+
+    Args:
+        source (str): The Jack code
+        name (str, optional): The name of the source used in the error messages.
+            Defaults to "<string>".
+
+    Raises:
+        RuntimeError: If the source contains an unterminated comment or string, or a character
+            which does not belong to any token
+
+    Returns:
+        Tokens: The tokens
+    """
+    types: List[TOKEN] = []
+    values: List[str] = []
+    lines: List[int] = []
+    columns: List[int] = []
+    line = 1
+    line_start = 0
+    skipped = 0
+    for match in TOKEN_REGEX.finditer(source):
+        # Every alternative is a named group, so lastgroup is never None
+        kind = cast(str, match.lastgroup)
+        if kind == "SKIP":
+            # Only whitespace and comments span lines
+            text = match.group()
+            newlines = text.count("\n")
+            if newlines:
+                line += newlines
+                line_start = match.start() + text.rindex("\n") + 1
+            skipped += 1
+            continue
+        if kind in ("UNTERMINATED", "ERROR"):
+            raise RuntimeError(
+                f"{name}:{line}:{match.start() - line_start}: "
+                + (
+                    f"Unterminated {'comment' if match.group() == '/*' else 'string'}"
+                    if kind == "UNTERMINATED"
+                    else f"Unexpected character {match.group()!r}"
+                )
+            )
+        # The lastgroup is one of the TOKEN groups as the other groups are handled above
+        types.append(cast(TOKEN, kind))
+        values.append(match.group(kind))
+        lines.append(line)
+        columns.append(match.start() - line_start)
+    return Tokens(types, values, lines, columns, len(types) + skipped)
+
+
+@lru_cache(maxsize=256)
+def cached_tokenize(source: str, name: str = "<string>") -> Tokens:
+    """Tokenize Jack code, reusing the tokens of the sources tokenized earlier in the process.
+
+    NOTE: The tokens are shared between the callers, and must not be modified
+
+    Args:
+        source (str): The Jack code
+        name (str, optional): The name of the source used in the error messages.
+            Defaults to "<string>".
+
+    Returns:
+        Tokens: The tokens
+    """
+    return tokenize(source, name)
+
+
+def token_cache_path(path: Path) -> Path:
+    """Return the path of the persisted tokens of a source file.
+
+    Args:
+        path (Path): The .jack file
+
+    Returns:
+        Path: The hidden .Xxx.jack.tokens file next to the source file
+    """
+    return path.with_name(f".{path.name}.tokens")
+
+
+def load_tokens(source: str, path: Path) -> Tokens:
+    """Return the tokens of a source file, reusing the tokens persisted next to it.
+
+    The tokens are persisted as JSON, and are reused as long as the hash of the source and the
+    version of the tokenizer are unchanged.
+
+    Args:
+        source (str): The content of the source file
+        path (Path): The source file
+
+    Returns:
+        Tokens: The tokens
+    """
+    key = f"{TOKENIZER_VERSION}:{hashlib.sha256(source.encode()).hexdigest()}"
+    cache_path = token_cache_path(path)
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if data["key"] == key:
+            return Tokens(**data["tokens"])
+    except (OSError, ValueError, KeyError, TypeError):
+        # A missing or corrupt file is replaced below
+        pass
+    tokens = cached_tokenize(source, str(path))
+    cache_path.write_text(
+        json.dumps({"key": key, "tokens": tokens._asdict()}), encoding="utf-8"
+    )
+    return tokens
+
 
 class JackTokenizer:
     """Class tokenizing .jack files."""
@@ -65,47 +222,31 @@ class JackTokenizer:
     keywords = tuple(kw.lower() for kw in get_args(KEYWORD))
     symbols = tuple(kw for kw in get_args(SYMBOL))
 
-    def __init__(self, in_file: TextIOWrapper) -> None:
-        """Prepare to parse input stream.
+    def __init__(self, in_file: TextIO, token_cache: bool = False) -> None:
+        """Read and tokenize the input stream.
 
         Args:
-            in_file (TextIOWrapper): File to parse
+            in_file (TextIO): File to parse
+            token_cache (bool, optional): Whether or not to persist the tokens next to the
+                file, and reuse them while the file is unchanged. Defaults to False.
         """
         self.file = in_file
-        # Pylint claims that re.Match is unsubscriptable
-        # pylint: disable=unsubscriptable-object
-        self.match: Optional[re.Match[str]] = None
-        self.cur_token = ""
         self.file.seek(0)
-        self.cur_line = self.file.readline()
-        self.next_pos = 0
-
-        backslash = "\\"  # f-string expression part cannot include a backslash
-        # As we do greedy capture, we must have the comment first in order not
-        # to classify as a SYMBOL
-        # We have (?!\w) in keywords as we might have variables like `do_this`
-        # which would have matched with `do` and `this` instead of `do_this`
-        # We also have STRING_CONST last as it matches everything
-        # Notice also the ? modifier after * which makes it non-greedy
-        regex_str = (
-            r"\s*(?P<LINE_COMMENT>//)|"
-            r"\s*(?P<BLOCK_COMMENT_START>/\*)|"
-            rf"\s*(?P<KEYWORD>{'|'.join(self.keywords)})(?!\w)|"
-            rf"\s*(?P<SYMBOL>{backslash}{f'|{backslash}'.join(self.symbols)})|"
-            r"\s*(?P<INT_CONST>\d{1,5})|"
-            r"\s*(?P<IDENTIFIER>\w+)|"
-            r"\s*\"(?P<STRING_CONST>.*?)\""
-        )
-        self.compiled_regex = re.compile(regex_str)
-        self.block_comment_end_regex = re.compile(r"\s*\*/")
+        source = self.file.read()
+        name = getattr(in_file, "name", None)
+        if token_cache and name is not None:
+            self.tokens = load_tokens(source, Path(name))
+        else:
+            self.tokens = cached_tokenize(source, name or "<string>")
+        self._types, self._values = self.tokens.types, self.tokens.values
+        # Index of the current token, which is -1 before the first advance
+        self.index = -1
+        self.cur_token = ""
 
     def reset(self) -> None:
         """Reset the tokenizer."""
-        self.match = None
+        self.index = -1
         self.cur_token = ""
-        self.file.seek(0)
-        self.cur_line = self.file.readline()
-        self.next_pos = 0
 
     def has_more_tokens(self) -> bool:
         """Return if the file has more tokens.
@@ -113,132 +254,70 @@ class JackTokenizer:
         Returns:
             bool: True if the file has more tokens
         """
-        found_token = False
-        cur_pos = self.file.tell()
-        # The return value of .readline() is unambiguous
-        # It will return "" only on the last line
-        # A blank line will be returned as "\n"
-        while bool(self.cur_line):
-            self.match = self.compiled_regex.match(self.cur_line)
-            # On newlines there will be no match
-            if self.match is None:
-                self.cur_line = self.file.readline()
-                continue
-
-            if self._next_is_comment():
-                continue
-
-            # Since we have a match we can read the current token
-            found_token = True
-            break
-
-        self.next_pos = self.file.tell()
-        self.file.seek(cur_pos)
-        # Next line is empty, no more tokens
-        return found_token
-
-    def _next_is_comment(self) -> bool:
-        """Check if the next part of the current line is a comment, advance the line.
+        return self.index + 1 < len(self._types)
 
-        Returns:
-            bool: True
-        """
-        if self.match is None:
-            return False
-
-        # Check for line commands
-        if self.match.lastgroup == "LINE_COMMENT":
-            self.cur_line = self.file.readline()
-            return True
-
-        # Check for block commands
-        if self.match.lastgroup == "BLOCK_COMMENT_START":
-            # Advance until */
-            found_end = False
-            while not found_end:
-                # NOTE: We search as the */ may not be in the start
-                block_comment_end_match = self.block_comment_end_regex.search(
-                    self.cur_line
-                )
-                if block_comment_end_match is not None:
-                    found_end = True
-                    # NOTE: span() returns the (match.start(group), match.end(group))
-                    self._eat(block_comment_end_match.span()[1])
-                else:
-                    self.cur_line = self.file.readline()
-            return True
+    def look_ahead(self, k: int = 1) -> Optional[str]:
+        """Peek at a token after the current token without advancing.
 
-        return False
-
-    def _eat(self, char_number: int) -> None:
-        """Eat the first characters of the current line.
+        As all the tokens are stored, peeking is a list lookup for any k.
 
         Args:
-            char_number (int): Number of characters to eat
-        """
-        self.cur_line = self.cur_line[char_number:]
-
-    def look_ahead(self) -> Optional[str]:
-        """Read the next token.
+            k (int, optional): How many tokens ahead to peek, where 1 is the next token.
+                Defaults to 1.
 
         Raises:
-            RuntimeError: If match or lastgroup is None
+            ValueError: If k is not positive
 
         Returns:
-            Optional[str]: The next token
+            Optional[str]: The token, or None if there are fewer than k tokens left
         """
-        original_next_pos = self.next_pos
-        original_cur_line = self.cur_line
-        more_tokens = self.has_more_tokens()
-        # Reset state of jack_tokenizer
-        self.next_pos = original_next_pos
-        self.cur_line = original_cur_line
-        if not more_tokens:
-            return None
-        if (self.match is None) or (self.match.lastgroup is None):
-            raise RuntimeError("Could not look ahead as no matches were found.")
-        return self.match.group(self.match.lastgroup)
+        if k < 1:
+            raise ValueError(
+                f"Can only look ahead a positive number of tokens, not {k}"
+            )
+        index = self.index + k
+        if index < len(self._values):
+            return self._values[index]
+        return None
 
     def advance(self) -> None:
         """Read the next token and make it the current token.
 
-        Will:
-        - Populate self.cur_token
-        - Eat the match on the current line
-        - Move the file pointer
-
         This method should be called only if has_more_tokens is true.
 
         Raises:
-            RuntimeError: If match or lastgroup is None
+            RuntimeError: If there are no more tokens
         """
-        if (self.match is None) or (self.match.lastgroup is None):
-            raise RuntimeError(
-                "Could not set cur_token as no matches were found, "
-                "did you run has_more_tokens first?"
-            )
+        if self.index + 1 >= len(self._values):
+            raise RuntimeError("Could not advance as there are no more tokens")
+        self.index += 1
+        self.cur_token = self._values[self.index]
 
-        self.cur_token = self.match.group(self.match.lastgroup)
-        self._eat(self.match.span()[1])
-        self.file.seek(self.next_pos)
+    def position(self) -> Tuple[int, int]:
+        """Return the position of the current token.
+
+        Raises:
+            RuntimeError: If there is no current token
+
+        Returns:
+            Tuple[int, int]: The line (starting at 1) and the column (starting at 0)
+        """
+        self._check_current()
+        return self.tokens.lines[self.index], self.tokens.columns[self.index]
 
     def token_type(self) -> TOKEN:
         """Return the current token type.
 
-        This method should only be called if `has_more_tokens` is True
+        This method should only be called after `advance`
 
         Raises:
-            RuntimeError: If no match has been found
-            RuntimeError: If the found token is not a valid token
+            RuntimeError: If there is no current token
 
         Returns:
             TOKEN: The token type
         """
-        if self.match is None:
-            raise RuntimeError("No match found")
-        if self.match.lastgroup not in get_args(TOKEN):
-            raise RuntimeError(f"{self.match.lastgroup} not in {get_args(TOKEN)}")
-        return cast(TOKEN, self.match.lastgroup)
+        self._check_current()
+        return self._types[self.index]
 
     def keyword(self) -> KEYWORD:
         """Return the keyword which is the current token.
@@ -246,16 +325,15 @@ class JackTokenizer:
         This method should be called only if `tokenType` is `KEYWORD`
 
         Raises:
-            RuntimeError: If no match has been found
+            RuntimeError: If there is no current token
             RuntimeError: If the found token is not a valid token
 
         Returns:
             KEYWORD: The keyword
         """
+        self._check_current()
         token = self.cur_token.upper()
-        if self.match is None:
-            raise RuntimeError("No match found")
-        if token not in get_args(KEYWORD):
+        if token not in KEYWORDS:
             raise RuntimeError(f"{token} not in {get_args(KEYWORD)}")
         return cast(KEYWORD, token)
 
@@ -265,16 +343,15 @@ class JackTokenizer:
         This method should be called only if `tokenType` is `SYMBOL`
 
         Raises:
-            RuntimeError: If no match has been found
+            RuntimeError: If there is no current token
             RuntimeError: If the found token is not a valid token
 
         Returns:
             SYMBOL: The symbol
         """
-        token = self.cur_token.upper()
-        if self.match is None:
-            raise RuntimeError("No match found")
-        if token not in get_args(SYMBOL):
+        self._check_current()
+        token = self.cur_token
+        if token not in SYMBOLS:
             raise RuntimeError(f"{token} not in {get_args(SYMBOL)}")
         return cast(SYMBOL, token)
 
@@ -309,3 +386,12 @@ class JackTokenizer:
             str: The string
         """
         return self.cur_token
+
+    def _check_current(self) -> None:
+        """Check that there is a current token.
+
+        Raises:
+            RuntimeError: If advance has not been called since the tokenizer was reset
+        """
+        if self.index < 0:
+            raise RuntimeError("No current token, did you run advance first?")
@@ -0,0 +1,333 @@
+"""Module containing the optimization passes of the syntax tree.
+
+The passes are selected by the optimization level:
+
+0. No optimization
+1. Constant folding and algebraic simplification
+2. Strength reduction of the multiplications and divisions by constants, which is done by the
+   code generator as the operands must be duplicated on the stack
+3. Pooling of the string constants, which are built once per class by the code generator and
+   then shared by all evaluations
+
+All values are evaluated with the 16 bit two's complement arithmetic of the Hack computer, and
+the operations of the operating system are only evaluated where the result is identical.
+"""
+
+from typing import Callable, Dict, List, Literal, Optional, Tuple
+
+from jack_compiler.compilation_engine import Pass
+from jack_compiler.syntax_tree import (
+    ArrayEntry,
+    BinaryOp,
+    Class,
+    Expression,
+    IntegerConstant,
+    KeywordConstant,
+    NodeTransformer,
+    ParenthesizedExpression,
+    StringConstant,
+    SubroutineCall,
+    UnaryOp,
+)
+
+OPTIMIZATION_LEVELS = (0, 1, 2, 3)
+
+# The optimization level from which the code generator reduces the strength of operations
+STRENGTH_REDUCTION_LEVEL = 2
+# The optimization level from which the code generator pools the string constants
+STRING_POOL_LEVEL = 3
+
+# The largest integer constant of the Jack language
+MAX_CONSTANT = 32767
+
+KEYWORD_VALUES = {"true": -1, "false": 0, "null": 0}
+
+
+def wrap(value: int) -> int:
+    """Wrap an integer to a 16 bit signed integer.
+
+    Args:
+        value (int): The integer
+
+    Returns:
+        int: The integer modulo 2**16 in the range [-32768, 32767]
+    """
+    return ((value + 0x8000) & 0xFFFF) - 0x8000
+
+
+def divide(left: int, right: int) -> Optional[int]:
+    """Divide like Math.divide, which truncates the quotient towards zero.
+
+    Args:
+        left (int): The dividend
+        right (int): The divisor
+
+    Returns:
+        Optional[int]: The quotient, or None where Math.divide does not return the quotient,
+            that is when dividing by zero or when an operand is -32768 which has no absolute
+            value
+    """
+    if right == 0 or -0x8000 in (left, right):
+        return None
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+
+# Map from the binary operators to the functions evaluating them
+BINARY_OPS: Dict[str, Callable[[int, int], Optional[int]]] = {
+    "+": lambda left, right: wrap(left + right),
+    "-": lambda left, right: wrap(left - right),
+    "*": lambda left, right: wrap(left * right),
+    "/": divide,
+    "&": lambda left, right: left & right,
+    "|": lambda left, right: left | right,
+    "<": lambda left, right: -int(left < right),
+    ">": lambda left, right: -int(left > right),
+    "=": lambda left, right: -int(left == right),
+}
+UNARY_OPS: Dict[str, Callable[[int], int]] = {
+    "-": lambda operand: wrap(-operand),
+    "~": lambda operand: ~operand,
+}
+
+# Map from the operators and the constant operands to what the operation simplifies to, which
+# is either the other operand, the other operand negated or the constant itself
+Identity = Literal["operand", "negated", "constant"]
+LEFT_IDENTITIES: Dict[Tuple[str, int], Identity] = {
+    ("+", 0): "operand",
+    ("-", 0): "negated",
+    ("*", 1): "operand",
+    ("*", -1): "negated",
+    ("*", 0): "constant",
+    ("&", -1): "operand",
+    ("&", 0): "constant",
+    ("|", 0): "operand",
+    ("|", -1): "constant",
+}
+RIGHT_IDENTITIES: Dict[Tuple[str, int], Identity] = {
+    **{key: value for key, value in LEFT_IDENTITIES.items() if key != ("-", 0)},
+    ("-", 0): "operand",
+}
+
+
+def strip_parentheses(expression: Expression) -> Expression:
+    """Remove the parentheses enclosing an expression.
+
+    Args:
+        expression (Expression): The expression
+
+    Returns:
+        Expression: The expression without enclosing parentheses
+    """
+    while isinstance(expression, ParenthesizedExpression):
+        expression = expression.expression
+    return expression
+
+
+def constant_value(expression: Expression) -> Optional[int]:
+    """Return the value of a constant expression.
+
+    Args:
+        expression (Expression): The expression
+
+    Returns:
+        Optional[int]: The value, or None if the expression is not a constant
+    """
+    expression = strip_parentheses(expression)
+    if isinstance(expression, IntegerConstant):
+        return expression.value
+    if isinstance(expression, KeywordConstant):
+        return KEYWORD_VALUES.get(expression.keyword)
+    if isinstance(expression, UnaryOp):
+        operand = constant_value(expression.operand)
+        if operand is not None:
+            return UNARY_OPS[expression.op](operand)
+    return None
+
+
+def constant(value: int) -> Expression:
+    """Return the shortest expression of a 16 bit signed integer.
+
+    Args:
+        value (int): The integer
+
+    Returns:
+        Expression: The integer constant, negated if the integer is negative
+    """
+    if value >= 0:
+        return IntegerConstant(value)
+    if value == -0x8000:
+        # 32768 is not a valid integer constant
+        return UnaryOp("~", IntegerConstant(MAX_CONSTANT))
+    return UnaryOp("-", IntegerConstant(-value))
+
+
+def is_pure(expression: Expression) -> bool:
+    """Return whether an expression can be removed without changing the program.
+
+    Args:
+        expression (Expression): The expression
+
+    Returns:
+        bool: False if the expression calls a subroutine, which may have side effects
+    """
+    expression = strip_parentheses(expression)
+    # NOTE: String constants call String.new and String.appendChar
+    if isinstance(expression, (SubroutineCall, StringConstant)):
+        return False
+    if isinstance(expression, ArrayEntry):
+        return is_pure(expression.subscript)
+    if isinstance(expression, UnaryOp):
+        return is_pure(expression.operand)
+    if isinstance(expression, BinaryOp):
+        return is_pure(expression.left) and is_pure(expression.right)
+    return True
+
+
+def reassociate(
+    inner_op: str, inner_value: int, op: str, value: int
+) -> Optional[Tuple[str, int]]:
+    """Combine the constants of (x inner_op inner_value) op value.
+
+    Args:
+        inner_op (str): The operator of the inner operation
+        inner_value (int): The constant of the inner operation
+        op (str): The operator of the outer operation
+        value (int): The constant of the outer operation
+
+    Returns:
+        Optional[Tuple[str, int]]: The operator and constant of the equivalent x op constant,
+            or None if the operations can not be combined
+    """
+    if inner_op in ("+", "-") and op in ("+", "-"):
+        total = wrap(
+            (inner_value if inner_op == "+" else -inner_value)
+            + (value if op == "+" else -value)
+        )
+        # Prefer subtracting a positive constant to adding a negated constant
+        if -0x8000 < total < 0:
+            return "-", -total
+        return "+", total
+    if inner_op == op and op in ("*", "&", "|"):
+        # Type ignore as mypy doesn't detect that these operators always return an integer
+        return op, BINARY_OPS[op](inner_value, value)  # type: ignore
+    return None
+
+
+def simplify(left: Expression, op: str, right: Expression) -> Expression:
+    """Simplify a binary operation, where the operands are already simplified.
+
+    Args:
+        left (Expression): The left operand
+        op (str): The operator
+        right (Expression): The right operand
+
+    Returns:
+        Expression: The simplified operation
+    """
+    left_value = constant_value(left)
+    right_value = constant_value(right)
+    if left_value is not None and right_value is not None:
+        value = BINARY_OPS[op](left_value, right_value)
+        if value is not None:
+            return constant(value)
+
+    if right_value is not None:
+        # Fold the constants of x op c1 op c2, which is parsed as (x op c1) op c2
+        inner = strip_parentheses(left)
+        if isinstance(inner, BinaryOp):
+            inner_value = constant_value(inner.right)
+            if inner_value is not None:
+                combined = reassociate(inner.op, inner_value, op, right_value)
+                if combined is not None:
+                    return simplify(inner.left, combined[0], constant(combined[1]))
+
+    for value, operand, other, identities in (
+        (left_value, right, left, LEFT_IDENTITIES),
+        (right_value, left, right, RIGHT_IDENTITIES),
+    ):
+        if value is None or (op, value) not in identities:
+            continue
+        identity = identities[(op, value)]
+        if identity == "operand":
+            return operand
+        if identity == "negated":
+            return UnaryOp("-", operand)
+        # The operation results in the constant, so the operand is only evaluated for its
+        # side effects
+        if is_pure(operand):
+            return other
+    return BinaryOp(left, op, right)
+
+
+class ConstantFolder(NodeTransformer):
+    """Pass evaluating the constant expressions and simplifying the algebraic identities.
+
+    As Jack has no operator precedence, only constants following each other are folded.
+    For example i + 1 + 2 becomes i + 3, whereas x * 4 + 2 * 3 means ((x * 4) + 2) * 3, which
+    has no constant subexpression.
+    """
+
+    def visit_unary_op(self, node: UnaryOp) -> Expression:
+        """Fold a unary operation.
+
+        Args:
+            node (UnaryOp): The operation
+
+        Returns:
+            Expression: The folded operation
+        """
+        operand = self.visit(node.operand)
+        value = constant_value(operand)
+        if value is not None:
+            return constant(UNARY_OPS[node.op](value))
+        inner = strip_parentheses(operand)
+        if isinstance(inner, UnaryOp) and inner.op == node.op:
+            # Double negation
+            return inner.operand
+        return UnaryOp(node.op, operand)
+
+    def visit_binary_op(self, node: BinaryOp) -> Expression:
+        """Fold a binary operation.
+
+        Args:
+            node (BinaryOp): The operation
+
+        Returns:
+            Expression: The folded operation
+        """
+        return simplify(self.visit(node.left), node.op, self.visit(node.right))
+
+
+def fold_constants(node: Class) -> Class:
+    """Fold the constant expressions of a class.
+
+    Args:
+        node (Class): The syntax tree of the class
+
+    Returns:
+        Class: The syntax tree with the constant expressions folded
+    """
+    return ConstantFolder().visit(node)
+
+
+def optimization_passes(level: int) -> List[Pass]:
+    """Return the passes of an optimization level.
+
+    Args:
+        level (int): The optimization level
+
+    Raises:
+        ValueError: If the optimization level does not exist
+
+    Returns:
+        List[Pass]: The passes to apply in order
+    """
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(
+            f"The optimization level must be one of {OPTIMIZATION_LEVELS}, not {level}"
+        )
+    passes: List[Pass] = []
+    if level >= 1:
+        passes.append(fold_constants)
+    return passes
@@ -0,0 +1,256 @@
+"""Module containing the abstract syntax tree of a Jack class.
+
+The nodes are named tuples, so that they are compact and immutable.
+The parse tree XML and the VM code are written by visitors of the tree, and the passes between
+the parsing and the code generation return new trees rather than modifying the nodes.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional, Union
+
+
+class IntegerConstant(NamedTuple):
+    """An integer constant."""
+
+    value: int
+
+
+class StringConstant(NamedTuple):
+    """A string constant without the enclosing double quotes."""
+
+    value: str
+
+
+class KeywordConstant(NamedTuple):
+    """One of the keyword constants true, false, null and this."""
+
+    keyword: str
+
+
+class VarName(NamedTuple):
+    """A variable."""
+
+    name: str
+
+
+class ArrayEntry(NamedTuple):
+    """An entry of an array variable."""
+
+    name: str
+    subscript: "Expression"
+
+
+class SubroutineCall(NamedTuple):
+    """A call of a subroutine.
+
+    The receiver is the class or the variable before the dot, and None when a method of the
+    current object is called.
+    """
+
+    receiver: Optional[str]
+    name: str
+    arguments: List["Expression"]
+
+
+class UnaryOp(NamedTuple):
+    """A unary operation, where op is either - or ~."""
+
+    op: str
+    operand: "Expression"
+
+
+class ParenthesizedExpression(NamedTuple):
+    """An expression enclosed in parentheses."""
+
+    expression: "Expression"
+
+
+class BinaryOp(NamedTuple):
+    """A binary operation.
+
+    Jack has no operator precedence, so a op b op c is parsed to BinaryOp(BinaryOp(a, op, b),
+    op, c).
+    """
+
+    left: "Expression"
+    op: str
+    right: "Expression"
+
+
+Expression = Union[
+    IntegerConstant,
+    StringConstant,
+    KeywordConstant,
+    VarName,
+    ArrayEntry,
+    SubroutineCall,
+    UnaryOp,
+    ParenthesizedExpression,
+    BinaryOp,
+]
+
+
+class LetStatement(NamedTuple):
+    """A let statement, where the subscript is only given for array entries."""
+
+    name: str
+    subscript: Optional[Expression]
+    value: Expression
+
+
+class IfStatement(NamedTuple):
+    """An if statement, where the else statements are None without an else clause."""
+
+    condition: Expression
+    statements: List["Statement"]
+    else_statements: Optional[List["Statement"]] = None
+
+
+class WhileStatement(NamedTuple):
+    """A while statement."""
+
+    condition: Expression
+    statements: List["Statement"]
+
+
+class DoStatement(NamedTuple):
+    """A do statement."""
+
+    call: SubroutineCall
+
+
+class ReturnStatement(NamedTuple):
+    """A return statement, where the value is None for return;."""
+
+    value: Optional[Expression] = None
+
+
+Statement = Union[
+    LetStatement, IfStatement, WhileStatement, DoStatement, ReturnStatement
+]
+
+
+class ClassVarDec(NamedTuple):
+    """A declaration of static or field variables."""
+
+    kind: str
+    var_type: str
+    names: List[str]
+
+
+class Parameter(NamedTuple):
+    """A parameter of a subroutine."""
+
+    var_type: str
+    name: str
+
+
+class VarDec(NamedTuple):
+    """A declaration of local variables."""
+
+    var_type: str
+    names: List[str]
+
+
+class SubroutineDec(NamedTuple):
+    """A constructor, function or method."""
+
+    subroutine_type: str
+    return_type: str
+    name: str
+    parameters: List[Parameter]
+    var_decs: List[VarDec]
+    statements: List[Statement]
+
+
+class Class(NamedTuple):
+    """A class, which is the root of the tree."""
+
+    name: str
+    class_var_decs: List[ClassVarDec]
+    subroutine_decs: List[SubroutineDec]
+
+
+Node = Union[
+    Class, ClassVarDec, Parameter, VarDec, SubroutineDec, Statement, Expression
+]
+
+
+@lru_cache(maxsize=None)
+def _visit_method_name(class_name: str) -> str:
+    """Return the name of the visit method of a node class.
+
+    Args:
+        class_name (str): The name of the class of the node
+
+    Returns:
+        str: visit_ followed by the class name in snake case, for example visit_let_statement
+    """
+    return "visit_" + re.sub(r"(?<!^)(?=[A-Z])", "_", class_name).lower()
+
+
+class NodeVisitor:  # pylint: disable=too-few-public-methods
+    """Base class of the classes walking a syntax tree.
+
+    The subclasses implement a visit method for every node they visit.
+    """
+
+    def visit(self, node: Node) -> Any:
+        """Visit a node.
+
+        Args:
+            node (Node): The node to visit
+
+        Returns:
+            Any: The return value of the visit method of the node
+        """
+        return getattr(self, _visit_method_name(type(node).__name__))(node)
+
+
+class NodeTransformer(NodeVisitor):  # pylint: disable=too-few-public-methods
+    """Base class of the passes rewriting a syntax tree.
+
+    The nodes without a visit method are rebuilt from their visited children, so the
+    subclasses only implement the visit methods of the nodes they rewrite.
+    """
+
+    def visit(self, node: Node) -> Any:
+        """Visit a node.
+
+        Args:
+            node (Node): The node to visit
+
+        Returns:
+            Any: The rewritten node
+        """
+        method = getattr(self, _visit_method_name(type(node).__name__), None)
+        if method is None:
+            return self.generic_visit(node)
+        return method(node)
+
+    def generic_visit(self, node: Node) -> Node:
+        """Rebuild a node from its visited children.
+
+        Args:
+            node (Node): The node to rebuild
+
+        Returns:
+            Node: The node with the visited children
+        """
+        return type(node)._make(self._visit_field(field) for field in node)
+
+    def _visit_field(self, field: Any) -> Any:
+        """Visit the nodes of a field of a node.
+
+        Args:
+            field (Any): A node, a list of nodes or a value such as a name
+
+        Returns:
+            Any: The visited field
+        """
+        if isinstance(field, list):
+            return [self._visit_field(element) for element in field]
+        if hasattr(field, "_fields"):
+            return self.visit(field)
+        return field
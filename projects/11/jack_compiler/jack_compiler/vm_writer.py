@@ -1,7 +1,6 @@
-"""Module containing the VMWriter class."""
+"""Module containing the VMWriter class and the VM command model."""
 
-from io import TextIOWrapper
-from typing import Literal, Union
+from typing import Callable, Dict, Literal, NamedTuple, Optional, TextIO, Union
 
 NonConstVirtualSegments = Literal[
     "ARG", "LOCAL", "STATIC", "THIS", "THAT", "POINTER", "TEMP"
@@ -11,9 +10,71 @@ VirtualSegments = Union[NonConstVirtualSegments, ConstVirtualSegments]
 
 Arithmetic = Literal["ADD", "SUB", "NEG", "EQ", "GT", "LT", "AND", "OR", "NOT"]
 
+CommandType = Literal[
+    "C_ARITHMETIC",
+    "C_PUSH",
+    "C_POP",
+    "C_LABEL",
+    "C_GOTO",
+    "C_IF",
+    "C_FUNCTION",
+    "C_RETURN",
+    "C_CALL",
+]
+
+# Map from the command types to the command as written in the .vm file
+COMMAND_TEXT_MAP: Dict[CommandType, str] = {
+    "C_PUSH": "push",
+    "C_POP": "pop",
+    "C_LABEL": "label",
+    "C_GOTO": "goto",
+    "C_IF": "if-goto",
+    "C_FUNCTION": "function",
+    "C_RETURN": "return",
+    "C_CALL": "call",
+}
+
+
+class Command(NamedTuple):
+    """A VM command.
+
+    The fields are the same as the ones of the commands parsed by the VM translator of project
+    08, so that the commands can be streamed directly into its CodeWriter.
+    arg1 is the command itself for C_ARITHMETIC, and empty for C_RETURN.
+    arg2 is only populated for C_PUSH, C_POP, C_FUNCTION and C_CALL.
+    """
+
+    command_type: CommandType
+    arg1: str = ""
+    arg2: Optional[int] = None
+
+
+def format_command(command: Command) -> str:
+    """Return the line of a VM command as written in a .vm file.
+
+    Args:
+        command (Command): The command to format
+
+    Returns:
+        str: The command terminated by a newline
+    """
+    command_type, arg1, arg2 = command
+    if command_type == "C_ARITHMETIC":
+        return f"{arg1}\n"
+    if arg2 is not None:
+        return f"{COMMAND_TEXT_MAP[command_type]} {arg1} {arg2}\n"
+    if arg1:
+        return f"{COMMAND_TEXT_MAP[command_type]} {arg1}\n"
+    return f"{COMMAND_TEXT_MAP[command_type]}\n"
+
 
 class VMWriter:
-    """Class which writes VM code."""
+    """Class which writes VM code.
+
+    Every command is made into a Command, which is written as text to the output file and/or
+    passed to the sink.
+    The output file is owned by the caller, and is only closed by close.
+    """
 
     segment_map = {
         "ARG": "argument",
@@ -28,17 +89,32 @@ class VMWriter:
         "CONST": "constant",
     }
 
-    def __init__(self, out_file: TextIOWrapper) -> None:
+    def __init__(
+        self,
+        out_file: Optional[TextIO] = None,
+        sink: Optional[Callable[[Command], None]] = None,
+    ) -> None:
         """Create a new output .vm file and prepares it for writing.
 
         Args:
-            out_file (TextIOWrapper): The file to write to
+            out_file (Optional[TextIO], optional): The file to write to. Defaults to None.
+            sink (Optional[Callable[[Command], None]], optional): Function consuming the
+                commands, for example the write_command method of the CodeWriter of the VM
+                translator. Defaults to None.
         """
         self.out_file = out_file
+        self.sink = sink
 
-    def __del__(self):
-        """Close the out_file."""
-        self.out_file.close()
+    def write_command(self, command: Command) -> None:
+        """Write a VM command to the output file and pass it to the sink.
+
+        Args:
+            command (Command): The command to write
+        """
+        if self.sink is not None:
+            self.sink(command)
+        if self.out_file is not None:
+            self.out_file.write(format_command(command))
 
     def write_push(self, segment: VirtualSegments, index: int) -> None:
         """Write a VM push command.
@@ -47,7 +123,7 @@ class VMWriter:
             segment (VIRTUAL_SEGMENTS): The segment to write
             index (int): The index to write
         """
-        self.out_file.write(f"push {self.segment_map[segment]} {index}\n")
+        self.write_command(Command("C_PUSH", self.segment_map[segment], index))
 
     def write_pop(self, segment: NonConstVirtualSegments, index: int) -> None:
         """Write a VM pop command.
@@ -56,7 +132,7 @@ class VMWriter:
             segment (NON_CONST_VIRTUAL_SEGMENTS): The segment to write
             index (int): The index to write
         """
-        self.out_file.write(f"pop {self.segment_map[segment]} {index}\n")
+        self.write_command(Command("C_POP", self.segment_map[segment], index))
 
     def write_arithmetic(self, command: Arithmetic) -> None:
         """Write a VM arithmetic-logical command.
@@ -64,7 +140,7 @@ class VMWriter:
         Args:
             command (ARITHMETIC): The command to write
         """
-        self.out_file.write(f"{command.lower()}\n")
+        self.write_command(Command("C_ARITHMETIC", command.lower()))
 
     def write_label(self, label: str) -> None:
         """Write a VM label command.
@@ -72,7 +148,7 @@ class VMWriter:
         Args:
             label (str): The label to write
         """
-        self.out_file.write(f"label {label}\n")
+        self.write_command(Command("C_LABEL", label))
 
     def write_goto(self, label: str) -> None:
         """Write a VM goto command.
@@ -80,7 +156,7 @@ class VMWriter:
         Args:
             label (str): The label to go to
         """
-        self.out_file.write(f"goto {label}\n")
+        self.write_command(Command("C_GOTO", label))
 
     def write_if(self, label: str) -> None:
         """Write a VM if-goto command.
@@ -88,7 +164,7 @@ class VMWriter:
         Args:
             label (str): The label to go to
         """
-        self.out_file.write(f"if-goto {label}\n")
+        self.write_command(Command("C_IF", label))
 
     def write_call(self, name: str, n_args: int) -> None:
         """Write a VM call command.
@@ -97,7 +173,7 @@ class VMWriter:
             name (str): The function name to call
             n_args (int): The number of arguments
         """
-        self.out_file.write(f"call {name} {n_args}\n")
+        self.write_command(Command("C_CALL", name, n_args))
 
     def write_function(self, name: str, n_locals: int) -> None:
         """Write a VM function command.
@@ -106,12 +182,13 @@ class VMWriter:
             name (str): The name of the function to write
             n_locals (int): The number of local variables
         """
-        self.out_file.write(f"function {name} {n_locals}\n")
+        self.write_command(Command("C_FUNCTION", name, n_locals))
 
     def write_return(self) -> None:
         """Write a VM return command."""
-        self.out_file.write("return\n")
+        self.write_command(Command("C_RETURN"))
 
     def close(self) -> None:
         """Close the output file."""
-        self.out_file.close()
+        if self.out_file is not None:
+            self.out_file.close()
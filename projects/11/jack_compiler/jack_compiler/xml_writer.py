@@ -0,0 +1,481 @@
+"""Module containing the XMLWriter class."""
+
+from typing import List, Literal, TextIO
+
+from jack_compiler import KIND
+from jack_compiler.jack_tokenizer import KEYWORDS
+from jack_compiler.symbol_table import SymbolTable
+from jack_compiler.syntax_tree import (
+    ArrayEntry,
+    BinaryOp,
+    Class,
+    ClassVarDec,
+    DoStatement,
+    Expression,
+    IfStatement,
+    IntegerConstant,
+    KeywordConstant,
+    LetStatement,
+    NodeVisitor,
+    Parameter,
+    ParenthesizedExpression,
+    ReturnStatement,
+    Statement,
+    StringConstant,
+    SubroutineCall,
+    SubroutineDec,
+    UnaryOp,
+    VarDec,
+    VarName,
+    WhileStatement,
+)
+
+TerminalElement = Literal[
+    "keyword", "symbol", "integerConstant", "stringConstant", "identifier"
+]
+
+NonTerminalElement = Literal[
+    "class",
+    "classVarDec",
+    "subroutineDec",
+    "parameterList",
+    "subroutineBody",
+    "varDec",
+    "statements",
+    "letStatement",
+    "ifStatement",
+    "whileStatement",
+    "doStatement",
+    "returnStatement",
+    "expression",
+    "term",
+    "expressionList",
+]
+
+
+class XMLWriter(NodeVisitor):  # pylint: disable=too-many-public-methods
+    """Class which writes the parse tree of a syntax tree as XML.
+
+    By default the identifiers are annotated with their kind, their running index and whether
+    they are defined or used, for example <var_0_definition> x </var_0_definition>.
+    Classes and subroutines are annotated as class and subroutine.
+    Without annotations the parse tree is the one of project 10.
+    """
+
+    def __init__(self, out_file: TextIO, annotate: bool = True) -> None:
+        """Create a new XML writer.
+
+        Args:
+            out_file (TextIO): Stream to the .xml output file
+            annotate (bool, optional): Whether or not to annotate the identifiers.
+                Defaults to True.
+        """
+        self._out_file = out_file
+        self._annotate = annotate
+        self._indent = 0
+        self._symbol_tables = {"class": SymbolTable(), "subroutine": SymbolTable()}
+
+    def write_terminal(self, token_type: TerminalElement, token: str) -> None:
+        """Write a token wrapped by its type.
+
+        Args:
+            token_type (TerminalElement): The type to use as a tag
+            token (str): The body inside the tag.
+                <, >, ", and & are outputted as &lt;, &gt;, &quot;, and &amp;
+        """
+        token = (
+            token.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;")
+        )
+        self._out_file.write(
+            f"{' '*self._indent}<{token_type}> {token} </{token_type}>\n"
+        )
+
+    def write_identifier(
+        self, name: str, subroutine: bool = False, definition: bool = False
+    ) -> None:
+        """Write an identifier.
+
+        Args:
+            name (str): The identifier
+            subroutine (bool, optional): Whether or not the identifier names a subroutine
+                when it is not a variable. Defaults to False.
+            definition (bool, optional): Whether an identifier is being defined or used.
+                Defaults to False.
+        """
+        if not self._annotate:
+            self.write_terminal("identifier", name)
+            return
+        usage = "definition" if definition else "usage"
+        # Search first in the subroutine table, then in the class table
+        for table in (self._symbol_tables["subroutine"], self._symbol_tables["class"]):
+            kind = table.kind_of(name)
+            if kind is not None:
+                tag = f"{kind.lower()}_{table.index_of(name)}_{usage}"
+                break
+        else:
+            tag = f"{'subroutine' if subroutine else 'class'}_{usage}"
+        # Type ignore as the annotated tags are not terminal elements of the grammar
+        self.write_terminal(tag, name)  # type: ignore
+
+    def _write_type(self, var_type: str) -> None:
+        """Write a type, which is either a keyword or the name of a class.
+
+        Args:
+            var_type (str): The type
+        """
+        if var_type.upper() in KEYWORDS:
+            self.write_terminal("keyword", var_type)
+        else:
+            self.write_identifier(var_type)
+
+    def _write_definition(self, var_type: str, name: str, kind: KIND) -> None:
+        """Define a variable, and write its name.
+
+        Args:
+            var_type (str): The type of the variable
+            name (str): The name of the variable
+            kind (KIND): The kind of the variable
+        """
+        table = self._symbol_tables[
+            "class" if kind in ("STATIC", "FIELD") else "subroutine"
+        ]
+        table.define(name=name, identifier_type=var_type, kind=kind)
+        self.write_identifier(name, definition=True)
+
+    def _open_grammar(self, grammar_type: NonTerminalElement) -> None:
+        """Open a grammar body.
+
+        Args:
+            grammar_type (NonTerminalElement): The grammar tag
+        """
+        self._out_file.write(f"{' '*self._indent}<{grammar_type}>\n")
+        self._indent += 2
+
+    def _close_grammar(self, grammar_type: NonTerminalElement) -> None:
+        """Close the grammar body.
+
+        Args:
+            grammar_type (NonTerminalElement): The grammar tag
+        """
+        self._indent = max(0, self._indent - 2)
+        self._out_file.write(f"{' '*self._indent}</{grammar_type}>\n")
+
+    def visit_class(self, node: Class) -> None:
+        """Write a class.
+
+        Args:
+            node (Class): The class
+        """
+        self._open_grammar("class")
+        self.write_terminal("keyword", "class")
+        self.write_identifier(node.name, definition=True)
+        self.write_terminal("symbol", "{")
+        for class_var_dec in node.class_var_decs:
+            self.visit(class_var_dec)
+        for subroutine_dec in node.subroutine_decs:
+            self.visit(subroutine_dec)
+        self.write_terminal("symbol", "}")
+        self._close_grammar("class")
+
+    def visit_class_var_dec(self, node: ClassVarDec) -> None:
+        """Write a static or field variable declaration.
+
+        Args:
+            node (ClassVarDec): The declaration
+        """
+        self._open_grammar("classVarDec")
+        self.write_terminal("keyword", node.kind)
+        self._write_type(node.var_type)
+        for index, name in enumerate(node.names):
+            if index > 0:
+                self.write_terminal("symbol", ",")
+            # Type ignore as mypy doesn't detect that the kind is either STATIC or FIELD
+            self._write_definition(node.var_type, name, node.kind.upper())  # type: ignore
+        self.write_terminal("symbol", ";")
+        self._close_grammar("classVarDec")
+
+    def visit_subroutine_dec(self, node: SubroutineDec) -> None:
+        """Write a method, function or constructor.
+
+        Args:
+            node (SubroutineDec): The subroutine
+        """
+        self._symbol_tables["subroutine"] = SymbolTable()
+        self._open_grammar("subroutineDec")
+        self.write_terminal("keyword", node.subroutine_type)
+        if node.subroutine_type == "method":
+            # Populate the symbol table with the implicit `this`
+            self._symbol_tables["subroutine"].define(
+                name="this", identifier_type="", kind="ARG"
+            )
+        self._write_type(node.return_type)
+        self.write_identifier(node.name, subroutine=True, definition=True)
+        self.write_terminal("symbol", "(")
+
+        self._open_grammar("parameterList")
+        if self._annotate and node.parameters and node.subroutine_type == "method":
+            # The implicit `this` parameter is written in front of the other parameters
+            self.write_identifier("myClass")
+            self.write_identifier("this", definition=True)
+            self.write_terminal("symbol", ",")
+        for index, parameter in enumerate(node.parameters):
+            if index > 0:
+                self.write_terminal("symbol", ",")
+            self.visit(parameter)
+        self._close_grammar("parameterList")
+
+        self.write_terminal("symbol", ")")
+
+        self._open_grammar("subroutineBody")
+        self.write_terminal("symbol", "{")
+        for var_dec in node.var_decs:
+            self.visit(var_dec)
+        # NOTE: The annotated parse tree leaves out the statements of empty bodies
+        if node.statements or not self._annotate:
+            self._write_statements(node.statements)
+        self.write_terminal("symbol", "}")
+        self._close_grammar("subroutineBody")
+
+        self._close_grammar("subroutineDec")
+
+    def visit_parameter(self, node: Parameter) -> None:
+        """Write a parameter.
+
+        Args:
+            node (Parameter): The parameter
+        """
+        self._write_type(node.var_type)
+        self._write_definition(node.var_type, node.name, "ARG")
+
+    def visit_var_dec(self, node: VarDec) -> None:
+        """Write a var declaration.
+
+        Args:
+            node (VarDec): The declaration
+        """
+        self._open_grammar("varDec")
+        self.write_terminal("keyword", "var")
+        self._write_type(node.var_type)
+        for index, name in enumerate(node.names):
+            if index > 0:
+                self.write_terminal("symbol", ",")
+            self._write_definition(node.var_type, name, "VAR")
+        self.write_terminal("symbol", ";")
+        self._close_grammar("varDec")
+
+    def _write_statements(self, statements: List[Statement]) -> None:
+        """Write a sequence of statements.
+
+        Args:
+            statements (List[Statement]): The statements
+        """
+        self._open_grammar("statements")
+        for statement in statements:
+            self.visit(statement)
+        self._close_grammar("statements")
+
+    def _write_body(self, statements: List[Statement]) -> None:
+        """Write '{statements}'.
+
+        Args:
+            statements (List[Statement]): The statements
+        """
+        self.write_terminal("symbol", "{")
+        self._write_statements(statements)
+        self.write_terminal("symbol", "}")
+
+    def visit_let_statement(self, node: LetStatement) -> None:
+        """Write a let statement.
+
+        Args:
+            node (LetStatement): The statement
+        """
+        self._open_grammar("letStatement")
+        self.write_terminal("keyword", "let")
+        self.write_identifier(node.name)
+        if node.subscript is not None:
+            self.write_terminal("symbol", "[")
+            self._write_expression(node.subscript)
+            self.write_terminal("symbol", "]")
+        self.write_terminal("symbol", "=")
+        self._write_expression(node.value)
+        self.write_terminal("symbol", ";")
+        self._close_grammar("letStatement")
+
+    def visit_if_statement(self, node: IfStatement) -> None:
+        """Write an if statement.
+
+        Args:
+            node (IfStatement): The statement
+        """
+        self._open_grammar("ifStatement")
+        self.write_terminal("keyword", "if")
+        self.write_terminal("symbol", "(")
+        self._write_expression(node.condition)
+        self.write_terminal("symbol", ")")
+        self._write_body(node.statements)
+        if node.else_statements is not None:
+            self.write_terminal("keyword", "else")
+            self._write_body(node.else_statements)
+        self._close_grammar("ifStatement")
+
+    def visit_while_statement(self, node: WhileStatement) -> None:
+        """Write a while statement.
+
+        Args:
+            node (WhileStatement): The statement
+        """
+        self._open_grammar("whileStatement")
+        self.write_terminal("keyword", "while")
+        self.write_terminal("symbol", "(")
+        self._write_expression(node.condition)
+        self.write_terminal("symbol", ")")
+        self._write_body(node.statements)
+        self._close_grammar("whileStatement")
+
+    def visit_do_statement(self, node: DoStatement) -> None:
+        """Write a do statement.
+
+        Args:
+            node (DoStatement): The statement
+        """
+        self._open_grammar("doStatement")
+        self.write_terminal("keyword", "do")
+        self.visit(node.call)
+        self.write_terminal("symbol", ";")
+        self._close_grammar("doStatement")
+
+    def visit_return_statement(self, node: ReturnStatement) -> None:
+        """Write a return statement.
+
+        Args:
+            node (ReturnStatement): The statement
+        """
+        self._open_grammar("returnStatement")
+        self.write_terminal("keyword", "return")
+        if node.value is not None:
+            self._write_expression(node.value)
+        self.write_terminal("symbol", ";")
+        self._close_grammar("returnStatement")
+
+    def _write_expression(self, node: Expression) -> None:
+        """Write an expression as a sequence of terms separated by the operators.
+
+        Args:
+            node (Expression): The expression
+        """
+        self._open_grammar("expression")
+        # The left operands are the nested binary operations
+        operations: List[BinaryOp] = []
+        while isinstance(node, BinaryOp):
+            operations.append(node)
+            node = node.left
+        self._write_term(node)
+        for operation in reversed(operations):
+            self.write_terminal("symbol", operation.op)
+            self._write_term(operation.right)
+        self._close_grammar("expression")
+
+    def _write_term(self, node: Expression) -> None:
+        """Write a term.
+
+        Args:
+            node (Expression): The term
+        """
+        self._open_grammar("term")
+        self.visit(node)
+        self._close_grammar("term")
+
+    def visit_integer_constant(self, node: IntegerConstant) -> None:
+        """Write an integer constant.
+
+        Args:
+            node (IntegerConstant): The constant
+        """
+        self.write_terminal("integerConstant", str(node.value))
+
+    def visit_string_constant(self, node: StringConstant) -> None:
+        """Write a string constant.
+
+        Args:
+            node (StringConstant): The constant
+        """
+        self.write_terminal("stringConstant", node.value)
+
+    def visit_keyword_constant(self, node: KeywordConstant) -> None:
+        """Write a keyword constant.
+
+        Args:
+            node (KeywordConstant): The constant
+        """
+        self.write_terminal("keyword", node.keyword)
+
+    def visit_var_name(self, node: VarName) -> None:
+        """Write a variable.
+
+        Args:
+            node (VarName): The variable
+        """
+        self.write_identifier(node.name)
+
+    def visit_array_entry(self, node: ArrayEntry) -> None:
+        """Write an array entry.
+
+        Args:
+            node (ArrayEntry): The array entry
+        """
+        self.write_identifier(node.name)
+        self.write_terminal("symbol", "[")
+        self._write_expression(node.subscript)
+        self.write_terminal("symbol", "]")
+
+    def visit_subroutine_call(self, node: SubroutineCall) -> None:
+        """Write a subroutine call.
+
+        Args:
+            node (SubroutineCall): The call
+        """
+        if node.receiver is not None:
+            self.write_identifier(node.receiver)
+            self.write_terminal("symbol", ".")
+        self.write_identifier(node.name, subroutine=True)
+        self.write_terminal("symbol", "(")
+        self._open_grammar("expressionList")
+        for index, argument in enumerate(node.arguments):
+            if index > 0:
+                self.write_terminal("symbol", ",")
+            self._write_expression(argument)
+        self._close_grammar("expressionList")
+        self.write_terminal("symbol", ")")
+
+    def visit_unary_op(self, node: UnaryOp) -> None:
+        """Write a unary operation.
+
+        Args:
+            node (UnaryOp): The operation
+        """
+        self.write_terminal("symbol", node.op)
+        self._write_term(node.operand)
+
+    def visit_parenthesized_expression(self, node: ParenthesizedExpression) -> None:
+        """Write an expression enclosed in parentheses.
+
+        Args:
+            node (ParenthesizedExpression): The expression
+        """
+        self.write_terminal("symbol", "(")
+        self._write_expression(node.expression)
+        self.write_terminal("symbol", ")")
+
+    def visit_binary_op(self, node: BinaryOp) -> None:
+        """Write a binary operation as a parenthesized expression.
+
+        Binary operations are only terms when they are created by the passes.
+
+        Args:
+            node (BinaryOp): The operation
+        """
+        self.visit_parenthesized_expression(ParenthesizedExpression(node))
@@ -19,22 +19,32 @@ def fixture_data_path() -> Path:
 
 @pytest.fixture(scope="session", name="array_test_path")
 def fixture_array_test_path() -> Path:
-    """Return the path to the ArrayTest directory.
+    """Return the path to the ArrayTest directory of project 10.
 
     Returns:
         Path: Path to the ArrayTest directory
     """
-    return Path(__file__).parents[2].joinpath("ArrayTest").resolve()
+    return Path(__file__).parents[3].joinpath("10", "ArrayTest").resolve()
 
 
 @pytest.fixture(scope="session", name="expression_less_square_path")
 def fixture_expression_less_square_path() -> Path:
-    """Return the path to the ExpressionLessSquare directory.
+    """Return the path to the ExpressionLessSquare directory of project 10.
 
     Returns:
         Path: Path to the ExpressionLessSquare directory
     """
-    return Path(__file__).parents[2].joinpath("ExpressionLessSquare").resolve()
+    return Path(__file__).parents[3].joinpath("10", "ExpressionLessSquare").resolve()
+
+
+@pytest.fixture(scope="session", name="reference_square_path")
+def fixture_reference_square_path() -> Path:
+    """Return the path to the Square directory of project 10 containing the parse trees.
+
+    Returns:
+        Path: Path to the Square directory of project 10
+    """
+    return Path(__file__).parents[3].joinpath("10", "Square").resolve()
 
 
 @pytest.fixture(scope="session", name="square_path")
@@ -52,7 +62,7 @@ def fixture_get_paths(
     tmp_path: Path,
     array_test_path: Path,
     expression_less_square_path: Path,
-    square_path: Path,
+    reference_square_path: Path,
 ) -> Callable[[TestNames], Tuple[Dict[TestFiles, Path], ...]]:
     """Return the get paths function.
 
@@ -60,7 +70,7 @@ def fixture_get_paths(
         tmp_path (Path): Path to temporary directory
         array_test_path (Path): Path to the ArrayTest directory
         expression_less_square_path (Path): Path to the ExpressionLessSquare directory
-        square_path (Path): Path to the Square directory
+        reference_square_path (Path): Path to the Square directory of project 10
 
     Returns:
         Callable[[TestNames], Tuple[Dict[TestFiles, Path], ...]]:
@@ -107,24 +117,26 @@ def fixture_get_paths(
         ),
         "square": (
             {
-                "in_path": square_path.joinpath("Main.jack"),
-                "expected_token_path": square_path.joinpath("MainT.xml"),
+                "in_path": reference_square_path.joinpath("Main.jack"),
+                "expected_token_path": reference_square_path.joinpath("MainT.xml"),
                 "out_token_path": tmp_path.joinpath("MainT.xml"),
-                "expected_path": square_path.joinpath("Main.xml"),
+                "expected_path": reference_square_path.joinpath("Main.xml"),
                 "out_path": tmp_path.joinpath("Main.xml"),
             },
             {
-                "in_path": square_path.joinpath("Square.jack"),
-                "expected_token_path": square_path.joinpath("SquareT.xml"),
+                "in_path": reference_square_path.joinpath("Square.jack"),
+                "expected_token_path": reference_square_path.joinpath("SquareT.xml"),
                 "out_token_path": tmp_path.joinpath("SquareT.xml"),
-                "expected_path": square_path.joinpath("Square.xml"),
+                "expected_path": reference_square_path.joinpath("Square.xml"),
                 "out_path": tmp_path.joinpath("Square.xml"),
             },
             {
-                "in_path": square_path.joinpath("SquareGame.jack"),
-                "expected_token_path": square_path.joinpath("SquareGameT.xml"),
+                "in_path": reference_square_path.joinpath("SquareGame.jack"),
+                "expected_token_path": reference_square_path.joinpath(
+                    "SquareGameT.xml"
+                ),
                 "out_token_path": tmp_path.joinpath("SquareGameT.xml"),
-                "expected_path": square_path.joinpath("SquareGame.xml"),
+                "expected_path": reference_square_path.joinpath("SquareGame.xml"),
                 "out_path": tmp_path.joinpath("SquareGame.xml"),
             },
         ),
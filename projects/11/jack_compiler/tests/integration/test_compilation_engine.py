@@ -1,11 +1,25 @@
 """Module containing test for the CompilationEngine."""
 # pylint: disable=protected-access
 
+import gc
+from io import StringIO
 from pathlib import Path
+from typing import Callable, Dict, List, Tuple, get_args
 
 import pytest
 from jack_compiler.compilation_engine import CompilationEngine
 from jack_compiler.jack_tokenizer import JackTokenizer
+from jack_compiler.syntax_tree import (
+    BinaryOp,
+    Class,
+    IntegerConstant,
+    ParenthesizedExpression,
+    ReturnStatement,
+    VarName,
+)
+from jack_compiler.vm_writer import Command
+from jack_compiler.xml_writer import XMLWriter
+from tests import TestFiles, TestNames
 
 
 @pytest.mark.parametrize("test_name", ("class1", "class2", "class3"))
@@ -25,6 +39,7 @@ def test_class_compile(tmp_path: Path, data_path: Path, test_name: str) -> None:
                 jack_tokenizer=jack_tokenizer, out_file=out_file
             )
             compilation_engine.compile_class()
+            compilation_engine.close()
 
     with data_path.joinpath(f"{test_name}.xml").open(encoding="utf-8") as expected_file:
         expected = expected_file.readlines()
@@ -33,3 +48,138 @@ def test_class_compile(tmp_path: Path, data_path: Path, test_name: str) -> None:
         result = result_file.readlines()
 
     assert expected == result
+
+
+@pytest.mark.parametrize("class_name", ("Main", "Square", "SquareGame"))
+def test_class_compile_without_xml(square_path: Path, class_name: str) -> None:
+    """Test that the VM code is the same whether or not the XML is written.
+
+    Args:
+        square_path (Path): Path to the Square directory
+        class_name (str): Name of the class to compile
+    """
+    vm_codes = []
+    for out_file in (StringIO(), None):
+        vm_file = StringIO()
+        with square_path.joinpath(f"{class_name}.jack").open(
+            encoding="utf-8"
+        ) as in_file:
+            compilation_engine = CompilationEngine(
+                jack_tokenizer=JackTokenizer(in_file=in_file),
+                out_file=out_file,
+                vm_file=vm_file,
+            )
+            compilation_engine.compile_class()
+            # NOTE: The VM writer closes the stream when the engine is deleted
+            vm_codes.append(vm_file.getvalue())
+    assert vm_codes[0] == vm_codes[1]
+    assert vm_codes[0].startswith("function ")
+
+
+def test_no_output() -> None:
+    """Test that the engine refuses to compile without any output."""
+    with pytest.raises(ValueError, match="must be given"):
+        CompilationEngine(jack_tokenizer=JackTokenizer(StringIO("class Main { }")))
+
+
+def test_close(tmp_path: Path) -> None:
+    """Test that only the .vm file opened by the engine is closed.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    vm_file = StringIO()
+    compilation_engine = CompilationEngine(
+        jack_tokenizer=JackTokenizer(StringIO("class Main { }")), vm_file=vm_file
+    )
+    compilation_engine.compile_class()
+    compilation_engine.close()
+    del compilation_engine
+    gc.collect()
+    assert not vm_file.closed
+
+    with tmp_path.joinpath("Main.xml").open("w") as out_file:
+        compilation_engine = CompilationEngine(
+            jack_tokenizer=JackTokenizer(StringIO("class Main { }")), out_file=out_file
+        )
+        compilation_engine.compile_class()
+        opened_vm_file = compilation_engine._opened_vm_file
+        compilation_engine.close()
+    assert opened_vm_file is not None and opened_vm_file.closed
+
+
+@pytest.mark.parametrize("name", get_args(TestNames))
+def test_parse_tree_project_10(
+    get_paths: Callable[[TestNames], Tuple[Dict[TestFiles, Path], ...]],
+    name: TestNames,
+) -> None:
+    """Test that the syntax tree gives the parse trees of project 10 without annotations.
+
+    Args:
+        get_paths (Callable[[TestNames], Tuple[Dict[TestFiles, Path], ...]]):
+            Paths to the input, temp-files and expected output files
+        name (TestNames): Name of the paths to return
+    """
+    for test_path_group in get_paths(name):
+        with test_path_group["in_path"].open(encoding="utf-8") as in_file:
+            compilation_engine = CompilationEngine(
+                jack_tokenizer=JackTokenizer(in_file=in_file), vm_sink=lambda _: None
+            )
+            syntax_tree = compilation_engine.parse_class()
+        out_file = StringIO()
+        XMLWriter(out_file, annotate=False).visit(syntax_tree)
+        assert out_file.getvalue() == test_path_group["expected_path"].read_text(
+            encoding="utf-8"
+        )
+
+
+def test_parse_expression() -> None:
+    """Test that expressions are parsed from left to the right."""
+    compilation_engine = CompilationEngine(
+        jack_tokenizer=JackTokenizer(
+            StringIO("class Main { function int f(int a) { return 1 + a * (a - 2); } }")
+        ),
+        vm_sink=lambda _: None,
+    )
+    syntax_tree = compilation_engine.parse_class()
+    assert syntax_tree.subroutine_decs[0].statements == [
+        ReturnStatement(
+            BinaryOp(
+                BinaryOp(IntegerConstant(1), "+", VarName("a")),
+                "*",
+                ParenthesizedExpression(
+                    BinaryOp(VarName("a"), "-", IntegerConstant(2))
+                ),
+            )
+        )
+    ]
+
+
+def test_passes() -> None:
+    """Test that the passes transform the syntax tree before the code generation."""
+
+    def rename(syntax_tree: Class) -> Class:
+        """Rename the class.
+
+        Args:
+            syntax_tree (Class): The syntax tree
+
+        Returns:
+            Class: The syntax tree of the renamed class
+        """
+        return syntax_tree._replace(name="Renamed")
+
+    commands: List[Command] = []
+    out_file = StringIO()
+    compilation_engine = CompilationEngine(
+        jack_tokenizer=JackTokenizer(
+            StringIO("class Main { function void f() { return; } }")
+        ),
+        out_file=out_file,
+        vm_sink=commands.append,
+        passes=(rename,),
+    )
+    compilation_engine.compile_class()
+    assert commands[0].arg1 == "Renamed.f"
+    # The parse tree is written before the passes
+    assert "<class_definition> Main </class_definition>" in out_file.getvalue()
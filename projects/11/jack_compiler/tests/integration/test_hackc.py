@@ -0,0 +1,100 @@
+"""Module containing test for the hackc driver."""
+
+import shutil
+from importlib import import_module
+from pathlib import Path
+from typing import List
+
+import pytest
+from jack_compiler.hackc import compile_class, main
+from jack_compiler.jack_compiler import main as jack_compiler_main
+from jack_compiler.vm_writer import Command
+
+
+@pytest.mark.parametrize("optimize", (False, True))
+def test_main_pipeline(tmp_path: Path, square_path: Path, optimize: bool) -> None:
+    """Test that hackc gives the same machine code as the tools run one after another.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+        optimize (bool): Whether or not to fuse common sequences of VM commands
+    """
+    pipeline_path = tmp_path.joinpath("pipeline", "Square")
+    hackc_path = tmp_path.joinpath("hackc", "Square")
+    shutil.copytree(square_path, pipeline_path)
+    shutil.copytree(square_path, hackc_path)
+
+    # NOTE: The tools of the earlier projects are importable once hackc has been imported
+    jack_compiler_main(pipeline_path)
+    import_module("vm_translator.vm_translator").main(
+        pipeline_path, optimize=optimize, trampolines=True
+    )
+    import_module("assembler.assembler").main(pipeline_path.joinpath("Square.asm"))
+
+    out_path = main(hackc_path, optimize=optimize, trampolines=True)
+    assert out_path == hackc_path.joinpath("Square.hack")
+    assert out_path.read_text() == pipeline_path.joinpath("Square.hack").read_text()
+    # No intermediate files are written by default
+    assert sorted(path.suffix for path in hackc_path.iterdir()) == [
+        ".hack",
+        ".jack",
+        ".jack",
+        ".jack",
+    ]
+
+
+def test_main_keep(tmp_path: Path, square_path: Path) -> None:
+    """Test that the intermediate files are written on request.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+    """
+    shutil.copytree(square_path, tmp_path, dirs_exist_ok=True)
+    out_path = main(tmp_path.joinpath("Main.jack"), keep=("vm", "asm"))
+    assert out_path == tmp_path.joinpath("Main.hack")
+    assert tmp_path.joinpath("Main.vm").read_text().startswith("function Main.main")
+    # A single file is compiled without the bootstrap code
+    assert tmp_path.joinpath("Main.asm").read_text().startswith("(Main.main)")
+    assert not tmp_path.joinpath("Main.xml").exists()
+
+
+def test_main_vm_files(tmp_path: Path, square_path: Path) -> None:
+    """Test that the .vm files without a .jack file are included.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+    """
+    shutil.copytree(square_path, tmp_path, dirs_exist_ok=True)
+    tmp_path.joinpath("Sys.vm").write_text("function Sys.init 0\ncall Main.main 0\n")
+    # A stale .vm file of a class is ignored
+    tmp_path.joinpath("Main.vm").write_text("function Main.stale 0\n")
+    main(tmp_path, keep=("asm",))
+    asm = tmp_path.joinpath(f"{tmp_path.name}.asm").read_text()
+    assert "(Sys.init)" in asm
+    assert "(Main.main)" in asm
+    assert "(Main.stale)" not in asm
+
+
+@pytest.mark.parametrize("class_name", ("Main", "Square", "SquareGame"))
+def test_compile_class_stream(
+    tmp_path: Path, square_path: Path, class_name: str
+) -> None:
+    """Test that the streamed commands are the commands parsed from the written .vm file.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+        class_name (str): Name of the class to compile
+    """
+    in_path = tmp_path.joinpath(f"{class_name}.jack")
+    shutil.copy(square_path.joinpath(in_path.name), in_path)
+    commands: List[Command] = []
+    compile_class(in_path, commands.append, keep=("vm",))
+
+    parser = import_module("vm_translator.parser")
+    assert Command._fields == parser.Command._fields
+    assert commands == list(parser.Parser(str(in_path.with_suffix(".vm"))))
+    assert len(commands) > 0
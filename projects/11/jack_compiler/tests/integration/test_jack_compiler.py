@@ -0,0 +1,114 @@
+"""Module containing test for the jack_compiler functions."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from jack_compiler.build_cache import BuildCache
+from jack_compiler.jack_compiler import main
+
+
+def test_main_jobs(tmp_path: Path, square_path: Path) -> None:
+    """Test that the parallel compilation is identical to the serial compilation.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+    """
+    serial_path = tmp_path.joinpath("serial")
+    parallel_path = tmp_path.joinpath("parallel")
+    shutil.copytree(square_path, serial_path)
+    shutil.copytree(square_path, parallel_path)
+
+    main(serial_path)
+    main(parallel_path, jobs=2)
+
+    for class_name in ("Main", "Square", "SquareGame"):
+        vm_file = f"{class_name}.vm"
+        assert (
+            serial_path.joinpath(vm_file).read_text()
+            == parallel_path.joinpath(vm_file).read_text()
+        )
+
+
+def test_main_jobs_error(tmp_path: Path, square_path: Path) -> None:
+    """Test that the parallel compilation reports the classes which failed.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+    """
+    shutil.copytree(square_path, tmp_path, dirs_exist_ok=True)
+    # The compilation engine does not accept empty files
+    tmp_path.joinpath("Broken.jack").write_text("")
+
+    with pytest.raises(RuntimeError, match="Broken: "):
+        main(tmp_path, jobs=2)
+    # The other classes are compiled
+    assert tmp_path.joinpath("SquareGame.vm").is_file()
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_main_cache(tmp_path: Path, square_path: Path, jobs: int) -> None:
+    """Test that the outputs restored from the build cache are identical to the compiled outputs.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+        jobs (int): Number of processes compiling the classes in parallel
+    """
+    in_path = tmp_path.joinpath("Square")
+    shutil.copytree(square_path, in_path)
+    cache = BuildCache(tmp_path.joinpath("cache"))
+    main(in_path, jobs=jobs, cache=cache)
+    # One entry per class
+    assert len(list(cache.directory.iterdir())) == 3
+
+    expected = {}
+    for out_path in (*in_path.glob("*.vm"), *in_path.glob("*.xml")):
+        expected[out_path.name] = out_path.read_bytes()
+        out_path.unlink()
+    main(in_path, jobs=jobs, cache=cache)
+    assert len(list(cache.directory.iterdir())) == 3
+    for name, content in expected.items():
+        assert in_path.joinpath(name).read_bytes() == content
+    assert b"function Main.main" in expected["Main.vm"]
+
+
+def test_main_token_cache(tmp_path: Path, square_path: Path) -> None:
+    """Test that the outputs compiled from the persisted tokens are identical.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+    """
+    shutil.copytree(square_path, tmp_path, dirs_exist_ok=True)
+    main(tmp_path)
+    expected = {path.name: path.read_bytes() for path in tmp_path.glob("*.vm")}
+
+    for _ in range(2):
+        main(tmp_path, token_cache=True)
+        for name, content in expected.items():
+            assert tmp_path.joinpath(name).read_bytes() == content
+    assert sorted(path.name for path in tmp_path.glob(".*.tokens")) == [
+        ".Main.jack.tokens",
+        ".Square.jack.tokens",
+        ".SquareGame.jack.tokens",
+    ]
+
+
+@pytest.mark.parametrize("xml", (False, True))
+def test_main_xml(tmp_path: Path, square_path: Path, xml: bool) -> None:
+    """Test that the parse tree is only written on request.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+        square_path (Path): Path to the Square directory
+        xml (bool): Whether or not to write the parse tree
+    """
+    shutil.copytree(square_path, tmp_path, dirs_exist_ok=True)
+    main(tmp_path, xml=xml)
+    assert len(list(tmp_path.glob("*.vm"))) == 3
+    assert len(list(tmp_path.glob("*.xml"))) == (3 if xml else 0)
+    if xml:
+        assert tmp_path.joinpath("Main.xml").read_text().startswith("<class>")
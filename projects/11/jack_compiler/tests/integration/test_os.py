@@ -0,0 +1,79 @@
+"""Module containing tests of the operating system of project 12 run on the Hack emulator."""
+
+import shutil
+from importlib import import_module
+from pathlib import Path
+
+from jack_compiler.hackc import translate
+
+# The result of the programs is poked to this address
+RESULT_ADDRESS = 8000
+
+SYS_JACK = """
+class Sys {
+    function void init() {
+        do Memory.init();
+        do Main.main();
+        while (true) {}
+        return;
+    }
+
+    function void error(int errorCode) {
+        do Memory.poke(8000, -errorCode);
+        while (true) {}
+        return;
+    }
+}
+"""
+
+MAIN_JACK = """
+class Main {
+    function void main() {
+        var Array a, b;
+        var int i, sum;
+        let a = Memory.alloc(5);
+        while (i < 5) {
+            let a[i] = i + 1;
+            let i = i + 1;
+        }
+        let b = Memory.alloc(3);
+        let i = 0;
+        while (i < 3) {
+            let b[i] = 100;
+            let i = i + 1;
+        }
+        let i = 0;
+        while (i < 5) {
+            let sum = sum + a[i];
+            let i = i + 1;
+        }
+        do Memory.poke(8000, sum);
+        return;
+    }
+}
+"""
+
+
+def test_memory_alloc(tmp_path: Path) -> None:
+    """Test that the blocks allocated by Memory.alloc do not overlap.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    os_path = Path(__file__).parents[4].joinpath("12")
+    shutil.copy(os_path.joinpath("Memory.jack"), tmp_path)
+    tmp_path.joinpath("Sys.jack").write_text(SYS_JACK)
+    tmp_path.joinpath("Main.jack").write_text(MAIN_JACK)
+
+    # NOTE: The tools of the earlier projects are importable once hackc has been imported
+    asm_code = translate(
+        sorted(tmp_path.glob("*.jack")),
+        tmp_path.joinpath("Main.asm"),
+        bootstrap=True,
+    )
+    cpu = import_module("hack_emulator.cpu").CPU(
+        import_module("assembler.assembler").assemble(asm_code)
+    )
+    cpu.run(cycles=100_000)
+    # The values of the first block are not overwritten by the second block
+    assert cpu.ram[RESULT_ADDRESS] == 1 + 2 + 3 + 4 + 5
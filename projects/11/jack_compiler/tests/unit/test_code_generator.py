@@ -0,0 +1,263 @@
+"""Module unit testing the CodeGenerator."""
+
+from typing import Dict, List
+
+import pytest
+from jack_compiler.code_generator import CodeGenerator
+from jack_compiler.syntax_tree import (
+    BinaryOp,
+    Class,
+    ClassVarDec,
+    DoStatement,
+    Expression,
+    IntegerConstant,
+    Parameter,
+    ReturnStatement,
+    StringConstant,
+    SubroutineCall,
+    SubroutineDec,
+    UnaryOp,
+    VarDec,
+    VarName,
+)
+from jack_compiler.vm_writer import VMWriter, format_command
+
+
+def test_do_nested_call() -> None:
+    """Test that only the value returned by the call of a do statement is dumped."""
+    syntax_tree = Class(
+        name="Main",
+        class_var_decs=[],
+        subroutine_decs=[
+            SubroutineDec(
+                subroutine_type="function",
+                return_type="void",
+                name="main",
+                parameters=[],
+                var_decs=[VarDec("String", ["s"])],
+                statements=[
+                    DoStatement(
+                        SubroutineCall(
+                            "Output",
+                            "printChar",
+                            [SubroutineCall("s", "charAt", [VarName("s")])],
+                        )
+                    ),
+                    ReturnStatement(),
+                ],
+            )
+        ],
+    )
+    lines: List[str] = []
+    CodeGenerator(
+        VMWriter(sink=lambda command: lines.append(format_command(command)))
+    ).visit(syntax_tree)
+    assert "".join(lines) == (
+        "function Main.main 1\n"
+        "push local 0\n"
+        "push local 0\n"
+        "call String.charAt 2\n"
+        "call Output.printChar 1\n"
+        "pop temp 0\n"
+        "push constant 0\n"
+        "return\n"
+    )
+
+
+def generate(expression: Expression) -> List[str]:
+    """Generate the code of a function returning an expression with strength reduction.
+
+    Args:
+        expression (Expression): The returned expression, where x is the argument
+
+    Returns:
+        List[str]: The VM commands evaluating the expression
+    """
+    syntax_tree = Class(
+        name="Main",
+        class_var_decs=[],
+        subroutine_decs=[
+            SubroutineDec(
+                subroutine_type="function",
+                return_type="int",
+                name="f",
+                parameters=[Parameter("int", "x")],
+                var_decs=[],
+                statements=[ReturnStatement(expression)],
+            )
+        ],
+    )
+    lines: List[str] = []
+    CodeGenerator(
+        VMWriter(sink=lambda command: lines.append(format_command(command).strip())),
+        strength_reduction=True,
+    ).visit(syntax_tree)
+    # Strip the function declaration and the return
+    return lines[1:-1]
+
+
+def evaluate(commands: List[str], argument: int) -> int:
+    """Evaluate VM commands using the argument, constant and temp segments.
+
+    Args:
+        commands (List[str]): The VM commands
+        argument (int): The value of argument 0
+
+    Returns:
+        int: The 16 bit value on the top of the stack
+    """
+    stack: List[int] = []
+    segments: Dict[str, Dict[int, int]] = {"argument": {0: argument}, "temp": {}}
+    for command in commands:
+        words = command.split()
+        if words[0] == "push":
+            index = int(words[2])
+            stack.append(index if words[1] == "constant" else segments[words[1]][index])
+        elif words[0] == "pop":
+            segments[words[1]][int(words[2])] = stack.pop()
+        elif words[0] == "add":
+            stack.append(stack.pop() + stack.pop())
+        elif words[0] == "neg":
+            stack.append(-stack.pop())
+        else:
+            raise ValueError(f"Unexpected command {command}")
+    return ((stack.pop() + 0x8000) & 0xFFFF) - 0x8000
+
+
+@pytest.mark.parametrize("factor", (0, 1, 2, 3, 10, 11, 32, 129, 256, -1, -7, -64))
+def test_multiply_by_constant(factor: int) -> None:
+    """Test that multiplications by constants are computed with additions.
+
+    Args:
+        factor (int): The constant
+    """
+    constant: Expression = (
+        IntegerConstant(factor)
+        if factor >= 0
+        else UnaryOp("-", IntegerConstant(-factor))
+    )
+    for expression in (
+        BinaryOp(VarName("x"), "*", constant),
+        BinaryOp(constant, "*", VarName("x")),
+    ):
+        commands = generate(expression)
+        assert not any(command.startswith("call") for command in commands)
+        for x in (0, 1, -1, 7, -300, 1234, 32767, -32768):
+            assert evaluate(commands, x) == ((x * factor + 0x8000) & 0xFFFF) - 0x8000
+
+
+def test_multiply_by_power_of_two() -> None:
+    """Test that multiplying by a power of two only doubles the operand."""
+    assert generate(BinaryOp(VarName("x"), "*", IntegerConstant(4))) == [
+        "push argument 0",
+        "pop temp 0",
+        "push temp 0",
+        "push temp 0",
+        "add",
+        "pop temp 0",
+        "push temp 0",
+        "push temp 0",
+        "add",
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    (
+        (
+            BinaryOp(VarName("x"), "*", VarName("x")),
+            ["push argument 0", "push argument 0", "call Math.multiply 2"],
+        ),
+        (
+            BinaryOp(VarName("x"), "*", IntegerConstant(4097)),
+            ["push argument 0", "push constant 4097", "call Math.multiply 2"],
+        ),
+        (
+            BinaryOp(VarName("x"), "/", IntegerConstant(2)),
+            ["push argument 0", "push constant 2", "call Math.divide 2"],
+        ),
+        (BinaryOp(VarName("x"), "/", IntegerConstant(1)), ["push argument 0"]),
+        (
+            BinaryOp(VarName("x"), "/", UnaryOp("-", IntegerConstant(1))),
+            ["push argument 0", "neg"],
+        ),
+    ),
+)
+def test_reduce_strength(expression: Expression, expected: List[str]) -> None:
+    """Test which multiplications and divisions call the operating system.
+
+    Args:
+        expression (Expression): The operation
+        expected (List[str]): The expected VM commands
+    """
+    assert generate(expression) == expected
+
+
+def test_string_pool() -> None:
+    """Test that every distinct string constant is built once into a static variable."""
+    syntax_tree = Class(
+        name="Main",
+        class_var_decs=[ClassVarDec("static", "int", ["count"])],
+        subroutine_decs=[
+            SubroutineDec(
+                subroutine_type="function",
+                return_type="void",
+                name="main",
+                parameters=[],
+                var_decs=[],
+                statements=[
+                    DoStatement(
+                        SubroutineCall("Output", "printString", [StringConstant(value)])
+                    )
+                    for value in ("ab", "c", "ab")
+                ]
+                + [ReturnStatement()],
+            )
+        ],
+    )
+    lines: List[str] = []
+    CodeGenerator(
+        VMWriter(sink=lambda command: lines.append(format_command(command).strip())),
+        string_pool=True,
+    ).visit(syntax_tree)
+    build_ab = [
+        "push constant 2",
+        "call String.new 1",
+        "push constant 97",
+        "call String.appendChar 2",
+        "push constant 98",
+        "call String.appendChar 2",
+    ]
+    build_c = [
+        "push constant 1",
+        "call String.new 1",
+        "push constant 99",
+        "call String.appendChar 2",
+    ]
+    print_string = ["call Output.printString 1", "pop temp 0"]
+    assert lines == [
+        "function Main.main 0",
+        "push static 1",
+        "if-goto STRING_POOLED_L0",
+        *build_ab,
+        "pop static 1",
+        "label STRING_POOLED_L0",
+        "push static 1",
+        *print_string,
+        "push static 2",
+        "if-goto STRING_POOLED_L1",
+        *build_c,
+        "pop static 2",
+        "label STRING_POOLED_L1",
+        "push static 2",
+        *print_string,
+        "push static 1",
+        "if-goto STRING_POOLED_L2",
+        *build_ab,
+        "pop static 1",
+        "label STRING_POOLED_L2",
+        "push static 1",
+        *print_string,
+        "push constant 0",
+        "return",
+    ]
@@ -0,0 +1,142 @@
+"""Module unit testing the JackTokenizer."""
+
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from jack_compiler.jack_tokenizer import (
+    JackTokenizer,
+    load_tokens,
+    token_cache_path,
+    tokenize,
+)
+
+SOURCE = """/** A class
+ * with a block comment */
+class Main {
+    // A line comment with "quotes" and /* */
+    function void do_this() {
+        do Output.printString("// not a comment");
+        return 123456;
+    }
+}
+"""
+
+
+def test_tokenize() -> None:
+    """Test that the tokens, their types and their positions are found."""
+    tokens = tokenize(SOURCE)
+    assert tokens.values[:4] == ["class", "Main", "{", "function"]
+    assert tokens.types[:4] == ["KEYWORD", "IDENTIFIER", "SYMBOL", "KEYWORD"]
+    # Identifiers starting with a keyword are not split
+    index = tokens.values.index("do_this")
+    assert tokens.types[index] == "IDENTIFIER"
+    assert (tokens.lines[index], tokens.columns[index]) == (5, 18)
+    # The string constants are stripped of their double quotes
+    index = tokens.types.index("STRING_CONST")
+    assert tokens.values[index] == "// not a comment"
+    assert (tokens.lines[index], tokens.columns[index]) == (6, 30)
+    # Integer constants have at most 5 digits
+    index = tokens.types.index("INT_CONST")
+    assert tokens.values[index : index + 2] == ["12345", "6"]
+    assert tokens.values[-1] == "}"
+    assert len(tokens.values) == len(tokens.lines) == len(tokens.columns)
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    (
+        ("class Main { /* }", "<string>:1:13: Unterminated comment"),
+        ('let s = "abc\n";', "<string>:1:8: Unterminated string"),
+        ("let a = 1;\n  let b = $;", "<string>:2:10: Unexpected character '\\$'"),
+    ),
+)
+def test_tokenize_error(source: str, message: str) -> None:
+    """Test that invalid sources are reported with their position.
+
+    Args:
+        source (str): The invalid source
+        message (str): The expected error message
+    """
+    with pytest.raises(RuntimeError, match=message):
+        tokenize(source)
+
+
+def test_jack_tokenizer() -> None:
+    """Test that the tokenizer serves the tokens by index."""
+    jack_tokenizer = JackTokenizer(StringIO("class Main { }"))
+    assert jack_tokenizer.look_ahead() == "class"
+    with pytest.raises(RuntimeError, match="No current token"):
+        jack_tokenizer.token_type()
+
+    jack_tokenizer.advance()
+    assert jack_tokenizer.keyword() == "CLASS"
+    assert jack_tokenizer.position() == (1, 0)
+    assert jack_tokenizer.look_ahead() == "Main"
+    jack_tokenizer.advance()
+    assert jack_tokenizer.token_type() == "IDENTIFIER"
+    assert jack_tokenizer.identifier() == "Main"
+    jack_tokenizer.advance()
+    jack_tokenizer.advance()
+    assert jack_tokenizer.symbol() == "}"
+    assert not jack_tokenizer.has_more_tokens()
+    assert jack_tokenizer.look_ahead() is None
+    with pytest.raises(RuntimeError, match="no more tokens"):
+        jack_tokenizer.advance()
+
+    jack_tokenizer.reset()
+    jack_tokenizer.advance()
+    assert jack_tokenizer.identifier() == "class"
+
+
+def test_look_ahead_k() -> None:
+    """Test that the tokenizer can peek any number of tokens ahead."""
+    jack_tokenizer = JackTokenizer(StringIO("do Output.printInt(1);"))
+    jack_tokenizer.advance()
+    assert [jack_tokenizer.look_ahead(k) for k in range(1, 9)] == [
+        "Output",
+        ".",
+        "printInt",
+        "(",
+        "1",
+        ")",
+        ";",
+        None,
+    ]
+    assert jack_tokenizer.identifier() == "do"
+    with pytest.raises(ValueError, match="positive"):
+        jack_tokenizer.look_ahead(0)
+
+
+def test_tokenize_matches() -> None:
+    """Test that there is one regex match per token, whitespace run and comment."""
+    tokens = tokenize("let x = 1; // Comment\n")
+    assert len(tokens.values) == 5
+    # 3 whitespace runs between the tokens, 1 before the comment, the comment and the newline
+    assert tokens.matches == 5 + 3 + 3
+
+
+def test_load_tokens(tmp_path: Path) -> None:
+    """Test that the persisted tokens are reused until the source changes.
+
+    Args:
+        tmp_path (Path): Path to temporary directory
+    """
+    path = tmp_path.joinpath("Main.jack")
+    cache_path = token_cache_path(path)
+    assert cache_path == tmp_path.joinpath(".Main.jack.tokens")
+    assert load_tokens(SOURCE, path) == tokenize(SOURCE)
+    assert cache_path.is_file()
+
+    # Tamper with the persisted tokens to tell whether they are reused
+    data = json.loads(cache_path.read_text())
+    data["tokens"]["values"][0] = "persisted"
+    cache_path.write_text(json.dumps(data))
+    assert load_tokens(SOURCE, path).values[0] == "persisted"
+
+    # A changed source is tokenized again, and so is a corrupt file
+    assert load_tokens("class Other { }", path).values[1] == "Other"
+    cache_path.write_text("{")
+    assert load_tokens(SOURCE, path) == tokenize(SOURCE)
+    assert json.loads(cache_path.read_text())["tokens"]["values"][0] == "class"
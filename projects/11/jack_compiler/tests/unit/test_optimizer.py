@@ -0,0 +1,145 @@
+"""Module unit testing the optimization passes."""
+
+from io import StringIO
+
+import pytest
+from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.jack_tokenizer import JackTokenizer
+from jack_compiler.optimizer import fold_constants, optimization_passes, wrap
+from jack_compiler.syntax_tree import (
+    BinaryOp,
+    Expression,
+    IntegerConstant,
+    ParenthesizedExpression,
+    ReturnStatement,
+    SubroutineCall,
+    UnaryOp,
+    VarName,
+)
+
+
+def fold(expression: str) -> Expression:
+    """Fold the constants of an expression.
+
+    Args:
+        expression (str): The expression, where x is a variable
+
+    Returns:
+        Expression: The folded expression
+    """
+    compilation_engine = CompilationEngine(
+        jack_tokenizer=JackTokenizer(
+            StringIO(
+                f"class Main {{ function int f(int x) {{ return {expression}; }} }}"
+            )
+        ),
+        vm_sink=lambda _: None,
+    )
+    syntax_tree = fold_constants(compilation_engine.parse_class())
+    statement = syntax_tree.subroutine_decs[0].statements[0]
+    assert isinstance(statement, ReturnStatement) and statement.value is not None
+    return statement.value
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    (
+        ("1 + (2 * 3)", IntegerConstant(7)),
+        ("1 + 2 * 3", IntegerConstant(9)),
+        ("32767 + 1", UnaryOp("~", IntegerConstant(32767))),
+        ("200 * 200", UnaryOp("-", IntegerConstant(25536))),
+        ("1 - 3", UnaryOp("-", IntegerConstant(2))),
+        ("-7 / 2", UnaryOp("-", IntegerConstant(3))),
+        ("-(-5)", IntegerConstant(5)),
+        ("~0", UnaryOp("-", IntegerConstant(1))),
+        ("true & 6", IntegerConstant(6)),
+        ("(1 < 2) | (3 = 4)", UnaryOp("-", IntegerConstant(1))),
+    ),
+)
+def test_fold_constants(expression: str, expected: Expression) -> None:
+    """Test that constant expressions are evaluated with 16 bit arithmetic.
+
+    Args:
+        expression (str): The expression
+        expected (Expression): The expected constant
+    """
+    assert fold(expression) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    (
+        ("x + 0", VarName("x")),
+        ("0 + x", VarName("x")),
+        ("x - 0", VarName("x")),
+        ("0 - x", UnaryOp("-", VarName("x"))),
+        ("x * 1", VarName("x")),
+        ("x * (2 - 3)", UnaryOp("-", VarName("x"))),
+        ("x * 0", IntegerConstant(0)),
+        ("x & 0", IntegerConstant(0)),
+        ("x | 0", VarName("x")),
+        ("-(-x)", VarName("x")),
+        ("~(~x)", VarName("x")),
+        ("x + 1 + 2", BinaryOp(VarName("x"), "+", IntegerConstant(3))),
+        ("x + 1 - 3", BinaryOp(VarName("x"), "-", IntegerConstant(2))),
+        ("x - 1 + 1", VarName("x")),
+        ("x * 2 * 3", BinaryOp(VarName("x"), "*", IntegerConstant(6))),
+        (
+            "x * 4 + 2 * 3",
+            BinaryOp(
+                BinaryOp(
+                    BinaryOp(VarName("x"), "*", IntegerConstant(4)),
+                    "+",
+                    IntegerConstant(2),
+                ),
+                "*",
+                IntegerConstant(3),
+            ),
+        ),
+    ),
+)
+def test_simplify(expression: str, expected: Expression) -> None:
+    """Test that the algebraic identities are simplified.
+
+    Args:
+        expression (str): The expression
+        expected (Expression): The expected simplified expression
+    """
+    assert fold(expression) == expected
+
+
+@pytest.mark.parametrize("expression", ("x / 0", "(~32767) / 1", "x / 1"))
+def test_keep_division(expression: str) -> None:
+    """Test that divisions are kept where Math.divide does not return the quotient.
+
+    Args:
+        expression (str): The expression
+    """
+    assert isinstance(fold(expression), BinaryOp)
+
+
+def test_keep_side_effects() -> None:
+    """Test that calls are not removed by absorbing constants."""
+    assert fold("f(x) * 0") == BinaryOp(
+        SubroutineCall(None, "f", [VarName("x")]), "*", IntegerConstant(0)
+    )
+    assert fold("(x + 0)") == ParenthesizedExpression(VarName("x"))
+
+
+def test_wrap() -> None:
+    """Test that integers are wrapped to 16 bit signed integers."""
+    assert [wrap(value) for value in (0, 32767, 32768, 65535, -32769)] == [
+        0,
+        32767,
+        -32768,
+        -1,
+        32767,
+    ]
+
+
+def test_optimization_passes() -> None:
+    """Test that the passes are selected by the optimization level."""
+    assert not optimization_passes(0)
+    assert optimization_passes(1) == [fold_constants]
+    with pytest.raises(ValueError):
+        optimization_passes(-1)